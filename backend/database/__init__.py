@@ -6,7 +6,9 @@ from database.database import (
     Message,
     SessionLocal,
     Summary,
+    TableVersion,
     Thread,
+    URGENCY_PRIORITY,
     engine,
     get_db,
     init_db,
@@ -18,7 +20,9 @@ __all__ = [
     "Message",
     "SessionLocal",
     "Summary",
+    "TableVersion",
     "Thread",
+    "URGENCY_PRIORITY",
     "engine",
     "get_db",
     "init_db",
@@ -7,11 +7,14 @@ from sqlalchemy import (
     Column,
     DateTime,
     Enum,
+    Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     create_engine,
+    inspect,
     text,
 )
 from sqlalchemy.ext.declarative import declarative_base
@@ -51,6 +54,14 @@ class Thread(Base):
     initiated_by = Column(Enum(SenderType), nullable=False)
     order_id = Column(String, nullable=False)
     product = Column(String, nullable=False)
+    # Fingerprint of the thread metadata and messages, used to skip unchanged
+    # threads on re-upload
+    content_hash = Column(String, nullable=True)
+    # Near-duplicate detection: MinHash signature (JSON list of ints) and the
+    # already summarized thread this one nearly duplicates, if any
+    minhash_signature = Column(Text, nullable=True)
+    duplicate_of = Column(String, nullable=True)
+    duplicate_similarity = Column(Float, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -69,11 +80,14 @@ class Message(Base):
     __tablename__ = "messages"
 
     id = Column(Integer, primary_key=True, index=True)
-    thread_id = Column(Integer, ForeignKey("threads.id"), nullable=False)
+    thread_id = Column(Integer, ForeignKey("threads.id"), nullable=False, index=True)
     message_id = Column(String, nullable=False)
     sender = Column(Enum(SenderType), nullable=False)
     timestamp = Column(String, nullable=False)
     body = Column(Text, nullable=False)
+    content_hash = Column(
+        String, nullable=True
+    )  # Fingerprint of sender, timestamp and body
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     thread = relationship("Thread", back_populates="messages")
@@ -85,7 +99,7 @@ class Summary(Base):
     __tablename__ = "summaries"
 
     id = Column(Integer, primary_key=True, index=True)
-    thread_id = Column(Integer, ForeignKey("threads.id"), nullable=False)
+    thread_id = Column(Integer, ForeignKey("threads.id"), nullable=False, index=True)
     summary_id = Column(String, unique=True, index=True, nullable=False)
     original_summary = Column(Text, nullable=False)
     edited_summary = Column(Text, nullable=True)
@@ -95,12 +109,63 @@ class Summary(Base):
     remarks = Column(Text, nullable=True)  # Remarks/notes for approval
     rejection_reason = Column(Text, nullable=True)  # Reason for rejection
     structured_data_json = Column(Text, nullable=True)  # Store structured data as JSON
+    # Token usage and latency of the API calls that produced the summary
+    model = Column(String, nullable=True)
+    prompt_tokens = Column(Integer, nullable=True)
+    cached_tokens = Column(Integer, nullable=True)
+    completion_tokens = Column(Integer, nullable=True)
+    total_tokens = Column(Integer, nullable=True)
+    api_calls = Column(Integer, nullable=True)
+    chunk_count = Column(Integer, nullable=True)
+    latency_ms = Column(Float, nullable=True)
+    compaction_tokens_saved = Column(Integer, nullable=True)
+    # Incremental updates: messages covered by the summary, fingerprint of the
+    # thread as summarized and compact notes carried into the next update
+    summarized_message_count = Column(Integer, nullable=True)
+    summarized_hash = Column(String, nullable=True)
+    rolling_state = Column(Text, nullable=True)
+    # Thread ID of the near-duplicate whose summary this one was derived from
+    derived_from = Column(String, nullable=True)
+    # Review queue: rank from URGENCY_PRIORITY and the reviewer's lease
+    review_priority = Column(Integer, nullable=True)
+    claimed_by = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     thread = relationship("Thread", back_populates="summaries")
 
 
+# Serves the review queue's "next pending by priority" lookup in index order
+Index(
+    "ix_summaries_review_queue",
+    Summary.status,
+    Summary.review_priority.desc(),
+    Summary.id,
+)
+
+# Review queue rank of a summary's extracted urgency level; unknown levels rank 0
+URGENCY_PRIORITY = {"urgent": 3, "high": 2, "medium": 1, "low": 0}
+
+
+class TableVersion(Base):
+    """SQLAlchemy model for the change sequence of a table.
+
+    Triggers bump a table's version on every insert, update and delete, so
+    list endpoints can tell whether anything changed with one primary key
+    lookup.
+    """
+
+    __tablename__ = "table_versions"
+
+    table_name = Column(String, primary_key=True)
+    version = Column(Integer, default=0, nullable=False)
+
+
+# Tables whose writes bump their row in table_versions
+VERSIONED_TABLES = ("files", "threads", "messages", "summaries")
+
+
 # Database setup
 DATABASE_URL = "sqlite:///./ce_summarization.db"
 # Enable WAL mode for better concurrency and add timeout for locked database
@@ -117,9 +182,92 @@ engine = create_engine(
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+def _add_missing_columns() -> None:
+    """Add columns declared on the models but missing from existing tables.
+
+    ``create_all`` only creates missing tables, so databases created before a
+    column was introduced are patched with ``ALTER TABLE ... ADD COLUMN``.
+    """
+    inspector = inspect(engine)
+    with engine.connect() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {col["name"] for col in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(
+                    text(
+                        f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"
+                    )
+                )
+        conn.commit()
+
+
+def _create_missing_indexes() -> None:
+    """Create indexes declared on the models but missing from existing tables.
+
+    Like columns, indexes added to a model after its table was created are
+    not created by ``create_all``.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
+def _backfill_review_priority() -> None:
+    """Rank summaries saved before review_priority was introduced."""
+    ranks: str = " ".join(
+        f"WHEN '{level}' THEN {rank}" for level, rank in URGENCY_PRIORITY.items()
+    )
+    with engine.connect() as conn:
+        conn.execute(
+            text(
+                "UPDATE summaries SET review_priority = CASE lower(trim(json_extract("
+                "structured_data_json, '$.context_extraction.urgency_level'))) "
+                f"{ranks} ELSE 0 END "
+                "WHERE review_priority IS NULL AND json_valid(structured_data_json)"
+            )
+        )
+        conn.commit()
+
+
+def _create_change_triggers() -> None:
+    """Create the triggers that maintain table_versions.
+
+    Triggers are created on the database rather than as ORM events so that
+    set-based updates and cascading deletes are counted too.
+    """
+    with engine.connect() as conn:
+        for table in VERSIONED_TABLES:
+            conn.execute(
+                text(
+                    "INSERT OR IGNORE INTO table_versions (table_name, version) "
+                    "VALUES (:table_name, 0)"
+                ),
+                {"table_name": table},
+            )
+            for event in ("INSERT", "UPDATE", "DELETE"):
+                conn.execute(
+                    text(
+                        f"CREATE TRIGGER IF NOT EXISTS {table}_{event.lower()}_version "
+                        f"AFTER {event} ON {table} BEGIN "
+                        "UPDATE table_versions SET version = version + 1 "
+                        f"WHERE table_name = '{table}'; END"
+                    )
+                )
+        conn.commit()
+
+
 def init_db() -> None:
     """Initialize database tables and enable WAL mode for better concurrency."""
     Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
+    _create_missing_indexes()
+    _backfill_review_priority()
+    _create_change_triggers()
     # Enable WAL (Write-Ahead Logging) mode for better concurrent access
     with engine.connect() as conn:
         conn.execute(text("PRAGMA journal_mode=WAL"))
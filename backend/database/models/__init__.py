@@ -4,7 +4,12 @@ This module re-exports all models for backward compatibility.
 """
 
 # Enums
-from database.models.enums import SenderType, SummaryStatus
+from database.models.enums import (
+    ListView,
+    SenderType,
+    SummaryAction,
+    SummaryStatus,
+)
 
 # File models
 from database.models.file import FileModel, FileUploadResponse
@@ -13,7 +18,12 @@ from database.models.file import FileModel, FileUploadResponse
 from database.models.message import MessageModel
 
 # Thread models
-from database.models.thread import ThreadModel, ThreadsResponseModel
+from database.models.thread import (
+    ThreadListItemModel,
+    ThreadListResponseModel,
+    ThreadModel,
+    ThreadsResponseModel,
+)
 
 # Context models
 from database.models.context import (
@@ -22,19 +32,58 @@ from database.models.context import (
     ExtractedContextModel,
 )
 
+# Usage models
+from database.models.usage import (
+    FileUsageModel,
+    NearDuplicateModel,
+    ThreadUsageModel,
+    UsageModel,
+)
+
+# Metrics models
+from database.models.metrics import (
+    CacheStatsModel,
+    CircuitBreakerStatsModel,
+    FlowStatsModel,
+    HedgingStatsModel,
+    LaneStatsModel,
+    LatencyWindowStatsModel,
+    MetricsModel,
+    SchedulerStatsModel,
+    TierStatsModel,
+)
+
 # Summary models
 from database.models.summary import (
     ApproveSummaryRequest,
+    BulkSummaryActionRequest,
+    BulkSummaryActionResponse,
+    BulkSummaryFilter,
+    BulkSummaryResultModel,
     CreateSummaryRequest,
     RejectSummaryRequest,
+    RunningNotesModel,
+    SimilarSummaryModel,
     SummaryContentModel,
+    SummaryJobResponse,
+    SummaryListItemModel,
     SummaryModel,
+    UndoSummaryRequest,
     UpdateSummaryRequest,
 )
 
+# Review queue models
+from database.models.review import (
+    ClaimReviewRequest,
+    ReviewClaimModel,
+    ReviewLeaseRequest,
+)
+
 __all__ = [
     # Enums
+    "ListView",
     "SenderType",
+    "SummaryAction",
     "SummaryStatus",
     # File models
     "FileModel",
@@ -44,15 +93,45 @@ __all__ = [
     # Thread models
     "ThreadModel",
     "ThreadsResponseModel",
+    "ThreadListItemModel",
+    "ThreadListResponseModel",
     # Context models
     "CRMContextModel",
     "ConfidenceScoresModel",
     "ExtractedContextModel",
+    # Usage models
+    "UsageModel",
+    "ThreadUsageModel",
+    "FileUsageModel",
+    "NearDuplicateModel",
+    # Metrics models
+    "MetricsModel",
+    "TierStatsModel",
+    "HedgingStatsModel",
+    "LatencyWindowStatsModel",
+    "CircuitBreakerStatsModel",
+    "SchedulerStatsModel",
+    "LaneStatsModel",
+    "FlowStatsModel",
+    "CacheStatsModel",
     # Summary models
     "SummaryContentModel",
+    "RunningNotesModel",
     "SummaryModel",
+    "SummaryListItemModel",
+    "SimilarSummaryModel",
+    "SummaryJobResponse",
     "CreateSummaryRequest",
     "UpdateSummaryRequest",
     "ApproveSummaryRequest",
     "RejectSummaryRequest",
+    "UndoSummaryRequest",
+    "BulkSummaryFilter",
+    "BulkSummaryActionRequest",
+    "BulkSummaryResultModel",
+    "BulkSummaryActionResponse",
+    # Review queue models
+    "ClaimReviewRequest",
+    "ReviewLeaseRequest",
+    "ReviewClaimModel",
 ]
@@ -16,3 +16,18 @@ class SummaryStatus(str, Enum):
     PENDING = "pending"
     APPROVED = "approved"
     REJECTED = "rejected"
+
+
+class SummaryAction(str, Enum):
+    """Enum for review workflow actions on a summary."""
+
+    APPROVE = "approve"
+    REJECT = "reject"
+    UNDO = "undo"  # Reset to pending
+
+
+class ListView(str, Enum):
+    """Enum for the projection of list endpoints."""
+
+    SUMMARY = "summary"  # Metadata only, no text columns
+    DETAIL = "detail"  # Full records
@@ -0,0 +1,147 @@
+"""Runtime metrics Pydantic models."""
+
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class TierStatsModel(BaseModel):
+    """Pydantic model for usage and latency of one model routing tier."""
+
+    tier: str = Field(..., description="Routing tier name")
+    model: str = Field(..., description="Model the tier routes to")
+    max_concurrency: Optional[int] = Field(
+        None, description="Concurrent summarizations allowed (None when unlimited)"
+    )
+    in_flight: int = Field(0, description="Summarizations currently running")
+    threads: int = Field(0, description="Threads summarized by the tier")
+    fallbacks: int = Field(
+        0, description="Threads escalated out of the tier after a validation failure"
+    )
+    api_calls: int = Field(0, description="Completion API calls made")
+    prompt_tokens: int = Field(0, description="Total prompt tokens")
+    completion_tokens: int = Field(0, description="Total completion tokens")
+    total_tokens: int = Field(0, description="Total tokens")
+    avg_latency_ms: float = Field(0.0, description="Mean latency per thread")
+    p50_latency_ms: float = Field(0.0, description="Median latency per thread")
+    p95_latency_ms: float = Field(0.0, description="95th percentile latency per thread")
+
+
+class LatencyWindowStatsModel(BaseModel):
+    """Pydantic model for the latency window of one model and call kind."""
+
+    model: str = Field(..., description="Model the calls were sent to")
+    call_kind: str = Field(
+        ..., description="Call kind, e.g. email_thread_summary or running_notes"
+    )
+    samples: int = Field(0, description="Latency samples in the window")
+    hedge_delay_ms: Optional[float] = Field(
+        None, description="Current hedge delay (None until enough samples)"
+    )
+
+
+class HedgingStatsModel(BaseModel):
+    """Pydantic model for hedged request stats."""
+
+    enabled: bool = Field(..., description="Whether slow requests are hedged")
+    percentile: float = Field(
+        ..., description="Latency percentile that triggers a hedge"
+    )
+    samples: int = Field(0, description="Latency samples across all windows")
+    hedged_requests: int = Field(0, description="Calls that sent a duplicate request")
+    hedge_wins: int = Field(0, description="Hedged calls answered by the duplicate")
+    windows: List[LatencyWindowStatsModel] = Field(
+        default_factory=list, description="Latency window per model and call kind"
+    )
+
+
+class CircuitBreakerStatsModel(BaseModel):
+    """Pydantic model for the OpenRouter circuit breaker state."""
+
+    state: str = Field(..., description="closed, open or half_open")
+    consecutive_failures: int = Field(0, description="Failures since the last success")
+    failure_threshold: int = Field(..., description="Failures that open the circuit")
+    retry_after_seconds: float = Field(
+        0.0, description="Seconds until an open circuit half-opens"
+    )
+    opened_count: int = Field(0, description="Times the circuit has opened")
+    rejected_calls: int = Field(0, description="Calls rejected while open")
+
+
+class FlowStatsModel(BaseModel):
+    """Pydantic model for one flow (upload task) queued in a scheduler lane."""
+
+    flow_id: str = Field(..., description="Flow identifier (task ID for uploads)")
+    queued: int = Field(0, description="Work items waiting for a slot")
+    in_flight: int = Field(0, description="Work items currently running")
+    dispatched: int = Field(0, description="Work items started so far")
+    completed: int = Field(0, description="Work items finished so far")
+    throughput_per_minute: float = Field(
+        0.0, description="Completed work items per minute since the flow started"
+    )
+
+
+class LaneStatsModel(BaseModel):
+    """Pydantic model for one scheduler lane."""
+
+    lane: str = Field(..., description="Lane name (interactive or bulk)")
+    in_flight: int = Field(0, description="Work items currently running")
+    queued: int = Field(0, description="Work items waiting for a slot")
+    dispatched: int = Field(0, description="Work items started so far")
+    avg_wait_ms: float = Field(0.0, description="Mean time spent waiting for a slot")
+    max_wait_ms: float = Field(0.0, description="Longest time spent waiting for a slot")
+    flows: List[FlowStatsModel] = Field(
+        default_factory=list, description="Flows with queued or running work"
+    )
+
+
+class SchedulerStatsModel(BaseModel):
+    """Pydantic model for the LLM call scheduler."""
+
+    max_in_flight: int = Field(..., description="Global cap on running work items")
+    interactive_reserved: int = Field(
+        ..., description="Slots bulk work can never occupy"
+    )
+    bulk_order: str = Field(..., description="Bulk lane dispatch order")
+    lanes: List[LaneStatsModel] = Field(
+        default_factory=list, description="Per-lane stats"
+    )
+
+
+class CacheStatsModel(BaseModel):
+    """Pydantic model for an in-process payload cache."""
+
+    name: str = Field(..., description="Cache name")
+    entries: int = Field(0, description="Cached payloads")
+    size_bytes: int = Field(0, description="Summed size of cached payloads")
+    max_bytes: int = Field(0, description="Size bound of the cache")
+    hits: int = Field(0, description="Lookups served from the cache")
+    misses: int = Field(0, description="Lookups that had to render the payload")
+    hit_rate: float = Field(
+        0.0, description="Fraction of lookups served from the cache"
+    )
+    evictions: int = Field(
+        0, description="Payloads evicted to stay within the size bound"
+    )
+    invalidations: int = Field(
+        0, description="Payloads dropped because their source changed"
+    )
+
+
+class MetricsModel(BaseModel):
+    """Pydantic model for process-wide summarization metrics."""
+
+    routing_enabled: bool = Field(..., description="Whether model routing is enabled")
+    tiers: List[TierStatsModel] = Field(
+        default_factory=list, description="Per-tier routing stats"
+    )
+    hedging: Optional[HedgingStatsModel] = Field(None, description="Hedging stats")
+    circuit_breaker: Optional[CircuitBreakerStatsModel] = Field(
+        None, description="Circuit breaker state"
+    )
+    scheduler: Optional[SchedulerStatsModel] = Field(
+        None, description="LLM call scheduler stats"
+    )
+    caches: List[CacheStatsModel] = Field(
+        default_factory=list, description="Response payload cache stats"
+    )
@@ -0,0 +1,34 @@
+"""Review queue Pydantic models."""
+
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from database.models.summary import SummaryModel
+
+
+class ClaimReviewRequest(BaseModel):
+    """Pydantic model for a request to claim the next summary to review."""
+
+    reviewer: str = Field(
+        ..., min_length=1, description="Reviewer claiming the summary"
+    )
+    file_id: Optional[str] = Field(
+        None, description="Only claim summaries of this file"
+    )
+
+
+class ReviewLeaseRequest(BaseModel):
+    """Pydantic model for renewing or releasing a claimed summary."""
+
+    reviewer: str = Field(..., min_length=1, description="Reviewer holding the claim")
+
+
+class ReviewClaimModel(BaseModel):
+    """Pydantic model for a summary claimed for review."""
+
+    summary: SummaryModel = Field(..., description="Claimed summary")
+    claimed_by: str = Field(..., description="Reviewer holding the claim")
+    lease_expires_at: str = Field(
+        ..., description="Lease expiry in ISO format; the claim lapses afterwards"
+    )
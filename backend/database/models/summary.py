@@ -9,7 +9,8 @@ from database.models.context import (
     CRMContextModel,
     ExtractedContextModel,
 )
-from database.models.enums import SummaryStatus
+from database.models.enums import SummaryAction, SummaryStatus
+from database.models.usage import UsageModel
 
 
 class SummaryContentModel(BaseModel):
@@ -26,6 +27,10 @@ class SummaryContentModel(BaseModel):
         ...,
         description="Resolution status (resolved, partially resolved, pending, escalated)",
     )
+    resolution_details: Optional[str] = Field(
+        None,
+        description="1-3 sentences explaining the current status: what was done, what remains open and next steps",
+    )
     full_summary_text: str = Field(
         ..., description="Full formatted summary text for display"
     )
@@ -34,6 +39,15 @@ class SummaryContentModel(BaseModel):
     )
 
 
+class RunningNotesModel(BaseModel):
+    """Pydantic model for running notes carried between chunks of a long thread."""
+
+    notes: str = Field(
+        ...,
+        description="Compact plain-text notes on the issue, requests, actions, commitments and open items so far",
+    )
+
+
 class SummaryModel(BaseModel):
     """Pydantic model for summary."""
 
@@ -57,6 +71,31 @@ class SummaryModel(BaseModel):
     structured_data: Optional[SummaryContentModel] = Field(
         None, description="Structured summary data"
     )
+    usage: Optional[UsageModel] = Field(
+        None, description="Token usage and latency of the generating API calls"
+    )
+
+    class Config:
+        """Pydantic config."""
+
+        use_enum_values = True
+
+
+class SummaryListItemModel(BaseModel):
+    """Pydantic model for summary review state without summary text."""
+
+    id: str = Field(..., description="Unique summary identifier")
+    thread_id: str = Field(..., description="Associated thread ID")
+    status: SummaryStatus = Field(..., description="Summary status")
+    edited: bool = Field(..., description="Whether a reviewer edited the summary")
+    approved_by: Optional[str] = Field(
+        None, description="User who approved the summary"
+    )
+    approved_at: Optional[str] = Field(
+        None, description="Approval timestamp in ISO format"
+    )
+    created_at: str = Field(..., description="Creation timestamp in ISO format")
+    updated_at: str = Field(..., description="Last update timestamp in ISO format")
 
     class Config:
         """Pydantic config."""
@@ -70,6 +109,19 @@ class CreateSummaryRequest(BaseModel):
     thread_id: str = Field(..., description="Thread ID to summarize")
 
 
+class SummaryJobResponse(BaseModel):
+    """Pydantic model for an accepted on-demand summarization job."""
+
+    job_id: str = Field(
+        ..., description="Job identifier (poll /api/threads/task/{job_id}/status)"
+    )
+    thread_id: str = Field(..., description="Thread being summarized")
+    status: str = Field(..., description="Job status")
+    coalesced: bool = Field(
+        False, description="Whether the request joined a job already in flight"
+    )
+
+
 class UpdateSummaryRequest(BaseModel):
     """Pydantic model for update summary request."""
 
@@ -80,9 +132,103 @@ class ApproveSummaryRequest(BaseModel):
     """Pydantic model for approve summary request."""
 
     remarks: str = Field(..., description="Required remarks/notes for approval")
+    reviewer: Optional[str] = Field(
+        None, description="Reviewer approving; must hold any live review lease"
+    )
 
 
 class RejectSummaryRequest(BaseModel):
     """Pydantic model for reject summary request."""
 
     reason: str = Field(..., description="Reason for rejection")
+    reviewer: Optional[str] = Field(
+        None, description="Reviewer rejecting; must hold any live review lease"
+    )
+
+
+class UndoSummaryRequest(BaseModel):
+    """Pydantic model for undo summary action request."""
+
+    reviewer: Optional[str] = Field(
+        None, description="Reviewer undoing; must hold any live review lease"
+    )
+
+
+class BulkSummaryFilter(BaseModel):
+    """Pydantic model for selecting summaries of a bulk action by criteria."""
+
+    file_id: Optional[str] = Field(None, description="File the summaries belong to")
+    status: Optional[SummaryStatus] = Field(None, description="Current summary status")
+    min_confidence: Optional[float] = Field(
+        None,
+        ge=0.0,
+        le=100.0,
+        description="Lowest extraction confidence score (0-100) every score must reach",
+    )
+
+
+class BulkSummaryActionRequest(BaseModel):
+    """Pydantic model for a workflow action applied to many summaries."""
+
+    action: SummaryAction = Field(..., description="Action to apply")
+    summary_ids: Optional[List[str]] = Field(
+        None, description="Summaries to update; exclusive with filter"
+    )
+    filter: Optional[BulkSummaryFilter] = Field(
+        None, description="Criteria selecting the summaries to update"
+    )
+    remarks: Optional[str] = Field(
+        None, description="Remarks/notes, required to approve"
+    )
+    reason: Optional[str] = Field(None, description="Reason, required to reject")
+    reviewer: Optional[str] = Field(
+        None, description="Reviewer applying the action, recorded on approval"
+    )
+
+
+class BulkSummaryResultModel(BaseModel):
+    """Pydantic model for the outcome of a bulk action on one summary."""
+
+    id: str = Field(..., description="Summary identifier")
+    updated: bool = Field(..., description="Whether the summary was updated")
+    status: Optional[SummaryStatus] = Field(
+        None, description="Summary status after the action; None if not found"
+    )
+    detail: Optional[str] = Field(None, description="Why the summary was not updated")
+
+    class Config:
+        """Pydantic config."""
+
+        use_enum_values = True
+
+
+class BulkSummaryActionResponse(BaseModel):
+    """Pydantic model for the result of a bulk workflow action."""
+
+    action: SummaryAction = Field(..., description="Applied action")
+    updated: int = Field(..., description="Number of summaries updated")
+    results: List[BulkSummaryResultModel] = Field(
+        default_factory=list, description="Outcome per summary"
+    )
+
+    class Config:
+        """Pydantic config."""
+
+        use_enum_values = True
+
+
+class SimilarSummaryModel(BaseModel):
+    """Pydantic model for an approved summary similar to a given one."""
+
+    summary_id: str = Field(..., description="Summary identifier")
+    thread_id: str = Field(..., description="Associated thread ID")
+    similarity: float = Field(
+        ..., description="Cosine similarity to the query summary (0-1)"
+    )
+    issue_summary: Optional[str] = Field(None, description="Brief summary of the issue")
+    issue_type: Optional[str] = Field(None, description="Issue type")
+    resolution_status: Optional[str] = Field(None, description="Resolution status")
+    resolution_details: Optional[str] = Field(
+        None, description="How the issue was resolved"
+    )
+    remarks: Optional[str] = Field(None, description="Reviewer remarks from approval")
@@ -32,3 +32,31 @@ class ThreadsResponseModel(BaseModel):
     generated_at: str = Field(..., description="Generation timestamp")
     description: str = Field(..., description="Description of the dataset")
     threads: List[ThreadModel] = Field(..., description="List of email threads")
+
+
+class ThreadListItemModel(BaseModel):
+    """Pydantic model for thread metadata without messages."""
+
+    thread_id: str = Field(..., description="Unique thread identifier")
+    topic: str = Field(..., description="Thread topic/category")
+    subject: str = Field(..., description="Email subject line")
+    initiated_by: SenderType = Field(..., description="Who initiated the thread")
+    order_id: str = Field(..., description="Associated order ID")
+    product: str = Field(..., description="Product name")
+    message_count: int = Field(..., description="Number of messages in thread")
+
+    class Config:
+        """Pydantic config."""
+
+        use_enum_values = True
+
+
+class ThreadListResponseModel(BaseModel):
+    """Pydantic model for the summary view of the threads list."""
+
+    version: str = Field(..., description="Data version")
+    generated_at: str = Field(..., description="Generation timestamp")
+    description: str = Field(..., description="Description of the dataset")
+    threads: List[ThreadListItemModel] = Field(
+        ..., description="Thread metadata without messages"
+    )
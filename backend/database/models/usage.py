@@ -0,0 +1,79 @@
+"""Usage accounting Pydantic models."""
+
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class UsageModel(BaseModel):
+    """Pydantic model for LLM token usage and latency of a summary."""
+
+    model: Optional[str] = Field(None, description="Model that produced the summary")
+    prompt_tokens: int = Field(0, description="Prompt tokens consumed")
+    cached_tokens: int = Field(
+        0, description="Prompt tokens served from the provider's prompt cache"
+    )
+    completion_tokens: int = Field(0, description="Completion tokens generated")
+    total_tokens: int = Field(0, description="Total tokens (prompt + completion)")
+    api_calls: int = Field(0, description="Number of completion API calls made")
+    chunks: int = Field(0, description="Number of message chunks processed")
+    latency_ms: float = Field(0.0, description="Wall-clock latency in milliseconds")
+    tokens_saved: int = Field(
+        0, description="Estimated prompt tokens removed by prompt compaction"
+    )
+
+
+class ThreadUsageModel(BaseModel):
+    """Pydantic model for usage of a single thread within a file."""
+
+    thread_id: str = Field(..., description="Thread identifier")
+    summary_id: str = Field(..., description="Summary identifier")
+    message_count: int = Field(..., description="Number of messages in the thread")
+    usage: UsageModel = Field(..., description="Usage recorded for the summary")
+
+
+class NearDuplicateModel(BaseModel):
+    """Pydantic model for a thread flagged as a near-duplicate."""
+
+    thread_id: str = Field(..., description="Thread identifier")
+    duplicate_of: str = Field(..., description="Already summarized thread it matches")
+    similarity: float = Field(..., description="Estimated Jaccard similarity (0-1)")
+    derived: bool = Field(
+        False, description="Whether the summary was derived from the match"
+    )
+
+
+class FileUsageModel(BaseModel):
+    """Pydantic model for usage aggregated over all summaries of a file."""
+
+    file_id: str = Field(..., description="File identifier")
+    summaries: int = Field(..., description="Number of summaries with usage data")
+    prompt_tokens: int = Field(..., description="Total prompt tokens")
+    cached_tokens: int = Field(0, description="Total prompt tokens served from cache")
+    completion_tokens: int = Field(..., description="Total completion tokens")
+    total_tokens: int = Field(..., description="Total tokens")
+    api_calls: int = Field(..., description="Total completion API calls")
+    chunks: int = Field(..., description="Total message chunks processed")
+    latency_ms: float = Field(..., description="Sum of per-summary latency in ms")
+    avg_latency_ms: float = Field(..., description="Average latency per summary in ms")
+    tokens_saved: int = Field(
+        0, description="Estimated prompt tokens removed by prompt compaction"
+    )
+    models: List[str] = Field(
+        default_factory=list, description="Models used for the file's summaries"
+    )
+    top_threads: List[ThreadUsageModel] = Field(
+        default_factory=list, description="Threads dominating spend or latency"
+    )
+    near_duplicates: int = Field(
+        0, description="Threads flagged as near-duplicates of a summarized thread"
+    )
+    dedup_ratio: float = Field(
+        0.0, description="Share of the file's threads flagged as near-duplicates"
+    )
+    calls_saved: int = Field(
+        0, description="Summaries derived from a near-duplicate without an API call"
+    )
+    duplicates: List[NearDuplicateModel] = Field(
+        default_factory=list, description="Flagged near-duplicates, most similar first"
+    )
@@ -4,7 +4,8 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from database import init_db
-from routers import events, files, summaries, threads
+from routers import events, files, metrics, review, summaries, threads
+from services.compression import CompressionMiddleware
 
 app = FastAPI(
     title="CE Email Thread Summarization API",
@@ -21,6 +22,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress responses for clients that accept gzip or brotli
+app.add_middleware(CompressionMiddleware)
+
 # Initialize database on startup
 @app.on_event("startup")
 async def startup_event() -> None:
@@ -31,8 +35,10 @@ async def startup_event() -> None:
 # Include routers
 app.include_router(events.router)
 app.include_router(files.router)
+app.include_router(metrics.router)
 app.include_router(threads.router)
 app.include_router(summaries.router)
+app.include_router(review.router)
 
 
 @app.get("/")
@@ -2,7 +2,8 @@
 
 import asyncio
 import json
-from typing import Dict, Optional
+import time
+from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, Request
 from fastapi.responses import StreamingResponse
@@ -11,22 +12,66 @@ from sqlalchemy.orm import Session
 
 from database import File, Summary, Thread, get_db
 from services.background import task_manager
+from services.event_bus import event_bus
 
 router = APIRouter(prefix="/api/events", tags=["events"])
 
 # Store active SSE connections
 _active_connections: Dict[str, asyncio.Queue] = {}
 
+# Seconds between database progress polls
+POLL_INTERVAL_SECONDS: float = 1.0
 
-async def event_generator(file_id: Optional[str] = None, task_id: Optional[str] = None):
+
+async def _next_pushed_events(queue: asyncio.Queue, timeout: float) -> List[Dict[str, Any]]:
+    """Wait up to timeout for pushed events and drain everything queued.
+
+    Args:
+        queue: Event bus subscription queue.
+        timeout: Seconds to wait for the first event.
+
+    Returns:
+        List of pushed events, possibly empty.
+    """
+    try:
+        events: List[Dict[str, Any]] = [
+            await asyncio.wait_for(queue.get(), timeout=max(0.0, timeout))
+        ]
+    except asyncio.TimeoutError:
+        return []
+    while not queue.empty():
+        events.append(queue.get_nowait())
+    return events
+
+
+def _matches_filters(
+    event: Dict[str, Any], file_id: Optional[str], thread_id: Optional[str]
+) -> bool:
+    """Check whether a pushed event belongs to a connection's filters."""
+    if file_id and event.get("file_id") not in (None, file_id):
+        return False
+    if thread_id and event.get("thread_id") not in (None, thread_id):
+        return False
+    return True
+
+
+async def event_generator(
+    file_id: Optional[str] = None,
+    task_id: Optional[str] = None,
+    thread_id: Optional[str] = None,
+):
     """Generate SSE events for file processing updates.
 
+    Progress is polled from the database every second, while events pushed
+    on the event bus (such as partial summaries) are forwarded immediately.
+
     Args:
         file_id: Optional file ID to filter events.
         task_id: Optional task ID to filter events.
+        thread_id: Optional thread ID to filter pushed events.
     """
-    connection_id = f"{file_id or 'all'}_{task_id or 'all'}"
-    queue: asyncio.Queue = asyncio.Queue()
+    connection_id = f"{file_id or 'all'}_{task_id or 'all'}_{thread_id or 'all'}"
+    queue: asyncio.Queue = event_bus.subscribe()
     _active_connections[connection_id] = queue
 
     try:
@@ -35,10 +80,19 @@ async def event_generator(file_id: Optional[str] = None, task_id: Optional[str]
 
         # Keep connection alive and send updates
         last_processed_count = {}
+        last_poll: float = time.monotonic()
         while True:
             try:
-                # Check for updates every 1 second
-                await asyncio.sleep(1)
+                # Forward pushed events as they arrive until the next poll is due
+                pushed = await _next_pushed_events(
+                    queue, POLL_INTERVAL_SECONDS - (time.monotonic() - last_poll)
+                )
+                for event_data in pushed:
+                    if _matches_filters(event_data, file_id, thread_id):
+                        yield f"data: {json.dumps(event_data)}\n\n"
+                if time.monotonic() - last_poll < POLL_INTERVAL_SECONDS:
+                    continue
+                last_poll = time.monotonic()
 
                 # Get database session using dependency injection pattern
                 db: Session = next(get_db())
@@ -137,7 +191,9 @@ async def event_generator(file_id: Optional[str] = None, task_id: Optional[str]
         yield f"data: {json.dumps(error_data)}\n\n"
     finally:
         # Clean up connection
-        _active_connections.pop(connection_id, None)
+        event_bus.unsubscribe(queue)
+        if _active_connections.get(connection_id) is queue:
+            _active_connections.pop(connection_id, None)
 
 
 @router.get("/stream")
@@ -145,6 +201,7 @@ async def stream_events(
     request: Request,
     file_id: Optional[str] = None,
     task_id: Optional[str] = None,
+    thread_id: Optional[str] = None,
 ):
     """Stream Server-Sent Events for real-time updates.
 
@@ -152,12 +209,13 @@ async def stream_events(
         request: FastAPI request object.
         file_id: Optional file ID to filter events.
         task_id: Optional task ID to filter events.
+        thread_id: Optional thread ID to filter pushed summary events.
 
     Returns:
         StreamingResponse with SSE events.
     """
     return StreamingResponse(
-        event_generator(file_id=file_id, task_id=task_id),
+        event_generator(file_id=file_id, task_id=task_id, thread_id=thread_id),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
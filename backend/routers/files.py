@@ -1,17 +1,37 @@
 """API routes for file management."""
 
 import uuid
-from typing import List, Optional
-
-from database import File, Summary, Thread, get_db
-from database.models import FileModel, FileUploadResponse
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, UploadFile
+from typing import List, Optional, Union
+
+from database import File, Message, Summary, Thread, get_db
+from database.models import (
+    FileModel,
+    FileUploadResponse,
+    FileUsageModel,
+    NearDuplicateModel,
+    ThreadUsageModel,
+)
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Request,
+    Response,
+    UploadFile,
+)
 from fastapi import File as FastAPIFile
 from services.background import (
     load_threads_from_json,
     process_threads_background,
     task_manager,
 )
+from services.background.database_ops import usage_from_summary
+from services.background.dedup import near_duplicate_index
+from services.etags import collection_etag, etag_headers, etag_matches, not_modified
+from services.similar_cases import similar_cases_index
+from services.summary_payloads import summary_payload_cache
+from services.thread_payloads import thread_payload_cache
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
@@ -81,15 +101,26 @@ async def upload_file(
 
 
 @router.get("/", response_model=List[FileModel])
-async def get_files(db: Session = Depends(get_db)) -> List[FileModel]:
+async def get_files(
+    request: Request, response: Response, db: Session = Depends(get_db)
+) -> Union[List[FileModel], Response]:
     """Get all uploaded files with progress information.
 
+    Answers 304 when the client's If-None-Match matches the current ETag.
+
     Args:
+        request: Incoming request.
+        response: Response whose caching headers are set.
         db: Database session.
 
     Returns:
-        List of FileModel with progress tracking.
+        List of FileModel with progress tracking, or an empty 304 response.
     """
+    etag: str = collection_etag(db, request, ("files", "threads", "summaries"))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(etag_headers(etag))
+
     files_db: List[File] = db.query(File).order_by(File.uploaded_at.desc()).all()
     files: List[FileModel] = []
 
@@ -173,6 +204,159 @@ async def get_file(file_id: str, db: Session = Depends(get_db)) -> FileModel:
     )
 
 
+@router.get("/{file_id}/usage", response_model=FileUsageModel)
+async def get_file_usage(
+    file_id: str,
+    sort_by: str = "total_tokens",
+    limit: int = 10,
+    db: Session = Depends(get_db),
+) -> FileUsageModel:
+    """Get token usage and latency aggregated over a file's summaries.
+
+    Args:
+        file_id: File identifier.
+        sort_by: Ranking for top threads ("total_tokens" or "latency_ms").
+        limit: Number of top threads and near-duplicates to return.
+        db: Database session.
+
+    Returns:
+        FileUsageModel with totals, the threads dominating spend or latency
+        and near-duplicate stats.
+
+    Raises:
+        HTTPException: If file not found or sort_by is invalid.
+    """
+    sort_columns = {
+        "total_tokens": Summary.total_tokens,
+        "latency_ms": Summary.latency_ms,
+    }
+    if sort_by not in sort_columns:
+        raise HTTPException(status_code=400, detail=f"Invalid sort_by: {sort_by}")
+
+    file_db: Optional[File] = db.query(File).filter(File.file_id == file_id).first()
+
+    if not file_db:
+        raise HTTPException(status_code=404, detail="File not found")
+
+    # Summaries created before usage accounting have no api_calls recorded
+    usage_filter = (Thread.file_id == file_db.id, Summary.api_calls.isnot(None))
+
+    totals = (
+        db.query(
+            func.count(Summary.id),
+            func.coalesce(func.sum(Summary.prompt_tokens), 0),
+            func.coalesce(func.sum(Summary.cached_tokens), 0),
+            func.coalesce(func.sum(Summary.completion_tokens), 0),
+            func.coalesce(func.sum(Summary.total_tokens), 0),
+            func.coalesce(func.sum(Summary.api_calls), 0),
+            func.coalesce(func.sum(Summary.chunk_count), 0),
+            func.coalesce(func.sum(Summary.latency_ms), 0.0),
+            func.coalesce(func.sum(Summary.compaction_tokens_saved), 0),
+        )
+        .join(Thread)
+        .filter(*usage_filter)
+        .one()
+    )
+    (
+        summary_count,
+        prompt,
+        cached,
+        completion,
+        total,
+        api_calls,
+        chunks,
+        latency,
+        tokens_saved,
+    ) = totals
+
+    models: List[str] = [
+        model
+        for (model,) in db.query(Summary.model)
+        .join(Thread)
+        .filter(*usage_filter)
+        .distinct()
+        .all()
+        if model
+    ]
+
+    message_counts = (
+        db.query(Message.thread_id, func.count(Message.id).label("message_count"))
+        .group_by(Message.thread_id)
+        .subquery()
+    )
+    top_rows = (
+        db.query(Summary, Thread.thread_id, message_counts.c.message_count)
+        .join(Thread, Summary.thread_id == Thread.id)
+        .outerjoin(message_counts, message_counts.c.thread_id == Thread.id)
+        .filter(*usage_filter)
+        .order_by(sort_columns[sort_by].desc())
+        .limit(max(0, limit))
+        .all()
+    )
+
+    duplicate_rows = (
+        db.query(
+            Thread.thread_id,
+            Thread.duplicate_of,
+            Thread.duplicate_similarity,
+            Summary.derived_from,
+        )
+        .outerjoin(Summary, Summary.thread_id == Thread.id)
+        .filter(Thread.file_id == file_db.id, Thread.duplicate_of.isnot(None))
+        .order_by(Thread.duplicate_similarity.desc())
+        .all()
+    )
+    calls_saved: int = (
+        db.query(func.count(Summary.id))
+        .join(Thread)
+        .filter(Thread.file_id == file_db.id, Summary.derived_from.isnot(None))
+        .scalar()
+        or 0
+    )
+
+    return FileUsageModel(
+        file_id=file_db.file_id,
+        summaries=summary_count,
+        prompt_tokens=prompt,
+        cached_tokens=cached,
+        completion_tokens=completion,
+        total_tokens=total,
+        api_calls=api_calls,
+        chunks=chunks,
+        latency_ms=round(latency, 2),
+        avg_latency_ms=round(latency / summary_count, 2) if summary_count else 0.0,
+        tokens_saved=tokens_saved,
+        models=models,
+        top_threads=[
+            ThreadUsageModel(
+                thread_id=thread_id,
+                summary_id=summary_db.summary_id,
+                message_count=message_count or 0,
+                usage=usage_from_summary(summary_db),
+            )
+            for summary_db, thread_id, message_count in top_rows
+        ],
+        near_duplicates=len(duplicate_rows),
+        dedup_ratio=(
+            round(len(duplicate_rows) / file_db.total_threads, 4)
+            if file_db.total_threads
+            else 0.0
+        ),
+        calls_saved=calls_saved,
+        duplicates=[
+            NearDuplicateModel(
+                thread_id=thread_id,
+                duplicate_of=duplicate_of,
+                similarity=similarity or 0.0,
+                derived=derived_from is not None,
+            )
+            for thread_id, duplicate_of, similarity, derived_from in duplicate_rows[
+                : max(0, limit)
+            ]
+        ],
+    )
+
+
 @router.delete("/{file_id}")
 async def delete_file(file_id: str, db: Session = Depends(get_db)) -> dict:
     """Delete a file and all associated threads.
@@ -192,8 +376,29 @@ async def delete_file(file_id: str, db: Session = Depends(get_db)) -> dict:
     if not file_db:
         raise HTTPException(status_code=404, detail="File not found")
 
+    thread_ids: List[str] = [
+        thread_id
+        for (thread_id,) in db.query(Thread.thread_id).filter(
+            Thread.file_id == file_db.id
+        )
+    ]
+
+    summary_db_ids: List[int] = [
+        summary_db_id
+        for (summary_db_id,) in db.query(Summary.id)
+        .join(Thread, Thread.id == Summary.thread_id)
+        .filter(Thread.file_id == file_db.id)
+    ]
+
     # Delete file (cascade will delete threads, messages, and summaries)
     db.delete(file_db)
     db.commit()
 
+    for thread_id in thread_ids:
+        near_duplicate_index.remove(thread_id)
+        thread_payload_cache.invalidate(thread_id)
+    for summary_db_id in summary_db_ids:
+        similar_cases_index.remove(summary_db_id)
+        summary_payload_cache.invalidate(summary_db_id)
+
     return {"message": "File deleted successfully"}
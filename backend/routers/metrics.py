@@ -0,0 +1,31 @@
+"""API routes for runtime summarization metrics."""
+
+from database.models import MetricsModel
+from fastapi import APIRouter
+from services.background.scheduler import llm_scheduler
+from services.openrouter.resilience import circuit_breaker, latency_tracker
+from services.openrouter.routing import model_router
+from services.summary_payloads import summary_payload_cache
+from services.thread_payloads import thread_payload_cache
+
+router = APIRouter(prefix="/api/metrics", tags=["metrics"])
+
+
+@router.get("", response_model=MetricsModel)
+async def get_metrics() -> MetricsModel:
+    """Get process-wide summarization metrics.
+
+    Stats are kept in memory and reset when the server restarts.
+
+    Returns:
+        MetricsModel with per-tier model routing, hedging, circuit breaker,
+        scheduler and payload cache stats.
+    """
+    return MetricsModel(
+        routing_enabled=model_router.enabled,
+        tiers=model_router.stats(),
+        hedging=latency_tracker.stats(),
+        circuit_breaker=circuit_breaker.stats(),
+        scheduler=llm_scheduler.stats(),
+        caches=[thread_payload_cache.stats(), summary_payload_cache.stats()],
+    )
@@ -0,0 +1,131 @@
+"""API routes for the reviewer work queue."""
+
+from typing import Optional, Union
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.orm import Session
+
+from database import File, Summary, get_db
+from database.models import (
+    ClaimReviewRequest,
+    ReviewClaimModel,
+    ReviewLeaseRequest,
+    SummaryModel,
+)
+from services.review_queue import claim_next, release_lease, renew_lease
+from services.summary_payloads import summary_payload
+
+router = APIRouter(prefix="/api/review", tags=["review"])
+
+
+def _claim_model(summary_db: Summary) -> ReviewClaimModel:
+    """Build the response for a summary claimed by a reviewer.
+
+    Args:
+        summary_db: Claimed summary row.
+
+    Returns:
+        ReviewClaimModel with the summary payload and lease.
+    """
+    return ReviewClaimModel(
+        summary=SummaryModel.model_validate_json(summary_payload(summary_db)),
+        claimed_by=summary_db.claimed_by,
+        lease_expires_at=summary_db.lease_expires_at.isoformat(),
+    )
+
+
+@router.post(
+    "/next",
+    response_model=ReviewClaimModel,
+    responses={204: {"description": "No pending summary is claimable"}},
+)
+async def claim_next_summary(
+    request: ClaimReviewRequest,
+    db: Session = Depends(get_db),
+) -> Union[ReviewClaimModel, Response]:
+    """Claim the next pending summary to review.
+
+    The most urgent pending summary without a live lease is leased to the
+    reviewer, so concurrent reviewers never get the same summary. The
+    lease lapses after REVIEW_LEASE_SECONDS unless renewed, and approving,
+    rejecting or undoing the summary ends it.
+
+    Args:
+        request: Reviewer and optional file to claim from.
+        db: Database session.
+
+    Returns:
+        ReviewClaimModel, or an empty 204 response when the queue is empty.
+
+    Raises:
+        HTTPException: If the file is not found.
+    """
+    file_db_id: Optional[int] = None
+    if request.file_id:
+        file_db: Optional[File] = (
+            db.query(File).filter(File.file_id == request.file_id).first()
+        )
+        if not file_db:
+            raise HTTPException(status_code=404, detail="File not found")
+        file_db_id = file_db.id
+
+    summary_db: Optional[Summary] = claim_next(db, request.reviewer, file_db_id)
+    if summary_db is None:
+        return Response(status_code=204)
+
+    return _claim_model(summary_db)
+
+
+@router.post("/{summary_id}/renew", response_model=ReviewClaimModel)
+async def renew_claim(
+    summary_id: str,
+    request: ReviewLeaseRequest,
+    db: Session = Depends(get_db),
+) -> ReviewClaimModel:
+    """Extend a reviewer's lease on a claimed summary.
+
+    Args:
+        summary_id: Summary identifier.
+        request: Reviewer holding the lease.
+        db: Database session.
+
+    Returns:
+        ReviewClaimModel with the new lease expiry.
+
+    Raises:
+        HTTPException: If the reviewer holds no live lease on the summary.
+    """
+    summary_db: Optional[Summary] = renew_lease(db, summary_id, request.reviewer)
+    if summary_db is None:
+        raise HTTPException(
+            status_code=409, detail="Summary is not claimed by this reviewer"
+        )
+
+    return _claim_model(summary_db)
+
+
+@router.post("/{summary_id}/release", status_code=204)
+async def release_claim(
+    summary_id: str,
+    request: ReviewLeaseRequest,
+    db: Session = Depends(get_db),
+) -> Response:
+    """Return a claimed summary to the queue.
+
+    Args:
+        summary_id: Summary identifier.
+        request: Reviewer holding the lease.
+        db: Database session.
+
+    Returns:
+        Empty 204 response.
+
+    Raises:
+        HTTPException: If the summary is not claimed by the reviewer.
+    """
+    if not release_lease(db, summary_id, request.reviewer):
+        raise HTTPException(
+            status_code=409, detail="Summary is not claimed by this reviewer"
+        )
+
+    return Response(status_code=204)
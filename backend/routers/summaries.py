@@ -2,34 +2,75 @@
 
 import json
 from datetime import datetime
-from typing import List, Optional
-
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from typing import List, Optional, Tuple, Union
+
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy import case, func, select, update
 from sqlalchemy.orm import Session
 
-from database import Message, SessionLocal, Summary, Thread, get_db
+from database import File, SessionLocal, Summary, Thread, get_db
 from database.models import (
     ApproveSummaryRequest,
-    MessageModel,
+    BulkSummaryActionRequest,
+    BulkSummaryActionResponse,
+    BulkSummaryFilter,
+    BulkSummaryResultModel,
+    ConfidenceScoresModel,
+    ListView,
     RejectSummaryRequest,
+    SimilarSummaryModel,
     SummaryContentModel,
+    SummaryJobResponse,
+    SummaryAction,
+    SummaryListItemModel,
     SummaryModel,
     SummaryStatus,
     ThreadModel,
+    UndoSummaryRequest,
     UpdateSummaryRequest,
 )
-from services.openrouter import OpenRouterService
+from services.background import run_summary_job, start_summary_job, task_manager
+from services.background.database_ops import LOOKUP_CHUNK_SIZE
+from services.etags import collection_etag, etag_headers, etag_matches, not_modified
+from services.event_bus import event_bus
+from services.openrouter.resilience import OPEN, circuit_breaker
+from services.review_queue import held_by_another_reviewer, lease_allows
+from services.similar_cases import (
+    SimilarCasesIndex,
+    features_from_row,
+    similar_cases_index,
+)
+from services.summary_payloads import summary_list_response, summary_response
+from services.thread_payloads import load_thread_model
 
 router = APIRouter(prefix="/api/summaries", tags=["summaries"])
 
 
-@router.post("/threads/{thread_id}/summarize", response_model=SummaryModel)
+@router.post(
+    "/threads/{thread_id}/summarize",
+    response_model=SummaryJobResponse,
+    status_code=202,
+)
 async def create_summary(
     thread_id: str,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
-) -> SummaryModel:
-    """Generate summary for a thread.
+) -> SummaryJobResponse:
+    """Start generating a summary for a thread.
+
+    The summary is generated in the background. Concurrent requests for the
+    same thread join the job already in flight instead of starting another
+    LLM call. Progress is available from the task status endpoint and over
+    SSE (summary_partial and summary_ready events).
 
     Args:
         thread_id: Thread identifier.
@@ -37,10 +78,10 @@ async def create_summary(
         db: Database session.
 
     Returns:
-        SummaryModel instance.
+        SummaryJobResponse with the job identifier.
 
     Raises:
-        HTTPException: If thread not found or summary generation fails.
+        HTTPException: If thread not found or the OpenRouter circuit is open.
     """
     # Get thread from database
     thread_db: Optional[Thread] = (
@@ -50,116 +91,74 @@ async def create_summary(
     if not thread_db:
         raise HTTPException(status_code=404, detail="Thread not found")
 
-    # Check if summary already exists
-    existing_summary: Optional[Summary] = (
-        db.query(Summary).filter(Summary.thread_id == thread_db.id).first()
-    )
-
-    # Get messages
-    messages_db = (
-        db.query(Message)
-        .filter(Message.thread_id == thread_db.id)
-        .order_by(Message.timestamp)
-        .all()
-    )
-
-    # Convert to ThreadModel
-    messages: List[dict] = [
-        {
-            "id": msg.message_id,
-            "sender": msg.sender.value,
-            "timestamp": msg.timestamp,
-            "body": msg.body,
-        }
-        for msg in messages_db
-    ]
-
-    thread_model = ThreadModel(
-        thread_id=thread_db.thread_id,
-        topic=thread_db.topic,
-        subject=thread_db.subject,
-        initiated_by=thread_db.initiated_by.value,
-        order_id=thread_db.order_id,
-        product=thread_db.product,
-        messages=[MessageModel(**msg) for msg in messages],
-    )
-
-    try:
-        # Generate summary using OpenRouter service
-        openrouter_service = OpenRouterService()
-        summary_result = await openrouter_service.summarize_thread(thread_model)
-
-        # Create or update summary in database
-        if existing_summary:
-            summary_db = existing_summary
-            summary_db.original_summary = summary_result.full_summary_text
-            summary_db.edited_summary = None  # Reset edited summary on regenerate
-            summary_db.status = SummaryStatus.PENDING
-            summary_db.structured_data_json = summary_result.model_dump_json()
-            summary_db.updated_at = datetime.utcnow()
-        else:
-            summary_db = Summary(
-                thread_id=thread_db.id,
-                summary_id=f"SUM-{thread_db.thread_id}-{int(datetime.utcnow().timestamp())}",
-                original_summary=summary_result.full_summary_text,
-                status=SummaryStatus.PENDING,
-                structured_data_json=summary_result.model_dump_json(),
-            )
-            db.add(summary_db)
-
-        db.commit()
-        db.refresh(summary_db)
-
-        thread_db: Optional[Thread] = (
-            db.query(Thread).filter(Thread.id == summary_db.thread_id).first()
+    if circuit_breaker.state == OPEN:
+        # Fail fast rather than queueing work against an unhealthy upstream
+        raise HTTPException(
+            status_code=503,
+            detail="OpenRouter is unavailable, try again later",
+            headers={"Retry-After": str(int(circuit_breaker.retry_after()) + 1)},
         )
-        thread_id: str = thread_db.thread_id if thread_db else "unknown"
 
-        # Parse structured_data_json if available
-        structured_data: Optional[SummaryContentModel] = None
-        if summary_db.structured_data_json:
-            try:
-                structured_data_dict = json.loads(summary_db.structured_data_json)
-                structured_data = SummaryContentModel(**structured_data_dict)
-            except (json.JSONDecodeError, ValueError):
-                pass
-
-        return SummaryModel(
-            id=summary_db.summary_id,
-            thread_id=thread_id,
-            original_summary=summary_db.original_summary,
-            edited_summary=summary_db.edited_summary,
-            status=summary_db.status.value,
-            approved_by=summary_db.approved_by,
-            approved_at=summary_db.approved_at.isoformat() if summary_db.approved_at else None,
-            remarks=summary_db.remarks,
-            rejection_reason=summary_db.rejection_reason,
-            created_at=summary_db.created_at.isoformat(),
-            updated_at=summary_db.updated_at.isoformat(),
-            structured_data=structured_data,
+    # Built before the job is registered: a job that fails to start here
+    # would otherwise stay in flight and be joined by every later request.
+    # Served from the thread cache unless the thread changed since it was cached
+    thread_model: ThreadModel = load_thread_model(db, thread_db)
+    file_id: Optional[str] = thread_db.file.file_id if thread_db.file else None
+
+    job_id, coalesced = start_summary_job(thread_db.thread_id, task_manager)
+    if coalesced:
+        return SummaryJobResponse(
+            job_id=job_id,
+            thread_id=thread_db.thread_id,
+            status="processing",
+            coalesced=True,
         )
 
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(
-            status_code=500, detail=f"Error generating summary: {str(e)}"
-        )
+    background_tasks.add_task(
+        run_summary_job,
+        job_id=job_id,
+        thread_model=thread_model,
+        thread_db_id=thread_db.id,
+        file_id=file_id,
+        task_manager=task_manager,
+    )
+    return SummaryJobResponse(
+        job_id=job_id, thread_id=thread_db.thread_id, status="processing"
+    )
 
 
-@router.get("/", response_model=list[SummaryModel])
+@router.get(
+    "/", response_model=Union[List[SummaryModel], List[SummaryListItemModel]]
+)
 async def get_summaries(
+    request: Request,
+    response: Response,
     status: Optional[str] = None,
+    view: ListView = Query(
+        ListView.DETAIL,
+        description="detail: full summaries; summary: review state without summary text",
+    ),
     db: Session = Depends(get_db),
-) -> List[SummaryModel]:
+) -> Union[List[SummaryListItemModel], Response]:
     """Get all summaries, optionally filtered by status.
 
+    Answers 304 when the client's If-None-Match matches the current ETag.
+
     Args:
+        request: Incoming request.
+        response: Response whose caching headers are set.
         status: Optional status filter (pending, approved, rejected).
+        view: Projection; the summary view reads no text columns.
         db: Database session.
 
     Returns:
-        List of SummaryModel instances.
+        Streamed JSON array of SummaryModel payloads, list of
+        SummaryListItemModel for the summary view, or an empty 304 response.
     """
+    etag: str = collection_etag(db, request, ("summaries",))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
     query = db.query(Summary)
 
     if status:
@@ -169,51 +168,55 @@ async def get_summaries(
         except ValueError:
             raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
 
-    summaries_db = query.all()
-    summaries: List[SummaryModel] = []
-
-    for summary_db in summaries_db:
-        thread_db: Optional[Thread] = (
-            db.query(Thread).filter(Thread.id == summary_db.thread_id).first()
-        )
-        thread_id: str = thread_db.thread_id if thread_db else "unknown"
-
-        # Parse structured_data_json if available
-        structured_data: Optional[SummaryContentModel] = None
-        if summary_db.structured_data_json:
-            try:
-                structured_data_dict = json.loads(summary_db.structured_data_json)
-                structured_data = SummaryContentModel(**structured_data_dict)
-            except (json.JSONDecodeError, ValueError):
-                pass
-
-        summaries.append(
-            SummaryModel(
-                id=summary_db.summary_id,
-                thread_id=thread_id,
-                original_summary=summary_db.original_summary,
-                edited_summary=summary_db.edited_summary,
-                status=summary_db.status.value,
-                approved_by=summary_db.approved_by,
-                approved_at=summary_db.approved_at.isoformat()
-                if summary_db.approved_at
-                else None,
-                remarks=summary_db.remarks,
-                rejection_reason=summary_db.rejection_reason,
-                created_at=summary_db.created_at.isoformat(),
-                updated_at=summary_db.updated_at.isoformat(),
-                structured_data=structured_data,
+    if view == ListView.SUMMARY:
+        response.headers.update(etag_headers(etag))
+        rows = (
+            query.outerjoin(Thread, Thread.id == Summary.thread_id)
+            .with_entities(
+                Summary.summary_id,
+                Thread.thread_id,
+                Summary.status,
+                Summary.edited_summary.isnot(None),
+                Summary.approved_by,
+                Summary.approved_at,
+                Summary.created_at,
+                Summary.updated_at,
             )
+            .order_by(Summary.id)
         )
-
-    return summaries
+        return [
+            SummaryListItemModel(
+                id=summary_id,
+                thread_id=thread_id or "unknown",
+                status=summary_status.value,
+                edited=bool(edited),
+                approved_by=approved_by,
+                approved_at=approved_at.isoformat() if approved_at else None,
+                created_at=created_at.isoformat(),
+                updated_at=updated_at.isoformat(),
+            )
+            for (
+                summary_id,
+                thread_id,
+                summary_status,
+                edited,
+                approved_by,
+                approved_at,
+                created_at,
+                updated_at,
+            ) in rows
+        ]
+
+    list_response: StreamingResponse = summary_list_response(query)
+    list_response.headers.update(etag_headers(etag))
+    return list_response
 
 
 @router.get("/{summary_id}", response_model=SummaryModel)
 async def get_summary(
     summary_id: str,
     db: Session = Depends(get_db),
-) -> SummaryModel:
+) -> Response:
     """Get a specific summary by ID.
 
     Args:
@@ -221,7 +224,7 @@ async def get_summary(
         db: Database session.
 
     Returns:
-        SummaryModel instance.
+        SummaryModel payload.
 
     Raises:
         HTTPException: If summary not found.
@@ -233,34 +236,92 @@ async def get_summary(
     if not summary_db:
         raise HTTPException(status_code=404, detail="Summary not found")
 
-    thread_db: Optional[Thread] = (
-        db.query(Thread).filter(Thread.id == summary_db.thread_id).first()
+    return summary_response(summary_db)
+
+
+@router.get("/{summary_id}/similar", response_model=List[SimilarSummaryModel])
+async def get_similar_summaries(
+    summary_id: str,
+    k: int = Query(5, ge=1, le=50, description="Number of matches to return"),
+    db: Session = Depends(get_db),
+) -> List[SimilarSummaryModel]:
+    """Get the approved summaries most similar to a summary.
+
+    Matches come from the in-memory index of approved summaries, which is
+    built on the first request and kept current by approvals.
+
+    Args:
+        summary_id: Summary identifier.
+        k: Number of matches to return.
+        db: Database session.
+
+    Returns:
+        List of SimilarSummaryModel instances, most similar first.
+
+    Raises:
+        HTTPException: If summary not found.
+    """
+    summary_db: Optional[Summary] = (
+        db.query(Summary).filter(Summary.summary_id == summary_id).first()
     )
-    thread_id: str = thread_db.thread_id if thread_db else "unknown"
 
-    # Parse structured_data_json if available
-    structured_data: Optional[SummaryContentModel] = None
-    if summary_db.structured_data_json:
-        try:
-            structured_data_dict = json.loads(summary_db.structured_data_json)
-            structured_data = SummaryContentModel(**structured_data_dict)
-        except (json.JSONDecodeError, ValueError):
-            pass
-
-    return SummaryModel(
-        id=summary_db.summary_id,
-        thread_id=thread_id,
-        original_summary=summary_db.original_summary,
-        edited_summary=summary_db.edited_summary,
-        status=summary_db.status.value,
-        approved_by=summary_db.approved_by,
-        approved_at=summary_db.approved_at.isoformat() if summary_db.approved_at else None,
-        remarks=summary_db.remarks,
-        rejection_reason=summary_db.rejection_reason,
-        created_at=summary_db.created_at.isoformat(),
-        updated_at=summary_db.updated_at.isoformat(),
-        structured_data=structured_data,
+    if not summary_db:
+        raise HTTPException(status_code=404, detail="Summary not found")
+
+    index: SimilarCasesIndex = await similar_cases_index.ensure_loaded()
+    matches: List[Tuple[int, float]] = index.query(
+        features_from_row(summary_db), k=k, exclude=summary_db.id
+    )
+    if not matches:
+        return []
+
+    rows = (
+        db.query(Summary, Thread.thread_id)
+        .join(Thread, Thread.id == Summary.thread_id)
+        .filter(Summary.id.in_([summary_db_id for summary_db_id, _ in matches]))
+        .all()
     )
+    rows_by_id = {match_db.id: (match_db, thread_id) for match_db, thread_id in rows}
+
+    similar: List[SimilarSummaryModel] = []
+    for summary_db_id, similarity in matches:
+        if summary_db_id not in rows_by_id:
+            continue
+        match_db, thread_id = rows_by_id[summary_db_id]
+        structured_data: Optional[SummaryContentModel] = None
+        if match_db.structured_data_json:
+            try:
+                structured_data = SummaryContentModel(
+                    **json.loads(match_db.structured_data_json)
+                )
+            except (json.JSONDecodeError, ValueError):
+                pass
+        similar.append(
+            SimilarSummaryModel(
+                summary_id=match_db.summary_id,
+                thread_id=thread_id,
+                similarity=similarity,
+                issue_summary=(
+                    structured_data.issue_summary
+                    if structured_data
+                    else match_db.edited_summary or match_db.original_summary
+                ),
+                issue_type=(
+                    structured_data.context_extraction.issue_type
+                    if structured_data
+                    else None
+                ),
+                resolution_status=(
+                    structured_data.resolution_status if structured_data else None
+                ),
+                resolution_details=(
+                    structured_data.resolution_details if structured_data else None
+                ),
+                remarks=match_db.remarks,
+            )
+        )
+
+    return similar
 
 
 @router.put("/{summary_id}", response_model=SummaryModel)
@@ -268,7 +329,7 @@ async def update_summary(
     summary_id: str,
     request: UpdateSummaryRequest,
     db: Session = Depends(get_db),
-) -> SummaryModel:
+) -> Response:
     """Update (edit) a summary.
 
     Args:
@@ -277,7 +338,7 @@ async def update_summary(
         db: Database session.
 
     Returns:
-        Updated SummaryModel instance.
+        Updated SummaryModel payload.
 
     Raises:
         HTTPException: If summary not found.
@@ -294,34 +355,10 @@ async def update_summary(
     db.commit()
     db.refresh(summary_db)
 
-    thread_db: Optional[Thread] = (
-        db.query(Thread).filter(Thread.id == summary_db.thread_id).first()
-    )
-    thread_id: str = thread_db.thread_id if thread_db else "unknown"
+    if summary_db.status == SummaryStatus.APPROVED:
+        similar_cases_index.add(summary_db.id, features_from_row(summary_db))
 
-    # Parse structured_data_json if available
-    structured_data: Optional[SummaryContentModel] = None
-    if summary_db.structured_data_json:
-        try:
-            structured_data_dict = json.loads(summary_db.structured_data_json)
-            structured_data = SummaryContentModel(**structured_data_dict)
-        except (json.JSONDecodeError, ValueError):
-            pass
-
-    return SummaryModel(
-        id=summary_db.summary_id,
-        thread_id=thread_id,
-        original_summary=summary_db.original_summary,
-        edited_summary=summary_db.edited_summary,
-        status=summary_db.status.value,
-        approved_by=summary_db.approved_by,
-        approved_at=summary_db.approved_at.isoformat() if summary_db.approved_at else None,
-        remarks=summary_db.remarks,
-        rejection_reason=summary_db.rejection_reason,
-        created_at=summary_db.created_at.isoformat(),
-        updated_at=summary_db.updated_at.isoformat(),
-        structured_data=structured_data,
-    )
+    return summary_response(summary_db)
 
 
 @router.post("/{summary_id}/approve", response_model=SummaryModel)
@@ -329,21 +366,22 @@ async def approve_summary(
     summary_id: str,
     request: ApproveSummaryRequest,
     db: Session = Depends(get_db),
-) -> SummaryModel:
+) -> Response:
     """Approve a summary.
 
     TODO: Add authentication to get current user for approved_by field.
 
     Args:
         summary_id: Summary identifier.
-        request: Approve request with required remarks.
+        request: Approve request with required remarks and the reviewer.
         db: Database session.
 
     Returns:
-        Approved SummaryModel instance.
+        Approved SummaryModel payload.
 
     Raises:
-        HTTPException: If summary not found.
+        HTTPException: If summary not found, or another reviewer holds a
+            live review lease on it.
     """
     summary_db: Optional[Summary] = (
         db.query(Summary).filter(Summary.summary_id == summary_id).first()
@@ -351,47 +389,27 @@ async def approve_summary(
 
     if not summary_db:
         raise HTTPException(status_code=404, detail="Summary not found")
+    if held_by_another_reviewer(summary_db, request.reviewer):
+        raise HTTPException(
+            status_code=409, detail="Summary is claimed by another reviewer"
+        )
 
     # TODO: Get current authenticated user
-    approved_by: str = "system"  # Placeholder
+    approved_by: str = request.reviewer or "system"  # Placeholder
 
     summary_db.status = SummaryStatus.APPROVED
     summary_db.approved_by = approved_by
     summary_db.approved_at = datetime.utcnow()
     summary_db.remarks = request.remarks
     summary_db.rejection_reason = None  # Clear rejection reason if it exists
+    summary_db.claimed_by = None  # End the review claim
+    summary_db.lease_expires_at = None
     summary_db.updated_at = datetime.utcnow()
     db.commit()
     db.refresh(summary_db)
+    similar_cases_index.add(summary_db.id, features_from_row(summary_db))
 
-    thread_db: Optional[Thread] = (
-        db.query(Thread).filter(Thread.id == summary_db.thread_id).first()
-    )
-    thread_id: str = thread_db.thread_id if thread_db else "unknown"
-
-    # Parse structured_data_json if available
-    structured_data: Optional[SummaryContentModel] = None
-    if summary_db.structured_data_json:
-        try:
-            structured_data_dict = json.loads(summary_db.structured_data_json)
-            structured_data = SummaryContentModel(**structured_data_dict)
-        except (json.JSONDecodeError, ValueError):
-            pass
-
-    return SummaryModel(
-        id=summary_db.summary_id,
-        thread_id=thread_id,
-        original_summary=summary_db.original_summary,
-        edited_summary=summary_db.edited_summary,
-        status=summary_db.status.value,
-        approved_by=summary_db.approved_by,
-        approved_at=summary_db.approved_at.isoformat() if summary_db.approved_at else None,
-        remarks=summary_db.remarks,
-        rejection_reason=summary_db.rejection_reason,
-        created_at=summary_db.created_at.isoformat(),
-        updated_at=summary_db.updated_at.isoformat(),
-        structured_data=structured_data,
-    )
+    return summary_response(summary_db)
 
 
 @router.post("/{summary_id}/reject", response_model=SummaryModel)
@@ -399,19 +417,20 @@ async def reject_summary(
     summary_id: str,
     request: RejectSummaryRequest,
     db: Session = Depends(get_db),
-) -> SummaryModel:
+) -> Response:
     """Reject a summary.
 
     Args:
         summary_id: Summary identifier.
-        request: Reject request with reason.
+        request: Reject request with reason and the reviewer.
         db: Database session.
 
     Returns:
-        Rejected SummaryModel instance.
+        Rejected SummaryModel payload.
 
     Raises:
-        HTTPException: If summary not found.
+        HTTPException: If summary not found, or another reviewer holds a
+            live review lease on it.
     """
     summary_db: Optional[Summary] = (
         db.query(Summary).filter(Summary.summary_id == summary_id).first()
@@ -419,60 +438,43 @@ async def reject_summary(
 
     if not summary_db:
         raise HTTPException(status_code=404, detail="Summary not found")
+    if held_by_another_reviewer(summary_db, request.reviewer):
+        raise HTTPException(
+            status_code=409, detail="Summary is claimed by another reviewer"
+        )
 
     summary_db.status = SummaryStatus.REJECTED
     summary_db.rejection_reason = request.reason
     summary_db.remarks = None  # Clear remarks if it exists
+    summary_db.claimed_by = None  # End the review claim
+    summary_db.lease_expires_at = None
     summary_db.updated_at = datetime.utcnow()
     db.commit()
     db.refresh(summary_db)
+    similar_cases_index.remove(summary_db.id)
 
-    thread_db: Optional[Thread] = (
-        db.query(Thread).filter(Thread.id == summary_db.thread_id).first()
-    )
-    thread_id: str = thread_db.thread_id if thread_db else "unknown"
-
-    # Parse structured_data_json if available
-    structured_data: Optional[SummaryContentModel] = None
-    if summary_db.structured_data_json:
-        try:
-            structured_data_dict = json.loads(summary_db.structured_data_json)
-            structured_data = SummaryContentModel(**structured_data_dict)
-        except (json.JSONDecodeError, ValueError):
-            pass
-
-    return SummaryModel(
-        id=summary_db.summary_id,
-        thread_id=thread_id,
-        original_summary=summary_db.original_summary,
-        edited_summary=summary_db.edited_summary,
-        status=summary_db.status.value,
-        approved_by=summary_db.approved_by,
-        approved_at=summary_db.approved_at.isoformat() if summary_db.approved_at else None,
-        remarks=summary_db.remarks,
-        rejection_reason=summary_db.rejection_reason,
-        created_at=summary_db.created_at.isoformat(),
-        updated_at=summary_db.updated_at.isoformat(),
-        structured_data=structured_data,
-    )
+    return summary_response(summary_db)
 
 
 @router.post("/{summary_id}/undo", response_model=SummaryModel)
 async def undo_summary_action(
     summary_id: str,
+    request: Optional[UndoSummaryRequest] = None,
     db: Session = Depends(get_db),
-) -> SummaryModel:
+) -> Response:
     """Undo approval/rejection and reset summary status to pending.
 
     Args:
         summary_id: Summary identifier.
+        request: Optional undo request with the reviewer.
         db: Database session.
 
     Returns:
-        SummaryModel instance with status reset to pending.
+        SummaryModel payload with status reset to pending.
 
     Raises:
-        HTTPException: If summary not found.
+        HTTPException: If summary not found, or another reviewer holds a
+            live review lease on it.
     """
     summary_db: Optional[Summary] = (
         db.query(Summary).filter(Summary.summary_id == summary_id).first()
@@ -480,6 +482,11 @@ async def undo_summary_action(
 
     if not summary_db:
         raise HTTPException(status_code=404, detail="Summary not found")
+    reviewer: Optional[str] = request.reviewer if request else None
+    if held_by_another_reviewer(summary_db, reviewer):
+        raise HTTPException(
+            status_code=409, detail="Summary is claimed by another reviewer"
+        )
 
     # Reset to pending status and clear approval/rejection data
     summary_db.status = SummaryStatus.PENDING
@@ -487,35 +494,235 @@ async def undo_summary_action(
     summary_db.approved_at = None
     summary_db.remarks = None
     summary_db.rejection_reason = None
+    summary_db.claimed_by = None
+    summary_db.lease_expires_at = None
     summary_db.updated_at = datetime.utcnow()
     db.commit()
     db.refresh(summary_db)
+    similar_cases_index.remove(summary_db.id)
 
-    thread_db: Optional[Thread] = (
-        db.query(Thread).filter(Thread.id == summary_db.thread_id).first()
+    return summary_response(summary_db)
+
+
+# Confidence scores stored in structured_data_json, one per extraction
+CONFIDENCE_FIELDS: Tuple[str, ...] = tuple(ConfidenceScoresModel.model_fields)
+
+
+def _min_confidence():
+    """SQL expression for the lowest confidence score of a summary.
+
+    NULL when the summary has no confidence scores, so it never passes a
+    min_confidence filter.
+    """
+    return case(
+        (
+            func.json_valid(Summary.structured_data_json) == 1,
+            func.min(
+                *(
+                    func.json_extract(
+                        Summary.structured_data_json, f"$.confidence_scores.{field}"
+                    )
+                    for field in CONFIDENCE_FIELDS
+                )
+            ),
+        ),
+        else_=None,
     )
-    thread_id: str = thread_db.thread_id if thread_db else "unknown"
 
-    # Parse structured_data_json if available
-    structured_data: Optional[SummaryContentModel] = None
-    if summary_db.structured_data_json:
-        try:
-            structured_data_dict = json.loads(summary_db.structured_data_json)
-            structured_data = SummaryContentModel(**structured_data_dict)
-        except (json.JSONDecodeError, ValueError):
-            pass
-
-    return SummaryModel(
-        id=summary_db.summary_id,
-        thread_id=thread_id,
-        original_summary=summary_db.original_summary,
-        edited_summary=summary_db.edited_summary,
-        status=summary_db.status.value,
-        approved_by=summary_db.approved_by,
-        approved_at=summary_db.approved_at.isoformat() if summary_db.approved_at else None,
-        remarks=summary_db.remarks,
-        rejection_reason=summary_db.rejection_reason,
-        created_at=summary_db.created_at.isoformat(),
-        updated_at=summary_db.updated_at.isoformat(),
-        structured_data=structured_data,
+
+# Result detail of a bulk action for a summary another reviewer is on
+LEASED_DETAIL: str = "Summary is leased to another reviewer"
+
+
+def _action_values(request: BulkSummaryActionRequest, now: datetime) -> dict:
+    """Get the columns written by a workflow action.
+
+    Mirrors the single-summary approve, reject and undo endpoints, which
+    also end any review claim. Summaries leased to another reviewer are
+    excluded by the caller.
+
+    Args:
+        request: Bulk action request.
+        now: Timestamp of the action.
+
+    Returns:
+        Column values for the UPDATE statement.
+    """
+    if request.action == SummaryAction.APPROVE:
+        return {
+            "status": SummaryStatus.APPROVED,
+            "approved_by": request.reviewer,
+            "approved_at": now,
+            "remarks": request.remarks,
+            "rejection_reason": None,
+            "claimed_by": None,
+            "lease_expires_at": None,
+            "updated_at": now,
+        }
+    if request.action == SummaryAction.REJECT:
+        return {
+            "status": SummaryStatus.REJECTED,
+            "rejection_reason": request.reason,
+            "remarks": None,
+            "claimed_by": None,
+            "lease_expires_at": None,
+            "updated_at": now,
+        }
+    return {
+        "status": SummaryStatus.PENDING,
+        "approved_by": None,
+        "approved_at": None,
+        "remarks": None,
+        "rejection_reason": None,
+        "claimed_by": None,
+        "lease_expires_at": None,
+        "updated_at": now,
+    }
+
+
+@router.post("/bulk", response_model=BulkSummaryActionResponse)
+async def bulk_summary_action(
+    request: BulkSummaryActionRequest,
+    db: Session = Depends(get_db),
+) -> BulkSummaryActionResponse:
+    """Approve, reject or undo many summaries in one transaction.
+
+    Summaries are selected by ID or by a filter. Each chunk of IDs, or the
+    whole filter, is applied with one UPDATE ... RETURNING, and one
+    summaries_updated event is published for the batch. Summaries another
+    reviewer holds a live review lease on are skipped and reported as not
+    updated.
+
+    Args:
+        request: Action, summaries to update, approval remarks or
+            rejection reason, and the reviewer applying the action.
+        db: Database session.
+
+    Returns:
+        BulkSummaryActionResponse with the outcome per summary.
+
+    Raises:
+        HTTPException: If the selection or the action's text is missing or
+            invalid, or the filter's file is not found.
+    """
+    if (request.summary_ids is None) == (request.filter is None):
+        raise HTTPException(
+            status_code=400, detail="Provide either summary_ids or filter"
+        )
+    if request.action == SummaryAction.APPROVE and not request.remarks:
+        raise HTTPException(status_code=400, detail="Remarks are required to approve")
+    if request.action == SummaryAction.REJECT and not request.reason:
+        raise HTTPException(status_code=400, detail="Reason is required to reject")
+
+    conditions: List[list] = []
+    file_id: Optional[str] = None
+    if request.summary_ids is not None:
+        # Deduplicated, in request order
+        summary_ids: List[str] = list(dict.fromkeys(request.summary_ids))
+        conditions = [
+            [Summary.summary_id.in_(summary_ids[start : start + LOOKUP_CHUNK_SIZE])]
+            for start in range(0, len(summary_ids), LOOKUP_CHUNK_SIZE)
+        ]
+    else:
+        summary_filter: BulkSummaryFilter = request.filter
+        criteria: list = []
+        if summary_filter.file_id:
+            file_db: Optional[File] = (
+                db.query(File).filter(File.file_id == summary_filter.file_id).first()
+            )
+            if not file_db:
+                raise HTTPException(status_code=404, detail="File not found")
+            file_id = summary_filter.file_id
+            criteria.append(
+                Summary.thread_id.in_(
+                    select(Thread.id).where(Thread.file_id == file_db.id)
+                )
+            )
+        if summary_filter.status:
+            criteria.append(Summary.status == summary_filter.status)
+        if summary_filter.min_confidence is not None:
+            criteria.append(_min_confidence() >= summary_filter.min_confidence)
+        if not criteria:
+            raise HTTPException(
+                status_code=400, detail="Filter needs at least one criterion"
+            )
+        conditions = [criteria]
+
+    now: datetime = datetime.utcnow()
+    values: dict = _action_values(request, now)
+    leased_elsewhere = ~lease_allows(request.reviewer, now)
+    returned_columns = [Summary.id, Summary.summary_id]
+    if request.action == SummaryAction.APPROVE:
+        # Text columns for indexing approved summaries as similar cases
+        returned_columns += [
+            Summary.structured_data_json,
+            Summary.edited_summary,
+            Summary.original_summary,
+        ]
+
+    updated_rows: list = []
+    leased_ids: set = set()
+    for criteria in conditions:
+        updated_rows.extend(
+            db.execute(
+                update(Summary)
+                .where(*criteria, lease_allows(request.reviewer, now))
+                .values(**values)
+                .returning(*returned_columns)
+                .execution_options(synchronize_session=False)
+            ).all()
+        )
+        # Read in the same transaction, so the skipped rows are still leased
+        leased_ids.update(
+            db.execute(
+                select(Summary.summary_id).where(*criteria, leased_elsewhere)
+            ).scalars()
+        )
+    db.commit()
+    updated_rows.sort(key=lambda row: row.id)
+
+    for row in updated_rows:
+        if request.action == SummaryAction.APPROVE:
+            similar_cases_index.add(row.id, features_from_row(row))
+        else:
+            similar_cases_index.remove(row.id)
+
+    new_status: SummaryStatus = values["status"]
+    updated_ids: List[str] = [row.summary_id for row in updated_rows]
+    if request.summary_ids is not None:
+        updated_set = set(updated_ids)
+        results: List[BulkSummaryResultModel] = [
+            BulkSummaryResultModel(id=summary_id, updated=True, status=new_status)
+            if summary_id in updated_set
+            else BulkSummaryResultModel(
+                id=summary_id,
+                updated=False,
+                detail=(
+                    LEASED_DETAIL if summary_id in leased_ids else "Summary not found"
+                ),
+            )
+            for summary_id in summary_ids
+        ]
+    else:
+        results = [
+            BulkSummaryResultModel(id=summary_id, updated=True, status=new_status)
+            for summary_id in updated_ids
+        ] + [
+            BulkSummaryResultModel(id=summary_id, updated=False, detail=LEASED_DETAIL)
+            for summary_id in sorted(leased_ids)
+        ]
+
+    if updated_ids:
+        event_bus.publish(
+            {
+                "type": "summaries_updated",
+                "action": request.action.value,
+                "status": new_status.value,
+                "file_id": file_id,
+                "summary_ids": updated_ids,
+            }
+        )
+
+    return BulkSummaryActionResponse(
+        action=request.action, updated=len(updated_ids), results=results
     )
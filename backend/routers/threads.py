@@ -1,34 +1,59 @@
 """API routes for thread management."""
 
-from typing import List, Optional
+from typing import Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from database import File, Message, Thread, get_db
 from database.models import (
-    MessageModel,
+    ListView,
+    ThreadListItemModel,
+    ThreadListResponseModel,
     ThreadModel,
     ThreadsResponseModel,
 )
+from services.background import task_manager
+from services.etags import collection_etag, etag_headers, etag_matches, not_modified
+from services.thread_payloads import thread_list_response, thread_payload_by_id
 
 router = APIRouter(prefix="/api/threads", tags=["threads"])
 
 
-@router.get("/", response_model=ThreadsResponseModel)
+@router.get("/", response_model=Union[ThreadsResponseModel, ThreadListResponseModel])
 async def get_threads(
+    request: Request,
+    response: Response,
     file_id: Optional[str] = None,
+    view: ListView = Query(
+        ListView.DETAIL,
+        description="detail: threads with messages; summary: metadata and message count only",
+    ),
     db: Session = Depends(get_db),
-) -> ThreadsResponseModel:
+) -> Union[ThreadsResponseModel, ThreadListResponseModel, Response]:
     """Get threads, optionally filtered by file_id.
 
+    Answers 304 when the client's If-None-Match matches the current ETag.
+    The detail view is streamed in batches of threads.
+
     Args:
+        request: Incoming request.
+        response: Response whose caching headers are set.
         file_id: Optional file ID to filter threads by.
+        view: Projection; the summary view reads no message rows.
         db: Database session.
 
     Returns:
-        ThreadsResponseModel containing filtered threads.
+        Streamed ThreadsResponseModel containing filtered threads,
+        ThreadListResponseModel for the summary view, or an empty 304
+        response.
     """
+    etag: str = collection_etag(db, request, ("files", "threads", "messages"))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(etag_headers(etag))
+
     # Build query - filter by file_id if provided
     query = db.query(Thread)
     if file_id:
@@ -46,100 +71,76 @@ async def get_threads(
                 threads=[],
             )
 
-    threads_db: List[Thread] = query.all()
-    threads: List[ThreadModel] = []
-
-    for thread_db in threads_db:
-        messages_db: List[Message] = (
-            db.query(Message)
-            .filter(Message.thread_id == thread_db.id)
-            .order_by(Message.timestamp)
-            .all()
+    if view == ListView.SUMMARY:
+        # Counted from the messages.thread_id index, bodies are never read
+        message_count = (
+            select(func.count(Message.id))
+            .where(Message.thread_id == Thread.id)
+            .scalar_subquery()
         )
-
-        messages: List[dict] = [
-            {
-                "id": msg.message_id,
-                "sender": msg.sender.value,
-                "timestamp": msg.timestamp,
-                "body": msg.body,
-            }
-            for msg in messages_db
-        ]
-
-        thread_model = ThreadModel(
-            thread_id=thread_db.thread_id,
-            topic=thread_db.topic,
-            subject=thread_db.subject,
-            initiated_by=thread_db.initiated_by.value,
-            order_id=thread_db.order_id,
-            product=thread_db.product,
-            messages=[MessageModel(**msg) for msg in messages],
+        rows = query.with_entities(
+            Thread.thread_id,
+            Thread.topic,
+            Thread.subject,
+            Thread.initiated_by,
+            Thread.order_id,
+            Thread.product,
+            message_count,
+        ).all()
+        return ThreadListResponseModel(
+            version="v2",
+            generated_at="2025-09-15T10:39:29",
+            description="CE email threads loaded from database",
+            threads=[
+                ThreadListItemModel(
+                    thread_id=thread_id,
+                    topic=topic,
+                    subject=subject,
+                    initiated_by=initiated_by.value,
+                    order_id=order_id,
+                    product=product,
+                    message_count=count,
+                )
+                for thread_id, topic, subject, initiated_by, order_id, product, count in rows
+            ],
         )
 
-        threads.append(thread_model)
-
     # Note: Summaries are fetched separately via /api/summaries endpoint
     # Frontend should merge summaries with threads based on thread_id
 
-    return ThreadsResponseModel(
-        version="v2",
-        generated_at="2025-09-15T10:39:29",
-        description="CE email threads loaded from database",
-        threads=threads,
+    list_response = thread_list_response(
+        "CE email threads loaded from database",
+        file_db.id if file_id else None,
     )
+    list_response.headers.update(etag_headers(etag))
+    return list_response
 
 
 @router.get("/{thread_id}", response_model=ThreadModel)
 async def get_thread(
     thread_id: str,
     db: Session = Depends(get_db),
-) -> ThreadModel:
+) -> Response:
     """Get a specific thread by ID.
 
+    Served from the thread cache when possible.
+
     Args:
         thread_id: Thread identifier.
         db: Database session.
 
     Returns:
-        ThreadModel instance.
+        ThreadModel payload.
 
     Raises:
         HTTPException: If thread not found.
     """
-    thread_db: Optional[Thread] = (
-        db.query(Thread).filter(Thread.thread_id == thread_id).first()
-    )
+    payload: Optional[bytes] = thread_payload_by_id(db, thread_id)
 
-    if not thread_db:
+    if payload is None:
         raise HTTPException(status_code=404, detail="Thread not found")
 
-    messages_db: List[Message] = (
-        db.query(Message)
-        .filter(Message.thread_id == thread_db.id)
-        .order_by(Message.timestamp)
-        .all()
-    )
-
-    messages: List[dict] = [
-        {
-            "id": msg.message_id,
-            "sender": msg.sender.value,
-            "timestamp": msg.timestamp,
-            "body": msg.body,
-        }
-        for msg in messages_db
-    ]
-
-    return ThreadModel(
-        thread_id=thread_db.thread_id,
-        topic=thread_db.topic,
-        subject=thread_db.subject,
-        initiated_by=thread_db.initiated_by.value,
-        order_id=thread_db.order_id,
-        product=thread_db.product,
-        messages=[MessageModel(**msg) for msg in messages],
-    )
+    return Response(content=payload, media_type="application/json")
 
 
 @router.get("/task/{task_id}/status")
@@ -0,0 +1,135 @@
+"""Throughput benchmark for GET /api/summaries.
+
+Seeds a throwaway SQLite database with synthetic summaries and measures the
+list endpoint in-process, with the payload cache cleared before every
+request (cold) and kept (warm).
+
+Usage (from the backend directory):
+    uv run python scripts/benchmark_summaries.py --summaries 5000 --requests 20
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+BACKEND_DIR: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def seed(count: int) -> None:
+    """Insert one file with count threads, each with a summary.
+
+    Args:
+        count: Number of summaries to create.
+    """
+    from database import File, SessionLocal, Summary, Thread
+    from database.models import (
+        CRMContextModel,
+        ExtractedContextModel,
+        SenderType,
+        SummaryContentModel,
+        SummaryStatus,
+    )
+
+    db = SessionLocal()
+    try:
+        file_db = File(file_id="file-benchmark", file_name="benchmark.json")
+        db.add(file_db)
+        db.flush()
+        threads: List[Thread] = [
+            Thread(
+                thread_id=f"CE-BENCH-{i}",
+                file_id=file_db.id,
+                topic="Damaged product",
+                subject=f"Order {i} arrived damaged",
+                initiated_by=SenderType.CUSTOMER,
+                order_id=f"ORD-{i}",
+                product="Widget",
+            )
+            for i in range(count)
+        ]
+        db.add_all(threads)
+        db.flush()
+        statuses: List[SummaryStatus] = list(SummaryStatus)
+        for i, thread_db in enumerate(threads):
+            content = SummaryContentModel(
+                issue_summary=f"Customer reports order ORD-{i} arrived with a cracked casing.",
+                key_details=CRMContextModel(order_id=f"ORD-{i}", product="Widget"),
+                context_extraction=ExtractedContextModel(
+                    issue_type="damaged product",
+                    customer_sentiment="negative",
+                    urgency_level="high",
+                    customer_intent="replacement",
+                    key_phrases=["cracked casing", "arrived damaged"],
+                ),
+                resolution_status="pending",
+                resolution_details="Replacement approved, awaiting warehouse dispatch.",
+                full_summary_text="## Issue Summary\nCracked casing on arrival.\n\n"
+                "## Timeline\n- Customer reported damage\n- Agent approved replacement\n\n"
+                "## Resolution Status\nPending dispatch.",
+            )
+            db.add(
+                Summary(
+                    thread_id=thread_db.id,
+                    summary_id=f"sum-bench-{i}",
+                    original_summary=content.full_summary_text,
+                    status=statuses[i % len(statuses)],
+                    structured_data_json=content.model_dump_json(),
+                    model="benchmark",
+                    prompt_tokens=900,
+                    completion_tokens=250,
+                    total_tokens=1150,
+                    api_calls=1,
+                    chunk_count=1,
+                    latency_ms=1200.0,
+                )
+            )
+        db.commit()
+    finally:
+        db.close()
+
+
+def main() -> None:
+    """Run the benchmark and print throughput per mode."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--summaries", type=int, default=5000, help="Summaries to seed")
+    parser.add_argument("--requests", type=int, default=20, help="Requests per mode")
+    args = parser.parse_args()
+
+    # The database path is relative to the working directory
+    sys.path.insert(0, BACKEND_DIR)
+    os.chdir(tempfile.mkdtemp(prefix="summaries-benchmark-"))
+
+    from fastapi.testclient import TestClient
+
+    import main as app_module
+    from services.summary_payloads import summary_payload_cache
+
+    with TestClient(app_module.app) as client:
+        seed(args.summaries)
+        print(f"Seeded {args.summaries} summaries in {os.getcwd()}")
+
+        for mode in ("cold", "warm"):
+            client.get("/api/summaries/")
+            elapsed: float = 0.0
+            size: int = 0
+            for _ in range(args.requests):
+                if mode == "cold":
+                    summary_payload_cache.clear()
+                started: float = time.perf_counter()
+                response = client.get("/api/summaries/")
+                elapsed += time.perf_counter() - started
+                size = len(response.content)
+            per_request_ms: float = elapsed / args.requests * 1000
+            print(
+                f"{mode:>5}: {per_request_ms:8.1f} ms/request, "
+                f"{args.requests / elapsed:7.1f} requests/s, "
+                f"{args.summaries * args.requests / elapsed:9.0f} summaries/s, "
+                f"{size / 1024:.0f} KiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
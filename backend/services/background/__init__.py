@@ -7,15 +7,35 @@ for simplicity in the prototype.
 
 import asyncio
 import os
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from database.models import ThreadModel
 
-from services.background.database_ops import prepare_thread_in_db
+from services.background.database_ops import (
+    find_unchanged_threads,
+    get_incremental_states,
+    load_minhash_signatures,
+    prepare_thread_in_db,
+    save_near_duplicates,
+)
+from services.background.dedup import (
+    NEAR_DUPLICATE_DETECTION,
+    NEAR_DUPLICATE_REUSE,
+    find_near_duplicates,
+    near_duplicate_index,
+    sign_threads,
+)
 from services.background.json_loader import load_threads_from_json
+from services.background.scheduler import bulk_priority
+from services.background.summary_jobs import run_summary_job, start_summary_job
 from services.background.task_manager import BackgroundTaskManager
-from services.background.thread_processor import process_thread_with_api
+from services.background.thread_processor import (
+    process_duplicate_thread,
+    process_thread_batch_with_api,
+    process_thread_with_api,
+)
 from services.openrouter import OpenRouterService
+from services.openrouter.config import BATCH_SMALL_THREADS, INCREMENTAL_SUMMARIES
 
 # Global task manager instance
 task_manager: BackgroundTaskManager = BackgroundTaskManager()
@@ -35,7 +55,9 @@ async def process_threads_background(
     """Process threads in background with truly concurrent API calls.
 
     Strategy:
-    1. First, prepare all threads in DB (fast, sequential to avoid DB locks)
+    1. First, prepare all threads in DB (fast, sequential to avoid DB locks),
+       skipping threads whose content fingerprint is unchanged since a previous
+       upload and writing only the message diff of changed threads
     2. Then, make ALL API calls concurrently using httpx (no waiting)
     3. As each API response arrives, immediately save to DB
     4. Update progress as each completes
@@ -54,8 +76,20 @@ async def process_threads_background(
         )
 
         # Step 1: Prepare all threads in database first (fast, can be sequential)
-        # This avoids DB locks during API calls
+        # This avoids DB locks during API calls. Threads that are unchanged
+        # since a previous upload and already summarized are skipped entirely.
         print("Preparing threads in database...")
+        unchanged: Dict[str, int] = await find_unchanged_threads(threads_data, file_id)
+        if unchanged:
+            print(f"Skipping {len(unchanged)} unchanged threads")
+            task_manager.set_task_fields(task_id, skipped=len(unchanged))
+            await task_manager.increment_progress(task_id, increment=len(unchanged))
+
+        threads_data = [
+            thread_model
+            for thread_model in threads_data
+            if thread_model.thread_id not in unchanged
+        ]
         thread_db_ids: Dict[str, Optional[int]] = {}
         for thread_model in threads_data:
             thread_db_id = await prepare_thread_in_db(thread_model, file_id)
@@ -72,7 +106,66 @@ async def process_threads_background(
         # httpx.AsyncClient handles connection pooling and concurrency automatically
         print("Starting concurrent API calls...")
         async with OpenRouterService() as openrouter_service:
-            # Create tasks for all API calls - they will run concurrently
+            prepared_threads: List[ThreadModel] = [
+                thread_model
+                for thread_model in threads_data
+                if thread_db_ids.get(thread_model.thread_id) is not None
+            ]
+
+            # Threads that only gained messages update their summary from its
+            # rolling state instead of being summarized from scratch
+            incremental_states: Dict[str, Tuple[int, str]] = {}
+            if INCREMENTAL_SUMMARIES:
+                incremental_states = get_incremental_states(
+                    prepared_threads, thread_db_ids
+                )
+                if incremental_states:
+                    print(f"Updating {len(incremental_states)} summaries incrementally")
+
+            # Flag near-duplicates of summarized threads; with reuse enabled their
+            # summaries are derived from the match once it is summarized
+            duplicates: Dict[str, Tuple[str, float]] = {}
+            if NEAR_DUPLICATE_DETECTION:
+                duplicates = await _flag_near_duplicates(
+                    [
+                        thread_model
+                        for thread_model in prepared_threads
+                        if thread_model.thread_id not in incremental_states
+                    ],
+                    thread_db_ids,
+                )
+                task_manager.set_task_fields(task_id, near_duplicates=len(duplicates))
+                if duplicates:
+                    print(f"Flagged {len(duplicates)} near-duplicate threads")
+            deferred: Dict[str, Tuple[str, float]] = (
+                duplicates if NEAR_DUPLICATE_REUSE else {}
+            )
+
+            # Pack small threads into shared calls; the rest go individually
+            batches: List[List[ThreadModel]] = []
+            singles: List[ThreadModel] = [
+                thread_model
+                for thread_model in prepared_threads
+                if thread_model.thread_id not in incremental_states
+                and thread_model.thread_id not in deferred
+            ]
+            if BATCH_SMALL_THREADS:
+                batches, singles = openrouter_service.plan_batches(singles)
+                print(
+                    f"Batched {sum(len(b) for b in batches)} small threads into {len(batches)} calls"
+                )
+            singles += [
+                thread_model
+                for thread_model in prepared_threads
+                if thread_model.thread_id in incremental_states
+            ]
+
+            # Create tasks for all API calls - they queue for bulk lane slots of
+            # the global scheduler in priority order
+            positions: Dict[str, int] = {
+                thread_model.thread_id: index
+                for index, thread_model in enumerate(threads_data)
+            }
             api_tasks = [
                 process_thread_with_api(
                     thread_model=thread_model,
@@ -80,14 +173,52 @@ async def process_threads_background(
                     task_id=task_id,
                     openrouter_service=openrouter_service,
                     task_manager=task_manager,
+                    priority=bulk_priority(
+                        thread_model, positions[thread_model.thread_id]
+                    ),
+                    incremental_state=incremental_states.get(thread_model.thread_id),
                 )
-                for thread_model in threads_data
-                if thread_db_ids.get(thread_model.thread_id) is not None
+                for thread_model in singles
+            ] + [
+                process_thread_batch_with_api(
+                    thread_models=batch,
+                    thread_db_ids=thread_db_ids,
+                    task_id=task_id,
+                    openrouter_service=openrouter_service,
+                    task_manager=task_manager,
+                    priority=bulk_priority(batch[0], positions[batch[0].thread_id]),
+                )
+                for batch in batches
             ]
 
             # Process all API calls concurrently - httpx handles the concurrency
             # Results are written to DB as each API response arrives
-            results = await asyncio.gather(*api_tasks, return_exceptions=True)
+            gathered: List[Any] = await asyncio.gather(
+                *api_tasks, return_exceptions=True
+            )
+
+            # Derive near-duplicate summaries now that their matches are saved
+            gathered += await asyncio.gather(
+                *(
+                    process_duplicate_thread(
+                        thread_model=thread_model,
+                        thread_db_id=thread_db_ids.get(thread_model.thread_id),
+                        source_thread_id=deferred[thread_model.thread_id][0],
+                        task_id=task_id,
+                        openrouter_service=openrouter_service,
+                        task_manager=task_manager,
+                        priority=bulk_priority(
+                            thread_model, positions[thread_model.thread_id]
+                        ),
+                    )
+                    for thread_model in prepared_threads
+                    if thread_model.thread_id in deferred
+                ),
+                return_exceptions=True,
+            )
+            results: List[Any] = []
+            for result in gathered:
+                results.extend(result if isinstance(result, list) else [result])
 
             # Count successes and failures
             success_count = sum(1 for r in results if isinstance(r, tuple) and r[0])
@@ -116,10 +247,39 @@ async def process_threads_background(
         task_manager.complete_task(task_id, success=False)
 
 
+async def _flag_near_duplicates(
+    thread_models: List[ThreadModel],
+    thread_db_ids: Dict[str, Optional[int]],
+) -> Dict[str, Tuple[str, float]]:
+    """Match threads against the near-duplicate index and store the flags.
+
+    Args:
+        thread_models: Threads about to be summarized, in processing order.
+        thread_db_ids: Mapping of thread_id to database ID.
+
+    Returns:
+        (matching thread_id, similarity) per flagged thread_id.
+    """
+    if not near_duplicate_index.loaded:
+        stored = await asyncio.to_thread(load_minhash_signatures)
+        for thread_id, topic, signature in stored:
+            near_duplicate_index.add(thread_id, topic, signature)
+        near_duplicate_index.loaded = True
+
+    # Signing is CPU-bound; matching is cheap and stays on the event loop so
+    # the index is only ever touched from one thread
+    signatures = await asyncio.to_thread(sign_threads, thread_models)
+    duplicates = find_near_duplicates(near_duplicate_index, thread_models, signatures)
+    await save_near_duplicates(thread_db_ids, signatures, duplicates)
+    return duplicates
+
+
 # Re-export for backward compatibility
 __all__ = [
     "task_manager",
     "load_threads_from_json",
     "process_threads_background",
+    "start_summary_job",
+    "run_summary_job",
     "BackgroundTaskManager",
 ]
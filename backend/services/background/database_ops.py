@@ -3,20 +3,114 @@
 import asyncio
 import json
 import uuid
-from typing import Optional
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 
-from database import Message, SessionLocal, Summary, Thread
-from database.models import MessageModel, SummaryContentModel, SummaryStatus, ThreadModel
+from database import URGENCY_PRIORITY, Message, SessionLocal, Summary, Thread
+from database.models import (
+    MessageModel,
+    SummaryContentModel,
+    SummaryStatus,
+    ThreadModel,
+    UsageModel,
+)
+from services.background.fingerprints import (
+    message_fingerprint,
+    prefix_fingerprint,
+    thread_fingerprint,
+)
+from services.openrouter.summary_renderer import render_rolling_state
+from services.similar_cases import features_from_row, similar_cases_index
+from services.thread_payloads import thread_payload_cache
 from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session
 
 
+# Thread identifiers per IN (...) query, below SQLite's bound parameter limit
+LOOKUP_CHUNK_SIZE: int = 500
+
+
+async def find_unchanged_threads(
+    thread_models: List[ThreadModel],
+    file_id: Optional[int],
+) -> Dict[str, int]:
+    """Find threads that are already stored, unchanged and summarized.
+
+    Unchanged threads are linked to the new file so its progress counts their
+    existing summaries.
+
+    Args:
+        thread_models: Uploaded threads.
+        file_id: Optional database ID of the file being uploaded.
+
+    Returns:
+        Mapping of thread_id to thread DB ID for threads that can be skipped.
+    """
+    fingerprints: Dict[str, str] = {
+        thread_model.thread_id: thread_fingerprint(thread_model)
+        for thread_model in thread_models
+    }
+    thread_ids: List[str] = list(fingerprints)
+    max_retries = 5
+    retry_delay = 0.5
+
+    for attempt in range(max_retries):
+        db: Session = SessionLocal()
+        try:
+            unchanged: Dict[str, int] = {}
+            for start in range(0, len(thread_ids), LOOKUP_CHUNK_SIZE):
+                chunk: List[str] = thread_ids[start : start + LOOKUP_CHUNK_SIZE]
+                rows = (
+                    db.query(Thread.id, Thread.thread_id, Thread.content_hash)
+                    .filter(Thread.thread_id.in_(chunk))
+                    .filter(
+                        db.query(Summary.id)
+                        .filter(Summary.thread_id == Thread.id)
+                        .exists()
+                    )
+                    .all()
+                )
+                for thread_db_id, thread_id, content_hash in rows:
+                    if content_hash == fingerprints[thread_id]:
+                        unchanged[thread_id] = thread_db_id
+
+            if file_id and unchanged:
+                db_ids: List[int] = list(unchanged.values())
+                for start in range(0, len(db_ids), LOOKUP_CHUNK_SIZE):
+                    db.query(Thread).filter(
+                        Thread.id.in_(db_ids[start : start + LOOKUP_CHUNK_SIZE])
+                    ).update({Thread.file_id: file_id}, synchronize_session=False)
+                db.commit()
+            db.close()
+            return unchanged
+
+        except OperationalError as e:
+            db.rollback()
+            db.close()
+            if "database is locked" in str(e).lower() and attempt < max_retries - 1:
+                wait_time = retry_delay * (2**attempt)
+                await asyncio.sleep(wait_time)
+                continue
+            print(f"Error looking up unchanged threads: {str(e)}")
+            return {}
+        except Exception as e:
+            db.rollback()
+            db.close()
+            print(f"Error looking up unchanged threads: {str(e)}")
+            return {}
+
+    return {}
+
+
 async def prepare_thread_in_db(
     thread_model: ThreadModel,
     file_id: Optional[int],
 ) -> Optional[int]:
     """Prepare thread in database (create thread and messages).
 
+    An existing thread is updated in place: only messages that were added,
+    removed or changed since the last upload are written.
+
     Returns thread DB ID or None if failed.
     """
     max_retries = 5
@@ -36,8 +130,12 @@ async def prepare_thread_in_db(
                 thread_db: Thread = existing_thread
                 if file_id:
                     thread_db.file_id = file_id
-                # Clear existing messages
-                db.query(Message).filter(Message.thread_id == thread_db.id).delete()
+                thread_db.topic = thread_model.topic
+                thread_db.subject = thread_model.subject
+                thread_db.initiated_by = thread_model.initiated_by
+                thread_db.order_id = thread_model.order_id
+                thread_db.product = thread_model.product
+                _apply_message_diff(db, thread_db.id, thread_model.messages)
             else:
                 # Create new thread
                 thread_db = Thread(
@@ -52,18 +150,13 @@ async def prepare_thread_in_db(
                 db.add(thread_db)
                 db.flush()
 
-            # Add messages
-            for msg_model in thread_model.messages:
-                message_db = Message(
-                    thread_id=thread_db.id,
-                    message_id=msg_model.id,
-                    sender=msg_model.sender,
-                    timestamp=msg_model.timestamp,
-                    body=msg_model.body,
-                )
-                db.add(message_db)
+                # Add messages
+                for msg_model in thread_model.messages:
+                    db.add(_message_from_model(thread_db.id, msg_model))
 
+            thread_db.content_hash = thread_fingerprint(thread_model)
             db.commit()
+            thread_payload_cache.invalidate(thread_model.thread_id)
             thread_db_id = thread_db.id
             db.close()
             return thread_db_id
@@ -86,12 +179,324 @@ async def prepare_thread_in_db(
     return None
 
 
+def _message_from_model(thread_db_id: int, msg_model: MessageModel) -> Message:
+    """Build a message row with its content fingerprint."""
+    return Message(
+        thread_id=thread_db_id,
+        message_id=msg_model.id,
+        sender=msg_model.sender,
+        timestamp=msg_model.timestamp,
+        body=msg_model.body,
+        content_hash=message_fingerprint(
+            msg_model.sender, msg_model.timestamp, msg_model.body
+        ),
+    )
+
+
+def _apply_message_diff(
+    db: Session, thread_db_id: int, messages: List[MessageModel]
+) -> None:
+    """Bring a stored thread's messages in line with the uploaded ones.
+
+    Messages are matched by message_id. Unchanged messages are left alone,
+    changed ones are updated, and added or removed ones are inserted or
+    deleted. Rows stored before fingerprints existed are fingerprinted from
+    their content.
+
+    Args:
+        db: Database session.
+        thread_db_id: Database ID of the thread.
+        messages: Uploaded messages of the thread.
+    """
+    stored: Dict[str, Message] = {}
+    for message_db in db.query(Message).filter(Message.thread_id == thread_db_id):
+        if message_db.message_id in stored:
+            # Duplicate message IDs cannot be matched; drop the extra rows
+            db.delete(message_db)
+        else:
+            stored[message_db.message_id] = message_db
+
+    for msg_model in messages:
+        fingerprint: str = message_fingerprint(
+            msg_model.sender, msg_model.timestamp, msg_model.body
+        )
+        existing: Optional[Message] = stored.pop(msg_model.id, None)
+        if existing is None:
+            db.add(_message_from_model(thread_db_id, msg_model))
+            continue
+        stored_fingerprint: str = existing.content_hash or message_fingerprint(
+            existing.sender, existing.timestamp, existing.body
+        )
+        if stored_fingerprint != fingerprint:
+            existing.sender = msg_model.sender
+            existing.timestamp = msg_model.timestamp
+            existing.body = msg_model.body
+        existing.content_hash = fingerprint
+
+    for message_db in stored.values():
+        db.delete(message_db)
+
+
+def apply_usage_to_summary(summary_db: Summary, usage: Optional[UsageModel]) -> None:
+    """Copy token usage and latency onto a summary row.
+
+    Args:
+        summary_db: Summary row to update.
+        usage: Usage of the API calls that produced the summary.
+    """
+    if usage is None:
+        return
+    summary_db.model = usage.model
+    summary_db.prompt_tokens = usage.prompt_tokens
+    summary_db.cached_tokens = usage.cached_tokens
+    summary_db.completion_tokens = usage.completion_tokens
+    summary_db.total_tokens = usage.total_tokens
+    summary_db.api_calls = usage.api_calls
+    summary_db.chunk_count = usage.chunks
+    summary_db.latency_ms = usage.latency_ms
+    summary_db.compaction_tokens_saved = usage.tokens_saved
+
+
+def review_priority(summary_content: SummaryContentModel) -> int:
+    """Get the review queue rank of a summary from its urgency level.
+
+    Args:
+        summary_content: Generated summary.
+
+    Returns:
+        Rank from URGENCY_PRIORITY; higher is reviewed first.
+    """
+    urgency: str = summary_content.context_extraction.urgency_level.strip().lower()
+    return URGENCY_PRIORITY.get(urgency, 0)
+
+
+def apply_rolling_state(
+    summary_db: Summary,
+    thread_model: ThreadModel,
+    summary_content: SummaryContentModel,
+) -> None:
+    """Record what a summary covers so it can be updated incrementally.
+
+    Args:
+        summary_db: Summary row to update.
+        thread_model: Thread the summary was generated from.
+        summary_content: Generated summary.
+    """
+    summary_db.summarized_message_count = len(thread_model.messages)
+    summary_db.summarized_hash = thread_fingerprint(thread_model)
+    summary_db.rolling_state = render_rolling_state(summary_content)
+
+
+def get_incremental_states(
+    thread_models: List[ThreadModel],
+    thread_db_ids: Dict[str, Optional[int]],
+) -> Dict[str, Tuple[int, str]]:
+    """Find threads whose summary can be updated from its rolling state.
+
+    A thread qualifies when it has gained messages since it was summarized
+    and everything the summary covers (metadata and earlier messages) is
+    unchanged.
+
+    Args:
+        thread_models: Threads about to be summarized.
+        thread_db_ids: Mapping of thread_id to database ID.
+
+    Returns:
+        Mapping of thread_id to (summarized message count, rolling state).
+    """
+    by_db_id: Dict[int, ThreadModel] = {
+        thread_db_ids[thread_model.thread_id]: thread_model
+        for thread_model in thread_models
+        if thread_db_ids.get(thread_model.thread_id) is not None
+    }
+    db_ids: List[int] = list(by_db_id)
+    states: Dict[str, Tuple[int, str]] = {}
+    db: Session = SessionLocal()
+    try:
+        for start in range(0, len(db_ids), LOOKUP_CHUNK_SIZE):
+            rows = (
+                db.query(
+                    Summary.thread_id,
+                    Summary.summarized_message_count,
+                    Summary.summarized_hash,
+                    Summary.rolling_state,
+                )
+                .filter(Summary.thread_id.in_(db_ids[start : start + LOOKUP_CHUNK_SIZE]))
+                .filter(Summary.rolling_state.isnot(None))
+                .all()
+            )
+            for thread_db_id, count, summarized_hash, rolling_state in rows:
+                thread_model = by_db_id[thread_db_id]
+                if (
+                    count
+                    and count < len(thread_model.messages)
+                    and prefix_fingerprint(thread_model, count) == summarized_hash
+                ):
+                    states[thread_model.thread_id] = (count, rolling_state)
+    except Exception as e:
+        print(f"Error loading incremental summary states: {str(e)}")
+    finally:
+        db.close()
+    return states
+
+
+def load_minhash_signatures() -> List[Tuple[str, str, List[int]]]:
+    """Load the signatures of summarized threads that are not duplicates.
+
+    Returns:
+        List of (thread_id, topic, MinHash signature).
+    """
+    db: Session = SessionLocal()
+    try:
+        rows = (
+            db.query(Thread.thread_id, Thread.topic, Thread.minhash_signature)
+            .filter(Thread.minhash_signature.isnot(None))
+            .filter(Thread.duplicate_of.is_(None))
+            .filter(
+                db.query(Summary.id).filter(Summary.thread_id == Thread.id).exists()
+            )
+            .all()
+        )
+        return [
+            (thread_id, topic, json.loads(signature))
+            for thread_id, topic, signature in rows
+        ]
+    except Exception as e:
+        print(f"Error loading MinHash signatures: {str(e)}")
+        return []
+    finally:
+        db.close()
+
+
+async def save_near_duplicates(
+    thread_db_ids: Dict[str, Optional[int]],
+    signatures: Dict[str, Optional[List[int]]],
+    duplicates: Dict[str, Tuple[str, float]],
+) -> bool:
+    """Store thread signatures and near-duplicate flags.
+
+    Flags of threads that no longer match anything are cleared.
+
+    Args:
+        thread_db_ids: Mapping of thread_id to database ID.
+        signatures: MinHash signature per thread_id (None if unsigned).
+        duplicates: (matching thread_id, similarity) per flagged thread_id.
+
+    Returns:
+        True if successful, False otherwise.
+    """
+    mappings: List[Dict] = [
+        {
+            "id": thread_db_ids[thread_id],
+            "minhash_signature": (
+                json.dumps(signature) if signature is not None else None
+            ),
+            "duplicate_of": duplicates.get(thread_id, (None, None))[0],
+            "duplicate_similarity": duplicates.get(thread_id, (None, None))[1],
+        }
+        for thread_id, signature in signatures.items()
+        if thread_db_ids.get(thread_id) is not None
+    ]
+    max_retries = 5
+    retry_delay = 0.5
+
+    for attempt in range(max_retries):
+        db: Session = SessionLocal()
+        try:
+            db.bulk_update_mappings(Thread, mappings)
+            db.commit()
+            db.close()
+            return True
+
+        except OperationalError as e:
+            db.rollback()
+            db.close()
+            if "database is locked" in str(e).lower() and attempt < max_retries - 1:
+                wait_time = retry_delay * (2**attempt)
+                await asyncio.sleep(wait_time)
+                continue
+            print(f"Error saving near-duplicate flags: {str(e)}")
+            return False
+        except Exception as e:
+            db.rollback()
+            db.close()
+            print(f"Error saving near-duplicate flags: {str(e)}")
+            return False
+
+    return False
+
+
+def load_summary_source(
+    thread_id: str,
+) -> Optional[Tuple[SummaryContentModel, str, str]]:
+    """Load the summary of a thread to derive a near-duplicate's summary from.
+
+    Args:
+        thread_id: Thread identifier of the matching thread.
+
+    Returns:
+        Tuple of (summary content, order_id, product) of the thread, or None
+        if it has no structured summary.
+    """
+    db: Session = SessionLocal()
+    try:
+        row = (
+            db.query(Summary.structured_data_json, Thread.order_id, Thread.product)
+            .join(Thread, Summary.thread_id == Thread.id)
+            .filter(Thread.thread_id == thread_id)
+            .filter(Summary.structured_data_json.isnot(None))
+            .first()
+        )
+        if row is None:
+            return None
+        structured_data_json, order_id, product = row
+        return (
+            SummaryContentModel.model_validate_json(structured_data_json),
+            order_id,
+            product,
+        )
+    except Exception as e:
+        print(f"Error loading summary of thread {thread_id}: {str(e)}")
+        return None
+    finally:
+        db.close()
+
+
+def usage_from_summary(summary_db: Summary) -> Optional[UsageModel]:
+    """Read token usage and latency from a summary row.
+
+    Args:
+        summary_db: Summary row.
+
+    Returns:
+        UsageModel, or None for summaries created before usage was recorded.
+    """
+    if summary_db.api_calls is None:
+        return None
+    return UsageModel(
+        model=summary_db.model,
+        prompt_tokens=summary_db.prompt_tokens or 0,
+        cached_tokens=summary_db.cached_tokens or 0,
+        completion_tokens=summary_db.completion_tokens or 0,
+        total_tokens=summary_db.total_tokens or 0,
+        api_calls=summary_db.api_calls,
+        chunks=summary_db.chunk_count or 0,
+        latency_ms=summary_db.latency_ms or 0.0,
+        tokens_saved=summary_db.compaction_tokens_saved or 0,
+    )
+
+
 async def save_summary_to_db(
     thread_db_id: int,
     summary_content: SummaryContentModel,
     thread_model: ThreadModel,
+    usage: Optional[UsageModel] = None,
+    derived_from: Optional[str] = None,
 ) -> bool:
-    """Save summary to database.
+    """Save summary to database, with the state for incremental updates.
+
+    derived_from is the thread_id of the near-duplicate the summary was
+    derived from, if any.
 
     Returns True if successful, False otherwise.
     """
@@ -114,6 +519,10 @@ async def save_summary_to_db(
                     summary_content.model_dump()
                 )
                 existing_summary.summary_id = summary_id
+                existing_summary.review_priority = review_priority(summary_content)
+                apply_usage_to_summary(existing_summary, usage)
+                apply_rolling_state(existing_summary, thread_model, summary_content)
+                existing_summary.derived_from = derived_from
             else:
                 summary_db = Summary(
                     thread_id=thread_db_id,
@@ -121,10 +530,19 @@ async def save_summary_to_db(
                     original_summary=summary_content.full_summary_text,
                     status=SummaryStatus.PENDING,
                     structured_data_json=json.dumps(summary_content.model_dump()),
+                    review_priority=review_priority(summary_content),
+                    derived_from=derived_from,
                 )
+                apply_usage_to_summary(summary_db, usage)
+                apply_rolling_state(summary_db, thread_model, summary_content)
                 db.add(summary_db)
 
             db.commit()
+            if existing_summary and existing_summary.status == SummaryStatus.APPROVED:
+                # Approval is kept, so similar case lookups see the new content
+                similar_cases_index.add(
+                    existing_summary.id, features_from_row(existing_summary)
+                )
             db.close()
             return True
 
@@ -144,3 +562,82 @@ async def save_summary_to_db(
             return False
 
     return False
+
+
+async def save_regenerated_summary(
+    thread_db_id: int,
+    thread_id: str,
+    summary_content: SummaryContentModel,
+    usage: Optional[UsageModel] = None,
+    thread_model: Optional[ThreadModel] = None,
+) -> Optional[str]:
+    """Save an on-demand summary, resetting any review of the previous one.
+
+    Unlike save_summary_to_db, an existing summary keeps its summary_id but
+    its edit and status are reset to pending.
+
+    Args:
+        thread_db_id: Database ID of the thread.
+        thread_id: Thread identifier (used for new summary IDs).
+        summary_content: Generated summary.
+        usage: Optional usage of the summarization calls.
+        thread_model: Optional thread the summary was generated from, to
+            record the state for incremental updates.
+
+    Returns:
+        Summary identifier, or None if saving failed.
+    """
+    max_retries = 5
+    retry_delay = 0.5
+
+    for attempt in range(max_retries):
+        db: Session = SessionLocal()
+        try:
+            summary_db: Optional[Summary] = (
+                db.query(Summary).filter(Summary.thread_id == thread_db_id).first()
+            )
+
+            if summary_db:
+                summary_db.original_summary = summary_content.full_summary_text
+                summary_db.edited_summary = None  # Reset edited summary on regenerate
+                summary_db.derived_from = None
+                summary_db.status = SummaryStatus.PENDING
+                summary_db.structured_data_json = summary_content.model_dump_json()
+                summary_db.review_priority = review_priority(summary_content)
+                summary_db.updated_at = datetime.utcnow()
+            else:
+                summary_db = Summary(
+                    thread_id=thread_db_id,
+                    summary_id=f"SUM-{thread_id}-{int(datetime.utcnow().timestamp())}",
+                    original_summary=summary_content.full_summary_text,
+                    status=SummaryStatus.PENDING,
+                    structured_data_json=summary_content.model_dump_json(),
+                    review_priority=review_priority(summary_content),
+                )
+                db.add(summary_db)
+            apply_usage_to_summary(summary_db, usage)
+            if thread_model is not None:
+                apply_rolling_state(summary_db, thread_model, summary_content)
+
+            db.commit()
+            summary_id: str = summary_db.summary_id
+            similar_cases_index.remove(summary_db.id)
+            db.close()
+            return summary_id
+
+        except OperationalError as e:
+            db.rollback()
+            db.close()
+            if "database is locked" in str(e).lower() and attempt < max_retries - 1:
+                wait_time = retry_delay * (2**attempt)
+                await asyncio.sleep(wait_time)
+                continue
+            print(f"Error saving summary for thread {thread_id}: {str(e)}")
+            return None
+        except Exception as e:
+            db.rollback()
+            db.close()
+            print(f"Error saving summary for thread {thread_id}: {str(e)}")
+            return None
+
+    return None
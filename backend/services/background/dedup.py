@@ -0,0 +1,305 @@
+"""Near-duplicate thread detection with MinHash signatures and LSH banding."""
+
+import hashlib
+import os
+import random
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from database.models import CRMContextModel, SummaryContentModel, ThreadModel
+from services.openrouter.config import LOCAL_CRM_EXTRACTION, LOCAL_SUMMARY_RENDERING
+from services.openrouter.crm_extractor import extract_crm_fields
+from services.openrouter.summary_renderer import render_full_summary_text
+
+# Flag threads that nearly duplicate an already summarized thread of the same topic
+NEAR_DUPLICATE_DETECTION: bool = (
+    os.getenv("NEAR_DUPLICATE_DETECTION", "true").lower() == "true"
+)
+# Estimated Jaccard similarity of the shingled bodies above which threads match
+NEAR_DUPLICATE_THRESHOLD: float = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.9"))
+# Derive the summary of a flagged thread from its match instead of calling the LLM
+NEAR_DUPLICATE_REUSE: bool = (
+    os.getenv("NEAR_DUPLICATE_REUSE", "false").lower() == "true"
+)
+
+MINHASH_PERMUTATIONS: int = 64
+# 16 bands of 4 rows: pairs above ~0.5 similarity almost always share a band
+LSH_BANDS: int = 16
+SHINGLE_SIZE: int = 3
+
+_MERSENNE_PRIME: int = (1 << 61) - 1
+# Fixed seed so signatures stored in the database stay comparable across runs
+_rng: random.Random = random.Random(1729)
+_PERMUTATIONS: List[Tuple[int, int]] = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(MINHASH_PERMUTATIONS)
+]
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_DIGITS_PATTERN = re.compile(r"\d+")
+
+
+def _normalized_tokens(body: str) -> List[str]:
+    """Lowercase a message body, drop punctuation and mask numbers.
+
+    Masking numbers keeps templated messages that only differ in order
+    numbers, amounts or dates identical.
+    """
+    return [
+        _DIGITS_PATTERN.sub("#", token)
+        for token in _TOKEN_PATTERN.findall(body.lower())
+    ]
+
+
+def minhash_signature(thread_model: ThreadModel) -> Optional[List[int]]:
+    """Get the MinHash signature of a thread's normalized message bodies.
+
+    Args:
+        thread_model: Thread to sign.
+
+    Returns:
+        MINHASH_PERMUTATIONS minimum hash values over the word shingles, or
+        None when the bodies have no tokens (such threads would all match
+        each other).
+    """
+    tokens: List[str] = []
+    for msg in thread_model.messages:
+        tokens.extend(_normalized_tokens(msg.body))
+    if not tokens:
+        return None
+
+    shingles: Set[str] = {
+        " ".join(tokens[i : i + SHINGLE_SIZE])
+        for i in range(max(1, len(tokens) - SHINGLE_SIZE + 1))
+    }
+    hashes: List[int] = [
+        int.from_bytes(
+            hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big"
+        )
+        for shingle in shingles
+    ]
+    return [
+        min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _PERMUTATIONS
+    ]
+
+
+def estimate_similarity(first: List[int], second: List[int]) -> float:
+    """Estimate the Jaccard similarity of two signatures.
+
+    Args:
+        first: MinHash signature.
+        second: MinHash signature.
+
+    Returns:
+        Fraction of matching signature positions.
+    """
+    return sum(1 for a, b in zip(first, second) if a == b) / MINHASH_PERMUTATIONS
+
+
+class NearDuplicateIndex:
+    """In-memory LSH index of summarized thread signatures, bucketed by topic.
+
+    Signatures are split into LSH_BANDS bands; threads sharing any band of
+    the same topic are candidates and are confirmed by their estimated
+    similarity.
+    """
+
+    def __init__(self, threshold: float = NEAR_DUPLICATE_THRESHOLD) -> None:
+        """Initialize an empty index.
+
+        Args:
+            threshold: Minimum estimated similarity of a match.
+        """
+        self.threshold: float = threshold
+        self.loaded: bool = False
+        self._signatures: Dict[str, Tuple[str, List[int]]] = {}
+        self._buckets: Dict[Tuple[str, int, Tuple[int, ...]], Set[str]] = {}
+
+    def __len__(self) -> int:
+        """Number of indexed threads."""
+        return len(self._signatures)
+
+    def _band_keys(
+        self, topic: str, signature: List[int]
+    ) -> Iterable[Tuple[str, int, Tuple[int, ...]]]:
+        """Get the bucket keys of a signature."""
+        rows: int = MINHASH_PERMUTATIONS // LSH_BANDS
+        topic_key: str = topic.strip().lower()
+        for band in range(LSH_BANDS):
+            yield topic_key, band, tuple(signature[band * rows : (band + 1) * rows])
+
+    def add(self, thread_id: str, topic: str, signature: List[int]) -> None:
+        """Index a thread, replacing any earlier signature of it.
+
+        Args:
+            thread_id: Thread identifier.
+            topic: Thread topic; only threads of the same topic match.
+            signature: MinHash signature.
+        """
+        self.remove(thread_id)
+        self._signatures[thread_id] = (topic, signature)
+        for key in self._band_keys(topic, signature):
+            self._buckets.setdefault(key, set()).add(thread_id)
+
+    def remove(self, thread_id: str) -> None:
+        """Drop a thread from the index if present.
+
+        Args:
+            thread_id: Thread identifier.
+        """
+        entry: Optional[Tuple[str, List[int]]] = self._signatures.pop(thread_id, None)
+        if entry is None:
+            return
+        for key in self._band_keys(*entry):
+            bucket: Optional[Set[str]] = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(thread_id)
+                if not bucket:
+                    del self._buckets[key]
+
+    def query(
+        self, thread_id: str, topic: str, signature: List[int]
+    ) -> Optional[Tuple[str, float]]:
+        """Find the most similar indexed thread of the same topic.
+
+        Args:
+            thread_id: Thread identifier of the query (never matches itself).
+            topic: Thread topic.
+            signature: MinHash signature.
+
+        Returns:
+            Tuple of (matching thread_id, estimated similarity), or None when
+            no thread reaches the threshold.
+        """
+        candidates: Set[str] = set()
+        for key in self._band_keys(topic, signature):
+            candidates |= self._buckets.get(key, set())
+        candidates.discard(thread_id)
+
+        best: Optional[Tuple[str, float]] = None
+        for candidate in candidates:
+            similarity: float = estimate_similarity(
+                signature, self._signatures[candidate][1]
+            )
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (candidate, similarity)
+        return best
+
+
+def sign_threads(
+    thread_models: List[ThreadModel],
+) -> Dict[str, Optional[List[int]]]:
+    """Get the MinHash signatures of threads.
+
+    Signing is CPU-bound (a few milliseconds per thread), so callers on the
+    event loop run it in a worker thread.
+
+    Args:
+        thread_models: Threads to sign.
+
+    Returns:
+        Signature per thread_id (None for threads without tokens).
+    """
+    return {
+        thread_model.thread_id: minhash_signature(thread_model)
+        for thread_model in thread_models
+    }
+
+
+def find_near_duplicates(
+    index: NearDuplicateIndex,
+    thread_models: List[ThreadModel],
+    signatures: Dict[str, Optional[List[int]]],
+) -> Dict[str, Tuple[str, float]]:
+    """Match signed threads against the index.
+
+    Threads without a match are added to the index, so later threads of the
+    same upload can match them too. Threads without a signature are neither
+    matched nor indexed.
+
+    Args:
+        index: Index of summarized threads.
+        thread_models: Threads about to be summarized, in processing order.
+        signatures: Signature per thread_id from sign_threads.
+
+    Returns:
+        (matching thread_id, similarity) per flagged thread_id.
+    """
+    duplicates: Dict[str, Tuple[str, float]] = {}
+    for thread_model in thread_models:
+        signature: Optional[List[int]] = signatures.get(thread_model.thread_id)
+        if signature is None:
+            index.remove(thread_model.thread_id)
+            continue
+        match: Optional[Tuple[str, float]] = index.query(
+            thread_model.thread_id, thread_model.topic, signature
+        )
+        if match is not None:
+            duplicates[thread_model.thread_id] = match
+            # A flagged thread is not a representative for later matches
+            index.remove(thread_model.thread_id)
+        else:
+            index.add(thread_model.thread_id, thread_model.topic, signature)
+    return duplicates
+
+
+def derive_summary(
+    source: SummaryContentModel,
+    source_order_id: str,
+    source_product: str,
+    thread_model: ThreadModel,
+) -> SummaryContentModel:
+    """Adapt the summary of a near-duplicate thread to another thread.
+
+    Order ID and product are patched into the text fields and key details.
+    Fields that are extracted locally are re-extracted from the thread; the
+    other key details belong to the matching thread's customer and order,
+    so they are cleared, except a customer name the thread itself mentions.
+
+    Args:
+        source: Summary of the matching thread.
+        source_order_id: Order ID of the matching thread.
+        source_product: Product of the matching thread.
+        thread_model: Thread to derive the summary for.
+
+    Returns:
+        Derived SummaryContentModel.
+    """
+
+    def patch(text: Optional[str]) -> Optional[str]:
+        if not text:
+            return text
+        if source_order_id:
+            text = text.replace(source_order_id, thread_model.order_id)
+        if source_product:
+            text = text.replace(source_product, thread_model.product)
+        return text
+
+    key_details: Dict = {
+        "order_id": thread_model.order_id,
+        "product": thread_model.product,
+    }
+    if LOCAL_CRM_EXTRACTION:
+        key_details.update(extract_crm_fields(thread_model))
+    customer_name: Optional[str] = source.key_details.customer_name
+    if customer_name and any(
+        customer_name in msg.body for msg in thread_model.messages
+    ):
+        # A templated complaint from another customer keeps no one else's name
+        key_details["customer_name"] = customer_name
+
+    summary: SummaryContentModel = source.model_copy(
+        update={
+            "issue_summary": patch(source.issue_summary),
+            "resolution_details": patch(source.resolution_details),
+            "full_summary_text": patch(source.full_summary_text),
+            "key_details": CRMContextModel(**key_details),
+        }
+    )
+    if LOCAL_SUMMARY_RENDERING:
+        summary.full_summary_text = render_full_summary_text(summary)
+    return summary
+
+
+# Process-wide index, loaded from stored signatures on first use
+near_duplicate_index: NearDuplicateIndex = NearDuplicateIndex()
@@ -0,0 +1,67 @@
+"""Content fingerprints for detecting changed threads and messages on re-upload."""
+
+import hashlib
+import json
+from typing import Any
+
+from database.models import ThreadModel
+
+
+def message_fingerprint(sender: Any, timestamp: str, body: str) -> str:
+    """Get the fingerprint of a message's content.
+
+    Args:
+        sender: Sender type (enum member or its value).
+        timestamp: Message timestamp.
+        body: Message body.
+
+    Returns:
+        Hex SHA-256 digest of the message content.
+    """
+    payload: str = json.dumps([getattr(sender, "value", sender), timestamp, body])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def thread_fingerprint(thread_model: ThreadModel) -> str:
+    """Get the fingerprint of a thread's metadata and messages.
+
+    Any change to the thread metadata, or to the content, identifiers or
+    order of its messages, changes the fingerprint.
+
+    Args:
+        thread_model: Thread to fingerprint.
+
+    Returns:
+        Hex SHA-256 digest of the thread content.
+    """
+    payload: str = json.dumps(
+        [
+            thread_model.topic,
+            thread_model.subject,
+            thread_model.initiated_by,
+            thread_model.order_id,
+            thread_model.product,
+            [
+                [msg.id, message_fingerprint(msg.sender, msg.timestamp, msg.body)]
+                for msg in thread_model.messages
+            ],
+        ]
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def prefix_fingerprint(thread_model: ThreadModel, message_count: int) -> str:
+    """Get the fingerprint the thread had when it held its first messages only.
+
+    Args:
+        thread_model: Thread to fingerprint.
+        message_count: Number of leading messages to include.
+
+    Returns:
+        Hex SHA-256 digest, comparable to thread_fingerprint.
+    """
+    return thread_fingerprint(
+        thread_model.model_copy(
+            update={"messages": thread_model.messages[:message_count]}
+        )
+    )
@@ -0,0 +1,257 @@
+"""Process-wide scheduler for LLM calls with interactive and bulk lanes."""
+
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from database.models import (
+    FlowStatsModel,
+    LaneStatsModel,
+    SchedulerStatsModel,
+    ThreadModel,
+)
+
+INTERACTIVE_LANE: str = "interactive"
+BULK_LANE: str = "bulk"
+
+# Max summarizations running at once across all uploads and on-demand requests
+SCHEDULER_MAX_IN_FLIGHT: int = int(os.getenv("SCHEDULER_MAX_IN_FLIGHT", "8"))
+# Slots bulk processing can never take, so on-demand requests start immediately
+SCHEDULER_INTERACTIVE_RESERVED: int = int(
+    os.getenv("SCHEDULER_INTERACTIVE_RESERVED", "2")
+)
+# Bulk dispatch order: "shortest" (fewest messages first) or "input" (file order,
+# which is the order the UI lists threads in)
+SCHEDULER_BULK_ORDER: str = os.getenv("SCHEDULER_BULK_ORDER", "shortest").lower()
+
+
+class _Flow:
+    """Queue and fair-share accounting of one flow (an upload task) in a lane."""
+
+    def __init__(self) -> None:
+        """Initialize an empty flow."""
+        self.waiting: List[Tuple[Any, int, asyncio.Future]] = []
+        self.finish_tag: float = 0.0
+        self.in_flight: int = 0
+        self.dispatched: int = 0
+        self.completed: int = 0
+        self.started_at: float = time.perf_counter()
+
+    def prune(self) -> None:
+        """Drop cancelled waiters from the head of the queue."""
+        while self.waiting and self.waiting[0][2].done():
+            heapq.heappop(self.waiting)
+
+
+class LLMScheduler:
+    """Dispatch LLM work through a global in-flight cap with two lanes.
+
+    Interactive work (on-demand summaries) is always dispatched before bulk
+    work (upload processing) and may use any free slot. Bulk work never
+    occupies the slots reserved for interactive requests.
+
+    Within a lane, each flow (one upload task) has its own queue ordered by
+    ascending priority, then arrival order. Flows share the lane equally by
+    fair queuing (start-time tags): every dispatch advances the flow's tag by
+    one and the flow with the lowest tag goes next, so a small upload gets
+    its share of slots instead of waiting behind a large backlog.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = SCHEDULER_MAX_IN_FLIGHT,
+        interactive_reserved: int = SCHEDULER_INTERACTIVE_RESERVED,
+    ) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            max_in_flight: Global cap on concurrently running work items.
+            interactive_reserved: Slots kept free of bulk work.
+        """
+        self.max_in_flight: int = max(1, max_in_flight)
+        self.interactive_reserved: int = min(
+            max(0, interactive_reserved), self.max_in_flight - 1
+        )
+        self._lanes: Tuple[str, ...] = (INTERACTIVE_LANE, BULK_LANE)
+        self._flows: Dict[str, Dict[str, _Flow]] = {lane: {} for lane in self._lanes}
+        self._virtual_time: Dict[str, float] = {lane: 0.0 for lane in self._lanes}
+        self._in_flight: Dict[str, int] = {lane: 0 for lane in self._lanes}
+        self._dispatched: Dict[str, int] = {lane: 0 for lane in self._lanes}
+        self._wait_ms: Dict[str, float] = {lane: 0.0 for lane in self._lanes}
+        self._max_wait_ms: Dict[str, float] = {lane: 0.0 for lane in self._lanes}
+        self._sequence = itertools.count()
+
+    @property
+    def bulk_capacity(self) -> int:
+        """Slots bulk work may occupy at once."""
+        return self.max_in_flight - self.interactive_reserved
+
+    def _can_start(self, lane: str) -> bool:
+        """Check whether a waiter of the lane may start now."""
+        if sum(self._in_flight.values()) >= self.max_in_flight:
+            return False
+        if lane == BULK_LANE:
+            return self._in_flight[BULK_LANE] < self.bulk_capacity
+        return True
+
+    def _next_flow(self, lane: str) -> Optional[_Flow]:
+        """Pick the flow with the lowest start tag that has queued work."""
+        best: Optional[_Flow] = None
+        best_tag: float = 0.0
+        for flow in self._flows[lane].values():
+            flow.prune()
+            if not flow.waiting:
+                continue
+            tag: float = max(self._virtual_time[lane], flow.finish_tag)
+            if best is None or tag < best_tag:
+                best, best_tag = flow, tag
+        return best
+
+    def _dispatch(self) -> None:
+        """Hand free slots to waiters, interactive lane first."""
+        for lane in self._lanes:
+            while self._can_start(lane):
+                flow: Optional[_Flow] = self._next_flow(lane)
+                if flow is None:
+                    break
+                _, _, future = heapq.heappop(flow.waiting)
+                start_tag: float = max(self._virtual_time[lane], flow.finish_tag)
+                flow.finish_tag = start_tag + 1
+                self._virtual_time[lane] = start_tag
+                flow.in_flight += 1
+                flow.dispatched += 1
+                self._in_flight[lane] += 1
+                future.set_result(None)
+
+    def _release(self, lane: str, flow_id: str, completed: bool) -> None:
+        """Free a slot and drop the flow once it has no work left."""
+        flow: _Flow = self._flows[lane][flow_id]
+        flow.in_flight -= 1
+        self._in_flight[lane] -= 1
+        if completed:
+            flow.completed += 1
+        flow.prune()
+        if not flow.waiting and flow.in_flight == 0:
+            del self._flows[lane][flow_id]
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        lane: str,
+        priority: Any = 0,
+        flow_id: Optional[str] = None,
+    ) -> AsyncIterator[None]:
+        """Wait for and hold one in-flight slot.
+
+        Args:
+            lane: INTERACTIVE_LANE or BULK_LANE.
+            priority: Sort key within the flow; lower values run first.
+            flow_id: Flow to queue in (e.g. the upload's task ID). Work
+                without a flow shares one default flow per lane.
+        """
+        flow_id = flow_id or lane
+        flow: Optional[_Flow] = self._flows[lane].get(flow_id)
+        if flow is None:
+            flow = _Flow()
+            # A new flow starts at the current virtual time, not at zero,
+            # so it cannot claim slots for the time it was idle
+            flow.finish_tag = self._virtual_time[lane]
+            self._flows[lane][flow_id] = flow
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        heapq.heappush(flow.waiting, (priority, next(self._sequence), future))
+        queued_at: float = time.perf_counter()
+        self._dispatch()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Give the slot back if it was granted just as we were cancelled
+                self._release(lane, flow_id, completed=False)
+            else:
+                future.cancel()
+                flow.prune()
+                if not flow.waiting and flow.in_flight == 0:
+                    self._flows[lane].pop(flow_id, None)
+            raise
+
+        wait_ms: float = (time.perf_counter() - queued_at) * 1000
+        self._dispatched[lane] += 1
+        self._wait_ms[lane] += wait_ms
+        self._max_wait_ms[lane] = max(self._max_wait_ms[lane], wait_ms)
+        completed: bool = False
+        try:
+            yield
+            completed = True
+        finally:
+            self._release(lane, flow_id, completed)
+
+    def stats(self) -> SchedulerStatsModel:
+        """Get scheduler stats."""
+        return SchedulerStatsModel(
+            max_in_flight=self.max_in_flight,
+            interactive_reserved=self.interactive_reserved,
+            bulk_order=SCHEDULER_BULK_ORDER,
+            lanes=[
+                LaneStatsModel(
+                    lane=lane,
+                    in_flight=self._in_flight[lane],
+                    queued=sum(
+                        sum(1 for *_, f in flow.waiting if not f.done())
+                        for flow in self._flows[lane].values()
+                    ),
+                    dispatched=self._dispatched[lane],
+                    avg_wait_ms=(
+                        round(self._wait_ms[lane] / self._dispatched[lane], 2)
+                        if self._dispatched[lane]
+                        else 0.0
+                    ),
+                    max_wait_ms=round(self._max_wait_ms[lane], 2),
+                    flows=[
+                        FlowStatsModel(
+                            flow_id=flow_id,
+                            queued=sum(1 for *_, f in flow.waiting if not f.done()),
+                            in_flight=flow.in_flight,
+                            dispatched=flow.dispatched,
+                            completed=flow.completed,
+                            throughput_per_minute=_per_minute(
+                                flow.completed, flow.started_at
+                            ),
+                        )
+                        for flow_id, flow in self._flows[lane].items()
+                    ],
+                )
+                for lane in self._lanes
+            ],
+        )
+
+
+def _per_minute(count: int, started_at: float) -> float:
+    """Get a rate per minute since a perf_counter timestamp."""
+    elapsed: float = time.perf_counter() - started_at
+    return round(count * 60 / elapsed, 2) if elapsed > 0 else 0.0
+
+
+def bulk_priority(thread_model: ThreadModel, index: int) -> Tuple[int, ...]:
+    """Get the bulk lane priority of a thread.
+
+    Args:
+        thread_model: Thread to schedule.
+        index: Position of the thread in its upload.
+
+    Returns:
+        Sort key; lower runs first.
+    """
+    if SCHEDULER_BULK_ORDER == "shortest":
+        return (len(thread_model.messages), index)
+    return (index,)
+
+
+# Global scheduler shared by every upload and on-demand request
+llm_scheduler: LLMScheduler = LLMScheduler()
@@ -0,0 +1,136 @@
+"""On-demand summarization jobs with single-flight coalescing."""
+
+import uuid
+from typing import Dict, Optional, Tuple
+
+from database.models import SummaryContentModel, ThreadModel, UsageModel
+from services.background.database_ops import (
+    get_incremental_states,
+    save_regenerated_summary,
+)
+from services.background.scheduler import INTERACTIVE_LANE, llm_scheduler
+from services.background.task_manager import BackgroundTaskManager
+from services.event_bus import event_bus
+from services.openrouter import OpenRouterService
+from services.openrouter.config import (
+    INCREMENTAL_SUMMARIES,
+    STREAM_PARTIAL_SUMMARIES,
+)
+
+# thread_id -> job_id of the on-demand summarization currently in flight
+_in_flight_jobs: Dict[str, str] = {}
+
+
+def start_summary_job(
+    thread_id: str, task_manager: BackgroundTaskManager
+) -> Tuple[str, bool]:
+    """Register an on-demand summarization job unless one is already running.
+
+    Concurrent requests for the same thread share one job, so only one paid
+    LLM call is made (single-flight).
+
+    Args:
+        thread_id: Thread identifier.
+        task_manager: Task manager instance.
+
+    Returns:
+        Tuple of (job_id, coalesced). coalesced is True when the request
+        joined a job that was already in flight and no new work should start.
+    """
+    job_id: Optional[str] = _in_flight_jobs.get(thread_id)
+    if job_id is not None:
+        return job_id, True
+
+    job_id = f"job-{uuid.uuid4().hex[:12]}"
+    task_manager.register_task(job_id, total_items=1)
+    task_manager.set_task_fields(job_id, thread_id=thread_id, summary_id=None)
+    _in_flight_jobs[thread_id] = job_id
+    return job_id, False
+
+
+async def run_summary_job(
+    job_id: str,
+    thread_model: ThreadModel,
+    thread_db_id: int,
+    file_id: Optional[str],
+    task_manager: BackgroundTaskManager,
+) -> None:
+    """Summarize a thread in the background and announce the result over SSE.
+
+    While the completion streams in, the growing issue summary is published
+    as summary_partial events; when the job ends a summary_ready event with
+    the job status and summary_id is published.
+
+    Args:
+        job_id: Job identifier returned by start_summary_job.
+        thread_model: Thread to summarize.
+        thread_db_id: Database ID of the thread.
+        file_id: Identifier of the file the thread belongs to, if any.
+        task_manager: Task manager instance.
+    """
+    thread_id: str = thread_model.thread_id
+
+    def publish_partial(issue_summary: str) -> None:
+        event_bus.publish(
+            {
+                "type": "summary_partial",
+                "job_id": job_id,
+                "thread_id": thread_id,
+                "file_id": file_id,
+                "issue_summary": issue_summary,
+            }
+        )
+
+    summary_id: Optional[str] = None
+    error: Optional[str] = None
+    try:
+        summary_content: SummaryContentModel
+        usage: UsageModel
+        # A thread that only gained messages is updated from its rolling state
+        incremental_state: Optional[Tuple[int, str]] = None
+        if INCREMENTAL_SUMMARIES:
+            incremental_state = get_incremental_states(
+                [thread_model], {thread_id: thread_db_id}
+            ).get(thread_id)
+        resume_from, rolling_state = incremental_state or (0, None)
+        # Interactive lane: dispatched ahead of any queued upload processing
+        async with llm_scheduler.slot(INTERACTIVE_LANE):
+            async with OpenRouterService() as openrouter_service:
+                (
+                    summary_content,
+                    usage,
+                ) = await openrouter_service.summarize_thread_with_usage(
+                    thread_model,
+                    on_partial=publish_partial if STREAM_PARTIAL_SUMMARIES else None,
+                    resume_from=resume_from,
+                    rolling_state=rolling_state,
+                )
+        await task_manager.record_usage(job_id, usage)
+
+        summary_id = await save_regenerated_summary(
+            thread_db_id, thread_id, summary_content, usage, thread_model
+        )
+        if summary_id is None:
+            error = f"Failed to save summary for thread {thread_id}"
+    except Exception as e:
+        error = f"Error generating summary: {str(e)}"
+        print(error)
+    finally:
+        _in_flight_jobs.pop(thread_id, None)
+
+    await task_manager.increment_progress(
+        job_id, increment=1, increment_failed=1 if error else 0
+    )
+    task_manager.set_task_fields(job_id, summary_id=summary_id, error=error)
+    task_manager.complete_task(job_id, success=error is None)
+    event_bus.publish(
+        {
+            "type": "summary_ready",
+            "job_id": job_id,
+            "thread_id": thread_id,
+            "file_id": file_id,
+            "summary_id": summary_id,
+            "status": "failed" if error else "completed",
+            "message": error,
+        }
+    )
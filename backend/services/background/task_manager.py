@@ -4,6 +4,8 @@ import asyncio
 from datetime import datetime
 from typing import Dict, Optional
 
+from database.models import UsageModel
+
 
 class BackgroundTaskManager:
     """Manager for background processing tasks."""
@@ -28,6 +30,17 @@ class BackgroundTaskManager:
             "failed": 0,
             "started_at": datetime.utcnow().isoformat(),
             "completed_at": None,
+            "usage": {
+                "prompt_tokens": 0,
+                "cached_tokens": 0,
+                "completion_tokens": 0,
+                "total_tokens": 0,
+                "api_calls": 0,
+                "chunks": 0,
+                "latency_ms": 0.0,
+                "tokens_saved": 0,
+                "models": [],
+            },
         }
 
     def update_task_progress(
@@ -64,6 +77,38 @@ class BackgroundTaskManager:
                         self.active_tasks[task_id].get("failed", 0) + increment_failed
                     )
 
+    async def record_usage(self, task_id: str, usage: UsageModel) -> None:
+        """Atomically add the usage of one summary to the task totals.
+
+        Args:
+            task_id: Task identifier.
+            usage: Usage recorded for a single thread summary.
+        """
+        async with self._lock:
+            if task_id not in self.active_tasks:
+                return
+            totals: dict = self.active_tasks[task_id]["usage"]
+            totals["prompt_tokens"] += usage.prompt_tokens
+            totals["cached_tokens"] += usage.cached_tokens
+            totals["completion_tokens"] += usage.completion_tokens
+            totals["total_tokens"] += usage.total_tokens
+            totals["api_calls"] += usage.api_calls
+            totals["chunks"] += usage.chunks
+            totals["latency_ms"] = round(totals["latency_ms"] + usage.latency_ms, 2)
+            totals["tokens_saved"] += usage.tokens_saved
+            if usage.model and usage.model not in totals["models"]:
+                totals["models"].append(usage.model)
+
+    def set_task_fields(self, task_id: str, **fields: object) -> None:
+        """Attach extra fields (such as result identifiers) to a task.
+
+        Args:
+            task_id: Task identifier.
+            **fields: Fields to merge into the task status.
+        """
+        if task_id in self.active_tasks:
+            self.active_tasks[task_id].update(fields)
+
     def complete_task(self, task_id: str, success: bool = True) -> None:
         """Mark task as completed.
 
@@ -82,6 +127,24 @@ class BackgroundTaskManager:
             task_id: Task identifier.
 
         Returns:
-            Task status dictionary or None if not found.
+            Task status dictionary or None if not found, including the
+            throughput in processed items per minute.
         """
-        return self.active_tasks.get(task_id)
+        task: Optional[dict] = self.active_tasks.get(task_id)
+        if task is None:
+            return None
+
+        ended_at: datetime = (
+            datetime.fromisoformat(task["completed_at"])
+            if task["completed_at"]
+            else datetime.utcnow()
+        )
+        elapsed: float = (
+            ended_at - datetime.fromisoformat(task["started_at"])
+        ).total_seconds()
+        return {
+            **task,
+            "throughput_per_minute": (
+                round(task["processed"] * 60 / elapsed, 2) if elapsed > 0 else 0.0
+            ),
+        }
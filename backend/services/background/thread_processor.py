@@ -1,12 +1,20 @@
 """Thread processing logic for background tasks."""
 
-from typing import Optional, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
 
-from database.models import SummaryContentModel, ThreadModel
+from database.models import SummaryContentModel, ThreadModel, UsageModel
 from services.openrouter import OpenRouterService
-from services.background.database_ops import save_summary_to_db
+from services.openrouter.resilience import CircuitOpenError, circuit_breaker
+from services.background.database_ops import load_summary_source, save_summary_to_db
+from services.background.dedup import derive_summary
+from services.background.scheduler import BULK_LANE, llm_scheduler
 from services.background.task_manager import BackgroundTaskManager
 
+T = TypeVar("T")
+
+# Times a thread waits out an open circuit before it is marked failed
+MAX_CIRCUIT_PAUSES: int = 3
+
 
 async def process_thread_with_api(
     thread_model: ThreadModel,
@@ -14,10 +22,13 @@ async def process_thread_with_api(
     task_id: str,
     openrouter_service: OpenRouterService,
     task_manager: BackgroundTaskManager,
+    priority: Any = 0,
+    incremental_state: Optional[Tuple[int, str]] = None,
 ) -> Tuple[bool, Optional[str]]:
     """Process a single thread: call API and save result.
 
-    This function is called concurrently for all threads.
+    This function is called concurrently for all threads; the API call waits
+    for a bulk lane slot of the scheduler.
 
     Args:
         thread_model: Thread model to process.
@@ -25,6 +36,9 @@ async def process_thread_with_api(
         task_id: Task identifier for tracking.
         openrouter_service: OpenRouter service instance.
         task_manager: Task manager instance.
+        priority: Bulk lane priority; lower runs first.
+        incremental_state: Optional (summarized message count, rolling state)
+            of the existing summary; only newer messages are then sent.
 
     Returns:
         Tuple of (success: bool, error_message: Optional[str]).
@@ -36,12 +50,22 @@ async def process_thread_with_api(
 
     try:
         # Generate summary via API (this happens concurrently for all threads)
-        summary_content: SummaryContentModel = (
-            await openrouter_service.summarize_thread(thread_model)
+        summary_content: SummaryContentModel
+        usage: UsageModel
+        resume_from, rolling_state = incremental_state or (0, None)
+        summary_content, usage = await _run_in_bulk_lane(
+            lambda: openrouter_service.summarize_thread_with_usage(
+                thread_model, resume_from=resume_from, rolling_state=rolling_state
+            ),
+            priority,
+            flow_id=task_id,
         )
+        await task_manager.record_usage(task_id, usage)
 
         # Save summary to DB immediately when API response arrives
-        success = await save_summary_to_db(thread_db_id, summary_content, thread_model)
+        success = await save_summary_to_db(
+            thread_db_id, summary_content, thread_model, usage
+        )
 
         if success:
             await task_manager.increment_progress(task_id, increment=1)
@@ -58,3 +82,174 @@ async def process_thread_with_api(
         print(error_msg)
         await task_manager.increment_progress(task_id, increment=1, increment_failed=1)
         return (False, error_msg)
+
+
+async def process_thread_batch_with_api(
+    thread_models: List[ThreadModel],
+    thread_db_ids: Dict[str, Optional[int]],
+    task_id: str,
+    openrouter_service: OpenRouterService,
+    task_manager: BackgroundTaskManager,
+    priority: Any = 0,
+) -> List[Tuple[bool, Optional[str]]]:
+    """Process a batch of small threads with one API call and save each result.
+
+    Args:
+        thread_models: Small thread models to summarize together.
+        thread_db_ids: Mapping of thread_id to database ID.
+        task_id: Task identifier for tracking.
+        openrouter_service: OpenRouter service instance.
+        task_manager: Task manager instance.
+        priority: Bulk lane priority; lower runs first.
+
+    Returns:
+        List of (success: bool, error_message: Optional[str]) per thread.
+    """
+    try:
+        results = await _run_in_bulk_lane(
+            lambda: openrouter_service.summarize_batch(thread_models),
+            priority,
+            flow_id=task_id,
+        )
+    except Exception as e:
+        error_msg = f"Error processing batch of {len(thread_models)} threads: {str(e)}"
+        print(error_msg)
+        await task_manager.increment_progress(
+            task_id, increment=len(thread_models), increment_failed=len(thread_models)
+        )
+        return [(False, error_msg)] * len(thread_models)
+
+    outcomes: List[Tuple[bool, Optional[str]]] = []
+    for thread_model in thread_models:
+        result = results[thread_model.thread_id]
+        if isinstance(result, Exception):
+            error_msg = (
+                f"Error processing thread {thread_model.thread_id}: {str(result)}"
+            )
+            print(error_msg)
+            await task_manager.increment_progress(
+                task_id, increment=1, increment_failed=1
+            )
+            outcomes.append((False, error_msg))
+            continue
+
+        summary_content, usage = result
+        await task_manager.record_usage(task_id, usage)
+
+        success = await save_summary_to_db(
+            thread_db_ids[thread_model.thread_id], summary_content, thread_model, usage
+        )
+        if success:
+            await task_manager.increment_progress(task_id, increment=1)
+            outcomes.append((True, None))
+        else:
+            error_msg = f"Failed to save summary for thread {thread_model.thread_id}"
+            await task_manager.increment_progress(
+                task_id, increment=1, increment_failed=1
+            )
+            outcomes.append((False, error_msg))
+
+    return outcomes
+
+
+async def process_duplicate_thread(
+    thread_model: ThreadModel,
+    thread_db_id: Optional[int],
+    source_thread_id: str,
+    task_id: str,
+    openrouter_service: OpenRouterService,
+    task_manager: BackgroundTaskManager,
+    priority: Any = 0,
+) -> Tuple[bool, Optional[str]]:
+    """Derive a near-duplicate thread's summary from its match's summary.
+
+    Falls back to summarizing the thread when the match has no summary
+    (for example because its own summarization failed).
+
+    Args:
+        thread_model: Thread model to process.
+        thread_db_id: Database ID of the thread.
+        source_thread_id: Thread ID of the summarized near-duplicate.
+        task_id: Task identifier for tracking.
+        openrouter_service: OpenRouter service instance for the fallback.
+        task_manager: Task manager instance.
+        priority: Bulk lane priority of the fallback; lower runs first.
+
+    Returns:
+        Tuple of (success: bool, error_message: Optional[str]).
+    """
+    source: Optional[Tuple[SummaryContentModel, str, str]] = (
+        load_summary_source(source_thread_id) if thread_db_id is not None else None
+    )
+    if source is None:
+        return await process_thread_with_api(
+            thread_model=thread_model,
+            thread_db_id=thread_db_id,
+            task_id=task_id,
+            openrouter_service=openrouter_service,
+            task_manager=task_manager,
+            priority=priority,
+        )
+
+    try:
+        source_summary, source_order_id, source_product = source
+        summary_content: SummaryContentModel = derive_summary(
+            source_summary, source_order_id, source_product, thread_model
+        )
+        success = await save_summary_to_db(
+            thread_db_id,
+            summary_content,
+            thread_model,
+            UsageModel(),
+            derived_from=source_thread_id,
+        )
+        await task_manager.increment_progress(
+            task_id, increment=1, increment_failed=0 if success else 1
+        )
+        if not success:
+            return (
+                False,
+                f"Failed to save summary for thread {thread_model.thread_id}",
+            )
+        return (True, None)
+
+    except Exception as e:
+        error_msg = (
+            f"Error deriving summary of thread {thread_model.thread_id}: {str(e)}"
+        )
+        print(error_msg)
+        await task_manager.increment_progress(task_id, increment=1, increment_failed=1)
+        return (False, error_msg)
+
+
+async def _run_in_bulk_lane(
+    call: Callable[[], Awaitable[T]], priority: Any, flow_id: str
+) -> T:
+    """Run an API call in a bulk lane slot, pausing while the circuit is open.
+
+    Queued work waits for the circuit to half-open instead of burning its
+    retry budget against an unhealthy upstream.
+
+    Args:
+        call: Factory for the awaitable to run.
+        priority: Bulk lane priority; lower runs first.
+        flow_id: Fair queuing flow, one per upload task.
+
+    Returns:
+        Result of the call.
+
+    Raises:
+        CircuitOpenError: If the circuit is still open after MAX_CIRCUIT_PAUSES.
+    """
+    for pause in range(MAX_CIRCUIT_PAUSES + 1):
+        await circuit_breaker.wait_until_available()
+        try:
+            async with llm_scheduler.slot(BULK_LANE, priority, flow_id=flow_id):
+                return await call()
+        except CircuitOpenError:
+            if pause == MAX_CIRCUIT_PAUSES:
+                raise
+            print(
+                f"OpenRouter circuit open, pausing ({pause + 1}/{MAX_CIRCUIT_PAUSES})"
+            )
+    raise CircuitOpenError("OpenRouter circuit open")
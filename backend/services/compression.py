@@ -0,0 +1,184 @@
+"""Response compression negotiated from Accept-Encoding.
+
+Bodies are compressed as they are sent, so streamed responses stay streamed:
+every chunk is flushed through the compressor and reaches the client
+without waiting for the rest of the body. Brotli is preferred when the
+optional ``brotli`` package is installed and the client accepts it, gzip
+otherwise. Event streams, already encoded responses and bodies smaller
+than COMPRESSION_MIN_BYTES are sent as they are.
+"""
+
+import os
+import zlib
+from typing import Callable, Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this are not worth a compression frame
+COMPRESSION_MIN_BYTES: int = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+GZIP_LEVEL: int = int(os.getenv("GZIP_LEVEL", "6"))
+# Brotli quality above 5 costs more CPU than the bandwidth it saves here
+BROTLI_QUALITY: int = int(os.getenv("BROTLI_QUALITY", "4"))
+
+# Content types that must reach the client unbuffered
+UNCOMPRESSED_TYPES = ("text/event-stream",)
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the response encoding from an Accept-Encoding header.
+
+    Args:
+        accept_encoding: Header value, e.g. ``"gzip, deflate, br;q=0.9"``.
+
+    Returns:
+        "br", "gzip", or None to send the body unencoded.
+    """
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.strip().partition(";")
+        weight: float = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[coding.strip()] = weight
+
+    wildcard: float = weights.get("*", 0.0)
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best: Optional[str] = None
+    best_weight: float = 0.0
+    for coding in candidates:
+        weight = weights.get(coding, wildcard)
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+class _Compressor:
+    """Streaming compressor that flushes after every chunk."""
+
+    def __init__(self, encoding: str) -> None:
+        """Initialize the compressor.
+
+        Args:
+            encoding: "br" or "gzip".
+        """
+        self._compress: Callable[[bytes], bytes]
+        self._finish: Callable[[], bytes]
+        if encoding == "br":
+            compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+            self._compress = lambda data: compressor.process(data) + compressor.flush()
+            self._finish = compressor.finish
+        else:
+            # wbits 31 writes the gzip container
+            compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+            self._compress = lambda data: (
+                compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            )
+            self._finish = compressor.flush
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk and flush it."""
+        return self._compress(data)
+
+    def finish(self) -> bytes:
+        """Terminate the compressed stream."""
+        return self._finish()
+
+
+def _weaken_etag(headers: MutableHeaders) -> None:
+    """Mark a strong ETag weak; the encoded bytes differ from the identity ones."""
+    etag: Optional[str] = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing response bodies as they stream."""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_BYTES) -> None:
+        """Initialize the middleware.
+
+        Args:
+            app: Wrapped application.
+            minimum_size: Smallest single-chunk body that is compressed.
+        """
+        self.app: ASGIApp = app
+        self.minimum_size: int = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle an ASGI connection."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding: Optional[str] = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding", "")
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        compressor: Optional[_Compressor] = None
+        passthrough: bool = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, compressor, passthrough
+            if message["type"] == "http.response.start":
+                # Held back until the first body chunk decides the encoding
+                start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body: bytes = message.get("body", b"")
+            more_body: bool = message.get("more_body", False)
+
+            if compressor is None:
+                headers = MutableHeaders(raw=start["headers"])
+                content_type: str = headers.get("content-type", "")
+                if start["status"] == 304:
+                    # Repeat the validator the compressed 200 carried
+                    _weaken_etag(headers)
+                    headers.add_vary_header("Accept-Encoding")
+                if (
+                    "content-encoding" in headers
+                    or content_type.startswith(UNCOMPRESSED_TYPES)
+                    or (not more_body and len(body) < self.minimum_size)
+                ):
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+
+                compressor = _Compressor(encoding)
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                _weaken_etag(headers)
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    body = compressor.compress(body) + compressor.finish()
+                    headers["Content-Length"] = str(len(body))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                await send(start)
+
+            body = compressor.compress(body) if body else b""
+            if not more_body:
+                body += compressor.finish()
+            await send(
+                {"type": "http.response.body", "body": body, "more_body": more_body}
+            )
+
+        await self.app(scope, receive, send_compressed)
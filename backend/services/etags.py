@@ -0,0 +1,101 @@
+"""Strong ETags and conditional GET handling for list endpoints.
+
+A list's ETag is derived from the change sequences of the tables it reads
+(see ``table_versions``), the request path and query parameters, and a
+per-process epoch that retires every ETag on restart or deploy. Checking it
+costs one primary key lookup, so unchanged polls are answered with 304
+before the list query runs.
+"""
+
+import hashlib
+import json
+import uuid
+from typing import List, Sequence, Tuple
+
+from fastapi import Request, Response
+from sqlalchemy.orm import Session
+
+from database import TableVersion
+
+# Changes whenever the server restarts, so ETags never outlive a deploy
+_PROCESS_EPOCH: str = uuid.uuid4().hex
+
+
+def collection_etag(db: Session, request: Request, tables: Sequence[str]) -> str:
+    """Get the ETag of a list response.
+
+    Args:
+        db: Database session.
+        request: Incoming request; its path and query parameters select the
+            representation.
+        tables: Tables the response is built from.
+
+    Returns:
+        Quoted strong ETag.
+    """
+    versions: List[Tuple[str, int]] = sorted(
+        tuple(row)
+        for row in db.query(TableVersion.table_name, TableVersion.version).filter(
+            TableVersion.table_name.in_(tables)
+        )
+    )
+    key: str = json.dumps(
+        [
+            _PROCESS_EPOCH,
+            versions,
+            request.url.path,
+            sorted(request.query_params.multi_items()),
+        ]
+    )
+    return f'"{hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check whether the request's If-None-Match header matches an ETag.
+
+    Args:
+        request: Incoming request.
+        etag: Current ETag of the resource.
+
+    Returns:
+        True when the client's copy is current.
+    """
+    header: str = request.headers.get("if-none-match", "")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored on both
+    # sides (compression weakens the ETag the client received)
+    opaque_tag: str = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque_tag
+        for candidate in header.split(",")
+    )
+
+
+def etag_headers(etag: str) -> dict:
+    """Get the caching headers sent with a list response or a 304.
+
+    no-cache lets browsers keep the response but revalidate it on every
+    request, so polling clients send If-None-Match automatically.
+
+    Args:
+        etag: Current ETag of the resource.
+
+    Returns:
+        Header dictionary.
+    """
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+
+def not_modified(etag: str) -> Response:
+    """Build a 304 response for a client whose copy is current.
+
+    Args:
+        etag: Current ETag of the resource.
+
+    Returns:
+        Empty 304 response.
+    """
+    return Response(status_code=304, headers=etag_headers(etag))
@@ -0,0 +1,54 @@
+"""In-process publish/subscribe bus for pushing events to SSE connections."""
+
+import asyncio
+from typing import Any, Dict, Set
+
+# Events buffered per subscriber before new ones are dropped for it
+MAX_QUEUED_EVENTS: int = 100
+
+
+class EventBus:
+    """Fan out events to every subscribed SSE connection.
+
+    Events are plain dictionaries that are serialized as SSE ``data`` lines.
+    Publishing never blocks: a subscriber whose queue is full misses events
+    rather than slowing down the publisher.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the bus with no subscribers."""
+        self._subscribers: Set[asyncio.Queue] = set()
+
+    def subscribe(self) -> asyncio.Queue:
+        """Register a new subscriber.
+
+        Returns:
+            Queue that receives every published event.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=MAX_QUEUED_EVENTS)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        """Remove a subscriber.
+
+        Args:
+            queue: Queue returned by subscribe.
+        """
+        self._subscribers.discard(queue)
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        """Publish an event to all subscribers.
+
+        Args:
+            event: JSON-serializable event with a ``type`` key.
+        """
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                pass
+
+
+# Global event bus instance shared by publishers and the SSE router
+event_bus: EventBus = EventBus()
@@ -1,15 +1,64 @@
 """OpenRouter API service for email thread summarization with chunking support."""
 
+import asyncio
 import json
-from typing import Dict, List, Optional
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
-from database.models import MessageModel, SummaryContentModel, ThreadModel
+from pydantic import ValidationError
+
+from database.models import (
+    MessageModel,
+    RunningNotesModel,
+    SummaryContentModel,
+    ThreadModel,
+    UsageModel,
+)
 from services.openrouter.chunker import chunk_messages
 from services.openrouter.client import OpenRouterClient
-from services.openrouter.config import MESSAGES_PER_CHUNK
-from services.openrouter.prompt_builder import create_summarization_prompt, get_system_message
-from services.openrouter.response_parser import parse_summary_response
-from services.openrouter.schema_generator import generate_json_schema_response_format
+from services.openrouter.config import (
+    BATCH_MAX_MESSAGES,
+    BATCH_MAX_THREADS,
+    BATCH_TOKEN_BUDGET,
+    LOCAL_CRM_EXTRACTION,
+    LOCAL_SUMMARY_RENDERING,
+    MESSAGES_PER_CHUNK,
+    PROMPT_COMPACTION,
+    PROMPT_LAYOUT,
+    RUNNING_NOTES_MAX_TOKENS,
+)
+from services.openrouter.compactor import compact_thread
+from services.openrouter.crm_extractor import LOCAL_CRM_FIELDS, extract_crm_fields
+from services.openrouter.prompt_builder import (
+    build_messages,
+    create_batch_data_prompt,
+    create_running_notes_prompt,
+    create_summarization_prompt,
+    create_thread_data_prompt,
+    get_batch_instructions,
+    get_running_notes_instructions,
+    get_static_instructions,
+    get_system_message,
+)
+from services.openrouter.response_parser import (
+    build_summary,
+    extract_partial_string,
+    parse_summary_response,
+)
+from services.openrouter.resilience import CircuitOpenError
+from services.openrouter.routing import DEFAULT_TIER, model_router
+from services.openrouter.schema_generator import (
+    generate_batch_json_schema_response_format,
+    generate_json_schema_response_format,
+)
+from services.openrouter.text_processor import estimate_tokens
+from services.openrouter.usage import accumulate_usage
+
+logger = logging.getLogger(__name__)
+
+# Rough prompt overhead of a thread's context block, on top of its message bodies
+THREAD_PROMPT_OVERHEAD_TOKENS: int = 120
 
 
 class OpenRouterService:
@@ -47,78 +96,571 @@ class OpenRouterService:
     ) -> SummaryContentModel:
         """Summarize an email thread using OpenRouter API.
 
+        Args:
+            thread: Thread model to summarize.
+            use_chunking: Whether to use chunking for large threads.
+
+        Returns:
+            SummaryContentModel with structured summary data.
+        """
+        summary, _ = await self.summarize_thread_with_usage(thread, use_chunking)
+        return summary
+
+    async def summarize_thread_with_usage(
+        self,
+        thread: ThreadModel,
+        use_chunking: bool = True,
+        on_partial: Optional[Callable[[str], None]] = None,
+        resume_from: int = 0,
+        rolling_state: Optional[str] = None,
+    ) -> Tuple[SummaryContentModel, UsageModel]:
+        """Summarize an email thread and account for tokens and latency.
+
         Handles large threads by chunking messages and processing incrementally.
         Uses structured output with JSON schema for guaranteed valid responses.
 
         Args:
             thread: Thread model to summarize.
             use_chunking: Whether to use chunking for large threads.
+            on_partial: Optional callback receiving the growing issue_summary
+                text while the final structured response streams in.
+            resume_from: Number of leading messages already covered by
+                rolling_state. Only later messages are sent.
+            rolling_state: Notes on the first resume_from messages from the
+                previous summary, for an incremental update.
+
+        Returns:
+            Tuple of (SummaryContentModel with structured summary data,
+            UsageModel aggregated over every API call made for the thread).
+        """
+        started_at: float = time.perf_counter()
+        usage = UsageModel(model=self.client.model)
+        tier: str = model_router.select_tier(thread)
+        failed_attempt: Optional[UsageModel] = None
+
+        if tier != DEFAULT_TIER:
+            # Cheaper tier first; escalate if its response fails validation
+            attempt = UsageModel(model=model_router.model_for(tier))
+            try:
+                async with model_router.slot(tier):
+                    summary: SummaryContentModel = await self._summarize(
+                        thread,
+                        use_chunking,
+                        attempt,
+                        model=model_router.model_for(tier),
+                        strict=True,
+                        on_partial=on_partial,
+                        resume_from=resume_from,
+                        rolling_state=rolling_state,
+                    )
+                attempt.latency_ms = round((time.perf_counter() - started_at) * 1000, 2)
+                model_router.record(tier, attempt)
+                return summary, attempt
+            except (json.JSONDecodeError, ValidationError) as e:
+                logger.warning(
+                    f"{tier} tier response failed validation for thread "
+                    f"{thread.thread_id}, escalating: {e}"
+                )
+                model_router.record_fallback(tier, attempt)
+                failed_attempt = attempt
+
+        async with model_router.slot(DEFAULT_TIER):
+            summary = await self._summarize(
+                thread,
+                use_chunking,
+                usage,
+                on_partial=on_partial,
+                resume_from=resume_from,
+                rolling_state=rolling_state,
+            )
+        usage.latency_ms = round((time.perf_counter() - started_at) * 1000, 2)
+        model_router.record(DEFAULT_TIER, usage)
+
+        if failed_attempt is not None:
+            # The failed attempt still counts towards the thread's cost
+            model: Optional[str] = usage.model
+            accumulate_usage(usage, failed_attempt)
+            usage.model = model
+        return summary, usage
+
+    async def _summarize(
+        self,
+        thread: ThreadModel,
+        use_chunking: bool,
+        usage: UsageModel,
+        model: Optional[str] = None,
+        strict: bool = False,
+        on_partial: Optional[Callable[[str], None]] = None,
+        resume_from: int = 0,
+        rolling_state: Optional[str] = None,
+    ) -> SummaryContentModel:
+        """Run the summarization calls, accumulating usage in place.
+
+        Args:
+            thread: Thread model to summarize.
+            use_chunking: Whether to use chunking for large threads.
+            usage: Running usage total for the thread.
+            model: Optional model override. Defaults to the client model.
+            strict: Raise on an invalid final response instead of falling back
+                to a placeholder summary.
+            on_partial: Optional callback for the streamed issue_summary text.
+            resume_from: Number of leading messages covered by rolling_state.
+            rolling_state: Notes on the already summarized messages. When
+                given, only the later messages are sent, with the notes as
+                the running notes of earlier chunks.
 
         Returns:
             SummaryContentModel with structured summary data.
+
+        Raises:
+            json.JSONDecodeError: If strict and the response is not valid JSON.
+            ValidationError: If strict and the response does not match the schema.
         """
+        if resume_from >= len(thread.messages):
+            # Nothing new for the notes to cover; summarize from scratch
+            resume_from, rolling_state = 0, None
+
+        prompt_thread, crm_fields, usage.tokens_saved = _prepare_thread(thread)
+        render_locally: bool = LOCAL_SUMMARY_RENDERING
+
         # Generate JSON schema response format for structured output
         response_format: Dict = generate_json_schema_response_format(
             model_class=SummaryContentModel,
             schema_name="email_thread_summary",
             strict=True,
+            exclude=_summary_exclusions(bool(crm_fields), render_locally),
         )
 
         # For small threads, process all at once
-        if not use_chunking or len(thread.messages) <= MESSAGES_PER_CHUNK:
-            prompt: str = create_summarization_prompt(thread)
-            # Use system message to emphasize extraction requirements
-            messages: List[dict[str, str]] = [
-                {
-                    "role": "system",
-                    "content": get_system_message(),
-                },
-                {"role": "user", "content": prompt}
-            ]
-            response_text: str = await self.client.call_api(
-                messages=messages,
-                response_format=response_format,
+        if rolling_state is None and (
+            not use_chunking or len(thread.messages) <= MESSAGES_PER_CHUNK
+        ):
+            messages: List[dict[str, Any]] = self._summary_messages(
+                prompt_thread, crm_fields=crm_fields, render_locally=render_locally
+            )
+            response_text, call_usage = await self._complete(
+                messages, response_format, model, on_partial
+            )
+            accumulate_usage(usage, call_usage)
+            usage.chunks = 1
+            return _parse_summary(
+                response_text, thread, crm_fields, render_locally, strict
             )
-            return parse_summary_response(response_text, thread)
 
-        # For large threads, process in chunks
-        chunks: List[List[MessageModel]] = chunk_messages(thread.messages)
-        accumulated_summary: Optional[str] = None
+        # For large threads, carry compact running notes through the intermediate
+        # chunks and only request the full structured output for the last one.
+        # Incremental updates start from the rolling state and only send the
+        # messages it does not cover yet.
+        new_messages: List[MessageModel] = prompt_thread.messages[resume_from:]
+        chunks: List[List[MessageModel]] = (
+            chunk_messages(new_messages) if use_chunking else [new_messages]
+        )
+        usage.chunks = len(chunks)
+        running_notes: Optional[str] = rolling_state
+        notes_format: Dict = generate_json_schema_response_format(
+            model_class=RunningNotesModel,
+            schema_name="running_notes",
+            strict=True,
+        )
 
-        for i, chunk in enumerate(chunks):
-            is_last_chunk: bool = i == len(chunks) - 1
-            prompt = create_summarization_prompt(
-                thread,
-                chunk_messages=chunk,
-                is_chunk=not is_last_chunk,
-                previous_summary=accumulated_summary,
+        for chunk in chunks[:-1]:
+            notes_messages: List[dict[str, Any]] = build_messages(
+                get_running_notes_instructions(),
+                create_running_notes_prompt(
+                    prompt_thread, chunk, previous_notes=running_notes
+                ),
+                cache_system=self._cache_system_prefix(),
+            )
+            response_text, call_usage = await self.client.call_api_with_usage(
+                messages=notes_messages,
+                response_format=notes_format,
+                max_tokens=RUNNING_NOTES_MAX_TOKENS,
+                model=model,
             )
+            accumulate_usage(usage, call_usage)
+            running_notes = _parse_running_notes(response_text)
+
+        messages = self._summary_messages(
+            prompt_thread,
+            chunk_messages=chunks[-1],
+            is_chunk=True,
+            previous_summary=running_notes,
+            crm_fields=crm_fields,
+            render_locally=render_locally,
+        )
+        response_text, call_usage = await self._complete(
+            messages, response_format, model, on_partial
+        )
+        accumulate_usage(usage, call_usage)
+        return _parse_summary(
+            response_text, thread, crm_fields, render_locally, strict
+        )
+
+    async def _complete(
+        self,
+        messages: List[dict[str, Any]],
+        response_format: Dict,
+        model: Optional[str],
+        on_partial: Optional[Callable[[str], None]],
+    ) -> Tuple[str, UsageModel]:
+        """Make the final structured call, streaming it when someone is watching.
+
+        Args:
+            messages: Request messages.
+            response_format: Structured output response format.
+            model: Optional model override.
+            on_partial: Optional callback for the streamed issue_summary text.
 
-            # Use system message to emphasize extraction requirements
-            messages = [
-                {
-                    "role": "system",
-                    "content": get_system_message(),
-                },
-                {"role": "user", "content": prompt}
-            ]
-            response_text = await self.client.call_api(
+        Returns:
+            Tuple of (response text, usage of the call).
+        """
+        if on_partial is None:
+            return await self.client.call_api_with_usage(
                 messages=messages,
                 response_format=response_format,
+                model=model,
+            )
+
+        last_partial: List[Optional[str]] = [None]
+
+        def on_text(text: str) -> None:
+            partial: Optional[str] = extract_partial_string(text, "issue_summary")
+            if partial and partial != last_partial[0]:
+                last_partial[0] = partial
+                on_partial(partial)
+
+        return await self.client.call_api_stream(
+            messages=messages,
+            response_format=response_format,
+            model=model,
+            on_text=on_text,
+        )
+
+    def plan_batches(
+        self, threads: List[ThreadModel]
+    ) -> Tuple[List[List[ThreadModel]], List[ThreadModel]]:
+        """Pack small threads into batches that fit the token budget.
+
+        Args:
+            threads: Threads to plan, in processing order.
+
+        Returns:
+            Tuple of (batches of at least two small threads, threads that
+            should be summarized individually).
+        """
+        batches: List[List[ThreadModel]] = []
+        singles: List[ThreadModel] = []
+        current: List[ThreadModel] = []
+        current_tokens: int = 0
+
+        for thread in threads:
+            tokens: int = _estimate_thread_tokens(thread)
+            if len(thread.messages) > BATCH_MAX_MESSAGES or tokens > BATCH_TOKEN_BUDGET:
+                singles.append(thread)
+                continue
+
+            if current and (
+                current_tokens + tokens > BATCH_TOKEN_BUDGET
+                or len(current) >= BATCH_MAX_THREADS
+            ):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(thread)
+            current_tokens += tokens
+
+        if current:
+            batches.append(current)
+
+        # A batch of one gains nothing over an individual call
+        singles.extend(batch[0] for batch in batches if len(batch) == 1)
+        return [batch for batch in batches if len(batch) > 1], singles
+
+    async def summarize_batch(
+        self, threads: List[ThreadModel]
+    ) -> Dict[str, Union[Tuple[SummaryContentModel, UsageModel], Exception]]:
+        """Summarize several small threads with a single completion call.
+
+        The response holds an array of summaries keyed by thread_id. Entries
+        that are missing or fail validation are summarized individually, and
+        a thread whose individual call fails does not affect the others.
+
+        Args:
+            threads: Small threads to summarize together.
+
+        Returns:
+            Dictionary mapping thread_id to (summary, usage), or to the
+            exception raised by its individual fallback call.
+        """
+        started_at: float = time.perf_counter()
+        render_locally: bool = LOCAL_SUMMARY_RENDERING
+        prepared: Dict[str, Tuple[ThreadModel, Optional[Dict], int]] = {
+            thread.thread_id: _prepare_thread(thread) for thread in threads
+        }
+        local_crm: bool = LOCAL_CRM_EXTRACTION
+
+        messages: List[dict[str, Any]] = build_messages(
+            get_batch_instructions(local_crm, render_locally),
+            create_batch_data_prompt(
+                [prepared[thread.thread_id][0] for thread in threads],
+                [prepared[thread.thread_id][1] for thread in threads],
+            ),
+            cache_system=self._cache_system_prefix(),
+        )
+        response_format: Dict = generate_batch_json_schema_response_format(
+            model_class=SummaryContentModel,
+            schema_name="email_thread_summaries",
+            strict=True,
+            exclude=_summary_exclusions(local_crm, render_locally),
+        )
+
+        summaries: Dict[str, SummaryContentModel] = {}
+        batch_usage: Optional[UsageModel] = None
+        try:
+            async with model_router.slot(DEFAULT_TIER):
+                response_text, batch_usage = await self.client.call_api_with_usage(
+                    messages=messages,
+                    response_format=response_format,
+                )
+            entries: List[Any] = json.loads(response_text).get("summaries") or []
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            logger.error(f"Batch summarization failed, falling back: {e}")
+            entries = []
+
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            thread_id = entry.pop("thread_id", None)
+            if thread_id not in prepared or thread_id in summaries:
+                continue
+            try:
+                summaries[thread_id] = build_summary(
+                    entry, prepared[thread_id][1], render_locally
+                )
+            except (ValidationError, TypeError, ValueError) as e:
+                logger.warning(f"Invalid batch entry for thread {thread_id}: {e}")
+
+        results: Dict[
+            str, Union[Tuple[SummaryContentModel, UsageModel], Exception]
+        ] = {}
+        latency_ms: float = round((time.perf_counter() - started_at) * 1000, 2)
+        batched: List[ThreadModel] = [t for t in threads if t.thread_id in summaries]
+        total_estimate: int = sum(_estimate_thread_tokens(t) for t in batched)
+        for index, thread in enumerate(batched):
+            share: float = _estimate_thread_tokens(thread) / (total_estimate or 1)
+            thread_usage: UsageModel = _split_batch_usage(
+                batch_usage,
+                share,
+                # Count the shared call once so per-file sums stay exact
+                api_calls=1 if index == 0 else 0,
+                latency_ms=latency_ms,
+                tokens_saved=prepared[thread.thread_id][2],
             )
+            model_router.record(DEFAULT_TIER, thread_usage)
+            results[thread.thread_id] = (summaries[thread.thread_id], thread_usage)
+
+        # Fall back to individual calls for threads the batch did not cover
+        fallbacks: List[ThreadModel] = [t for t in threads if t.thread_id not in summaries]
+        fallback_results = await asyncio.gather(
+            *(self.summarize_thread_with_usage(thread) for thread in fallbacks),
+            return_exceptions=True,
+        )
+        for thread, result in zip(fallbacks, fallback_results):
+            if isinstance(result, BaseException) and not isinstance(result, Exception):
+                raise result
+            if isinstance(result, Exception):
+                logger.error(
+                    f"Fallback summarization failed for thread {thread.thread_id}: "
+                    f"{result}"
+                )
+            results[thread.thread_id] = result
+
+        return results
+
+    def _summary_messages(
+        self,
+        thread: ThreadModel,
+        chunk_messages: Optional[List[MessageModel]] = None,
+        is_chunk: bool = False,
+        previous_summary: Optional[str] = None,
+        crm_fields: Optional[Dict] = None,
+        render_locally: bool = False,
+    ) -> List[dict[str, Any]]:
+        """Build the chat messages for a summarization call.
+
+        The cacheable layout keeps the system message identical across threads
+        so providers can serve it from their prompt cache; the legacy layout
+        embeds thread values in the instructions.
+
+        Args:
+            thread: Thread model (with compacted bodies if enabled).
+            chunk_messages: Optional subset of messages to process.
+            is_chunk: Whether this is the last chunk of a larger thread.
+            previous_summary: Running notes of earlier chunks.
+            crm_fields: Locally extracted key details, if any.
+            render_locally: Whether the markdown summary is rendered locally.
+
+        Returns:
+            List of message dictionaries with 'role' and 'content'.
+        """
+        if PROMPT_LAYOUT == "cacheable":
+            return build_messages(
+                get_static_instructions(bool(crm_fields), render_locally),
+                create_thread_data_prompt(
+                    thread,
+                    chunk_messages=chunk_messages,
+                    is_chunk=is_chunk,
+                    previous_summary=previous_summary,
+                    crm_fields=crm_fields,
+                ),
+                cache_system=self._cache_system_prefix(),
+            )
+
+        # Use system message to emphasize extraction requirements
+        return build_messages(
+            get_system_message(),
+            create_summarization_prompt(
+                thread,
+                chunk_messages=chunk_messages,
+                is_chunk=is_chunk,
+                previous_summary=previous_summary,
+                crm_fields=crm_fields,
+                render_locally=render_locally,
+            ),
+        )
+
+    def _cache_system_prefix(self) -> bool:
+        """Whether the model needs explicit cache breakpoints on the system prefix."""
+        return PROMPT_LAYOUT == "cacheable" and self.client.model.startswith(
+            "anthropic/"
+        )
+
+
+def _parse_summary(
+    response_text: str,
+    thread: ThreadModel,
+    crm_fields: Optional[Dict],
+    render_locally: bool,
+    strict: bool,
+) -> SummaryContentModel:
+    """Parse a final summary response, optionally without the fallback.
+
+    Args:
+        response_text: Raw response text from the API.
+        thread: Original thread model.
+        crm_fields: Locally extracted key details, if any.
+        render_locally: Whether full_summary_text is rendered locally.
+        strict: Raise on invalid responses instead of falling back.
+
+    Returns:
+        Parsed SummaryContentModel.
+
+    Raises:
+        json.JSONDecodeError: If strict and the response is not valid JSON.
+        ValidationError: If strict and the response does not match the schema.
+    """
+    if strict:
+        return build_summary(json.loads(response_text.strip()), crm_fields, render_locally)
+    return parse_summary_response(response_text, thread, crm_fields, render_locally)
+
+
+def _prepare_thread(thread: ThreadModel) -> Tuple[ThreadModel, Optional[Dict], int]:
+    """Prepare a thread for prompting.
+
+    Deterministic CRM fields are extracted from the raw bodies (signatures
+    often hold emails) and message bodies are compacted for the prompt.
+
+    Args:
+        thread: Thread to prepare.
+
+    Returns:
+        Tuple of (thread to build prompts from, locally extracted CRM fields or
+        None, estimated prompt tokens saved by compaction).
+    """
+    crm_fields: Optional[Dict] = (
+        extract_crm_fields(thread) if LOCAL_CRM_EXTRACTION else None
+    )
+
+    # Prompt with compacted message bodies; the parser keeps the raw thread
+    if PROMPT_COMPACTION:
+        prompt_thread, tokens_saved = compact_thread(thread)
+        return prompt_thread, crm_fields, tokens_saved
+    return thread, crm_fields, 0
+
+
+def _summary_exclusions(local_crm_fields: bool, render_locally: bool) -> List[str]:
+    """Get the summary fields left out of the LLM response schema.
+
+    Args:
+        local_crm_fields: Whether key details are pre-extracted locally.
+        render_locally: Whether the markdown summary is rendered locally.
+
+    Returns:
+        Dotted field paths to exclude.
+    """
+    # Either the LLM writes the markdown summary or only the short narrative
+    exclude: List[str] = [
+        "full_summary_text" if render_locally else "resolution_details"
+    ]
+    if local_crm_fields:
+        exclude += [f"key_details.{field}" for field in LOCAL_CRM_FIELDS]
+    return exclude
+
+
+def _estimate_thread_tokens(thread: ThreadModel) -> int:
+    """Estimate the prompt tokens a thread contributes to a request."""
+    return THREAD_PROMPT_OVERHEAD_TOKENS + sum(
+        estimate_tokens(msg.body) for msg in thread.messages
+    )
+
+
+def _split_batch_usage(
+    batch_usage: Optional[UsageModel],
+    share: float,
+    api_calls: int,
+    latency_ms: float,
+    tokens_saved: int,
+) -> UsageModel:
+    """Attribute a share of a batched call's usage to one thread.
+
+    Args:
+        batch_usage: Usage of the batched call.
+        share: Fraction of the batch attributed to the thread.
+        api_calls: API calls to attribute to the thread.
+        latency_ms: Wall-clock latency of the batch.
+        tokens_saved: Prompt tokens saved by compacting the thread.
+
+    Returns:
+        UsageModel for the thread.
+    """
+    batch_usage = batch_usage or UsageModel()
+    prompt_tokens: int = round(batch_usage.prompt_tokens * share)
+    completion_tokens: int = round(batch_usage.completion_tokens * share)
+    return UsageModel(
+        model=batch_usage.model,
+        prompt_tokens=prompt_tokens,
+        cached_tokens=round(batch_usage.cached_tokens * share),
+        completion_tokens=completion_tokens,
+        total_tokens=prompt_tokens + completion_tokens,
+        api_calls=api_calls,
+        chunks=1,
+        latency_ms=latency_ms,
+        tokens_saved=tokens_saved,
+    )
+
+
+def _parse_running_notes(response_text: str) -> str:
+    """Extract running notes from an intermediate chunk response.
+
+    Args:
+        response_text: Raw response text (JSON with a "notes" field).
 
-            if is_last_chunk:
-                # Final chunk - parse full summary
-                return parse_summary_response(response_text, thread)
-            else:
-                # Intermediate chunk - extract summary for next iteration
-                # With structured output, JSON parsing should always succeed
-                try:
-                    chunk_data = json.loads(response_text)
-                    accumulated_summary = chunk_data.get("full_summary_text", response_text)
-                except json.JSONDecodeError:
-                    # Should not happen with structured output, but fallback just in case
-                    accumulated_summary = response_text
-
-        # Fallback (should not reach here)
-        return parse_summary_response(response_text, thread)
+    Returns:
+        Notes text, or the raw response if it is not the expected JSON.
+    """
+    try:
+        return json.loads(response_text).get("notes") or response_text
+    except (json.JSONDecodeError, AttributeError):
+        # Truncated by the token cap or not JSON - the raw text is still useful context
+        return response_text
@@ -0,0 +1,140 @@
+"""Record-and-replay cassette for OpenRouter API calls.
+
+A cassette is a JSON Lines file where each line holds one request payload,
+the raw API response and the latency observed when it was recorded. Replaying
+a cassette lets a whole file be re-processed offline, either at full speed or
+with the original latencies, so prompt and chunking changes can be benchmarked
+deterministically.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+CASSETTE_MODES = ("off", "record", "replay")
+
+
+def request_key(payload: Dict[str, Any]) -> str:
+    """Compute a stable key for a request payload.
+
+    Args:
+        payload: Request body sent to the completions endpoint.
+
+    Returns:
+        Hex digest identifying the request.
+    """
+    canonical: str = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """JSON Lines store of recorded OpenRouter request/response pairs."""
+
+    def __init__(self, path: str, mode: str) -> None:
+        """Initialize cassette.
+
+        Args:
+            path: Path of the cassette file.
+            mode: One of "off", "record" or "replay".
+
+        Raises:
+            ValueError: If mode is unknown.
+        """
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Invalid cassette mode: {mode}")
+        self.path: str = path
+        self.mode: str = mode
+        # Recorded entries by request key, served in recording order
+        self._entries: Dict[str, List[dict]] = {}
+        self._cursors: Dict[str, int] = {}
+        # Serializes appends from worker threads so lines never interleave
+        self._write_lock: threading.Lock = threading.Lock()
+
+        if mode == "replay":
+            self._load()
+
+    def _load(self) -> None:
+        """Load recorded entries from disk."""
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"Cassette file not found: {self.path}")
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry: dict = json.loads(line)
+                self._entries.setdefault(entry["key"], []).append(entry)
+
+    async def record(
+        self, payload: Dict[str, Any], response: Dict[str, Any], latency_ms: float
+    ) -> None:
+        """Append a request/response pair to the cassette.
+
+        The file write runs in a worker thread so the event loop is not
+        blocked by disk I/O.
+
+        Args:
+            payload: Request body sent to the API.
+            response: Decoded JSON response returned by the API.
+            latency_ms: Observed wall-clock latency of the call.
+        """
+        entry: dict = {
+            "key": request_key(payload),
+            "request": payload,
+            "response": response,
+            "latency_ms": round(latency_ms, 2),
+        }
+        await asyncio.to_thread(self._append, json.dumps(entry) + "\n")
+
+    def _append(self, line: str) -> None:
+        """Append a serialized entry to the cassette file."""
+        with self._write_lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+    def replay(self, payload: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], float]]:
+        """Look up the recorded response for a request.
+
+        Identical requests recorded several times are served in order; once
+        exhausted the last recording is reused.
+
+        Args:
+            payload: Request body that would be sent to the API.
+
+        Returns:
+            Tuple of (recorded response, recorded latency in ms), or None if
+            the request was never recorded.
+        """
+        key: str = request_key(payload)
+        entries: Optional[List[dict]] = self._entries.get(key)
+        if not entries:
+            return None
+
+        cursor: int = self._cursors.get(key, 0)
+        entry: dict = entries[min(cursor, len(entries) - 1)]
+        self._cursors[key] = cursor + 1
+        return entry["response"], entry["latency_ms"]
+
+
+# Cassettes shared by every client in the process, keyed by (path, mode)
+_cassettes: Dict[Tuple[str, str], Cassette] = {}
+
+
+def get_cassette(path: str, mode: str) -> Optional[Cassette]:
+    """Get the shared cassette for a path and mode.
+
+    Args:
+        path: Path of the cassette file.
+        mode: One of "off", "record" or "replay".
+
+    Returns:
+        Cassette instance, or None when mode is "off".
+    """
+    if mode == "off":
+        return None
+    if (path, mode) not in _cassettes:
+        _cassettes[(path, mode)] = Cassette(path, mode)
+    return _cassettes[(path, mode)]
@@ -1,16 +1,29 @@
 """HTTP client for OpenRouter API with rate limit handling."""
 
 import asyncio
+import json
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import httpx
 
+from database.models import UsageModel
+from services.openrouter.cassette import Cassette, get_cassette
 from services.openrouter.config import (
     OPENROUTER_API_KEY,
     OPENROUTER_BASE_URL,
+    OPENROUTER_CASSETTE_MODE,
+    OPENROUTER_CASSETTE_PATH,
+    OPENROUTER_CASSETTE_SIMULATE_LATENCY,
     OPENROUTER_MODEL,
 )
+from services.openrouter.resilience import (
+    CircuitOpenError,
+    call_kind,
+    circuit_breaker,
+    latency_tracker,
+)
+from services.openrouter.usage import usage_from_response
 
 
 class OpenRouterClient:
@@ -21,6 +34,9 @@ class OpenRouterClient:
         api_key: Optional[str] = None,
         model: Optional[str] = None,
         base_url: str = OPENROUTER_BASE_URL,
+        cassette_mode: Optional[str] = None,
+        cassette_path: Optional[str] = None,
+        simulate_latency: Optional[bool] = None,
     ) -> None:
         """Initialize OpenRouter client.
 
@@ -28,10 +44,23 @@ class OpenRouterClient:
             api_key: OpenRouter API key. Defaults to environment variable.
             model: Model name to use. Defaults to environment variable.
             base_url: Base URL for OpenRouter API.
+            cassette_mode: "off", "record" or "replay". Defaults to environment variable.
+            cassette_path: Cassette file path. Defaults to environment variable.
+            simulate_latency: Whether replay sleeps for the recorded latency.
+                Defaults to environment variable.
         """
         self.api_key: str = api_key or OPENROUTER_API_KEY
         self.model: str = model or OPENROUTER_MODEL
         self.base_url: str = base_url
+        self.cassette: Optional[Cassette] = get_cassette(
+            cassette_path or OPENROUTER_CASSETTE_PATH,
+            cassette_mode or OPENROUTER_CASSETTE_MODE,
+        )
+        self.simulate_latency: bool = (
+            OPENROUTER_CASSETTE_SIMULATE_LATENCY
+            if simulate_latency is None
+            else simulate_latency
+        )
         self.client: httpx.AsyncClient = httpx.AsyncClient(
             base_url=self.base_url,
             headers={
@@ -56,10 +85,12 @@ class OpenRouterClient:
 
     async def call_api(
         self,
-        messages: List[dict[str, str]],
+        messages: List[dict[str, Any]],
         temperature: float = 0.7,
         max_retries: int = 3,
         response_format: Optional[dict] = None,
+        max_tokens: Optional[int] = None,
+        model: Optional[str] = None,
     ) -> str:
         """Call OpenRouter API with retry logic and rate limit handling.
 
@@ -69,6 +100,8 @@ class OpenRouterClient:
             max_retries: Maximum number of retry attempts.
             response_format: Optional response format specification for structured output.
                            Use JSON schema format for guaranteed structured responses.
+            max_tokens: Optional cap on generated tokens.
+            model: Optional model override for this call. Defaults to the client model.
 
         Returns:
             Generated text response.
@@ -76,19 +109,66 @@ class OpenRouterClient:
         Raises:
             Exception: If API call fails after retries.
         """
-        payload: Dict[str, Any] = {
-            "model": self.model,
-            "messages": messages,
-            "temperature": temperature,
-        }
+        content, _ = await self.call_api_with_usage(
+            messages=messages,
+            temperature=temperature,
+            max_retries=max_retries,
+            response_format=response_format,
+            max_tokens=max_tokens,
+            model=model,
+        )
+        return content
 
-        # Add response_format if provided for structured output
-        if response_format:
-            payload["response_format"] = response_format
+    async def call_api_with_usage(
+        self,
+        messages: List[dict[str, Any]],
+        temperature: float = 0.7,
+        max_retries: int = 3,
+        response_format: Optional[dict] = None,
+        max_tokens: Optional[int] = None,
+        model: Optional[str] = None,
+    ) -> Tuple[str, UsageModel]:
+        """Call OpenRouter API and return the content with its usage.
+
+        Latency covers the whole call including retries and rate limit waits.
+        Slow attempts are hedged with a duplicate request once the tail latency
+        is known, and calls fail fast while the circuit breaker is open.
+
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'.
+            temperature: Temperature for generation.
+            max_retries: Maximum number of retry attempts.
+            response_format: Optional response format specification for structured output.
+            max_tokens: Optional cap on generated tokens.
+            model: Optional model override for this call. Defaults to the client model.
+
+        Returns:
+            Tuple of (generated text response, usage of this call).
+
+        Raises:
+            CircuitOpenError: If the circuit breaker is open.
+            Exception: If API call fails after retries.
+        """
+        payload: Dict[str, Any] = self._payload(
+            messages, temperature, response_format, max_tokens, model
+        )
+        started_at: float = time.perf_counter()
+
+        if self.cassette is not None and self.cassette.mode == "replay":
+            return await self._replay(payload, started_at)
 
         for attempt in range(max_retries):
             try:
-                response = await self.client.post("/chat/completions", json=payload)
+                async with circuit_breaker.guard():
+                    try:
+                        response = await self._post(payload)
+                    except httpx.HTTPError:
+                        circuit_breaker.record_failure()
+                        raise
+                    if response.status_code >= 500:
+                        circuit_breaker.record_failure()
+                    elif response.is_success:
+                        circuit_breaker.record_success()
 
                 # Check for rate limit headers
                 # rate_limit_remaining = response.headers.get("x-ratelimit-remaining")
@@ -110,7 +190,11 @@ class OpenRouterClient:
 
                 response.raise_for_status()
                 data = response.json()
-                return data["choices"][0]["message"]["content"]
+                latency_ms = (time.perf_counter() - started_at) * 1000
+                if self.cassette is not None:
+                    await self.cassette.record(payload, data, latency_ms)
+                usage = usage_from_response(data, latency_ms, payload["model"])
+                return data["choices"][0]["message"]["content"], usage
 
             except httpx.HTTPStatusError as e:
                 if e.response.status_code == 429 and attempt < max_retries - 1:
@@ -127,3 +211,259 @@ class OpenRouterClient:
                 raise Exception(f"OpenRouter API error: {str(e)}") from e
 
         raise Exception("OpenRouter API call failed after retries")
+
+    async def call_api_stream(
+        self,
+        messages: List[dict[str, Any]],
+        temperature: float = 0.7,
+        max_retries: int = 3,
+        response_format: Optional[dict] = None,
+        max_tokens: Optional[int] = None,
+        model: Optional[str] = None,
+        on_text: Optional[Callable[[str], None]] = None,
+    ) -> Tuple[str, UsageModel]:
+        """Call OpenRouter API with a streamed response.
+
+        Content deltas are accumulated as they arrive and the text so far is
+        passed to on_text after each one. If the stream fails before any
+        content arrives, the call falls back to call_api_with_usage (with its
+        retries and hedging); a stream that fails midway is not retried.
+
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'.
+            temperature: Temperature for generation.
+            max_retries: Maximum number of retry attempts for the fallback call.
+            response_format: Optional response format specification for structured output.
+            max_tokens: Optional cap on generated tokens.
+            model: Optional model override for this call. Defaults to the client model.
+            on_text: Optional callback receiving the accumulated text.
+
+        Returns:
+            Tuple of (generated text response, usage of this call).
+
+        Raises:
+            CircuitOpenError: If the circuit breaker is open.
+            Exception: If the API call fails.
+        """
+        payload: Dict[str, Any] = self._payload(
+            messages, temperature, response_format, max_tokens, model
+        )
+        payload["stream"] = True
+        started_at: float = time.perf_counter()
+
+        if self.cassette is not None and self.cassette.mode == "replay":
+            content, usage = await self._replay(payload, started_at)
+            if on_text:
+                on_text(content)
+            return content, usage
+
+        text: str = ""
+        usage_data: Dict[str, Any] = {}
+        served_by: Optional[str] = None
+        try:
+            async with circuit_breaker.guard():
+                try:
+                    async with self.client.stream(
+                        "POST", "/chat/completions", json=payload
+                    ) as response:
+                        # A failed status leaves nothing streamed, so the
+                        # fallback call records the outcome for the breaker
+                        if response.status_code >= 400:
+                            await response.aread()
+                            response.raise_for_status()
+
+                        async for line in response.aiter_lines():
+                            # Skip SSE comments (keep-alives) and blank separators
+                            if not line.startswith("data: "):
+                                continue
+                            chunk: str = line[len("data: ") :].strip()
+                            if chunk == "[DONE]":
+                                break
+                            data: Dict[str, Any] = json.loads(chunk)
+                            if data.get("error"):
+                                raise Exception(
+                                    f"OpenRouter API error: {data['error']}"
+                                )
+                            served_by = data.get("model") or served_by
+                            # The final chunk carries the usage of the whole completion
+                            usage_data = data.get("usage") or usage_data
+                            for choice in data.get("choices") or []:
+                                delta: Optional[str] = (choice.get("delta") or {}).get(
+                                    "content"
+                                )
+                                if delta:
+                                    text += delta
+                                    if on_text:
+                                        on_text(text)
+                except httpx.TransportError:
+                    if text:
+                        # Failed midway: no fallback call runs to record it
+                        circuit_breaker.record_failure()
+                    raise
+                circuit_breaker.record_success()
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            if text:
+                raise Exception(f"OpenRouter stream failed midway: {str(e)}") from e
+            content, usage = await self.call_api_with_usage(
+                messages=messages,
+                temperature=temperature,
+                max_retries=max_retries,
+                response_format=response_format,
+                max_tokens=max_tokens,
+                model=model,
+            )
+            if on_text:
+                on_text(content)
+            return content, usage
+
+        latency_ms = (time.perf_counter() - started_at) * 1000
+        latency_tracker.record(payload["model"], call_kind(payload), latency_ms)
+        data = {
+            "model": served_by,
+            "choices": [{"message": {"content": text}}],
+            "usage": usage_data,
+        }
+        if self.cassette is not None:
+            await self.cassette.record(payload, data, latency_ms)
+        return text, usage_from_response(data, latency_ms, payload["model"])
+
+    def _payload(
+        self,
+        messages: List[dict[str, Any]],
+        temperature: float,
+        response_format: Optional[dict],
+        max_tokens: Optional[int],
+        model: Optional[str],
+    ) -> Dict[str, Any]:
+        """Build the request body for a completion call.
+
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'.
+            temperature: Temperature for generation.
+            response_format: Optional response format for structured output.
+            max_tokens: Optional cap on generated tokens.
+            model: Optional model override. Defaults to the client model.
+
+        Returns:
+            Request body dictionary.
+        """
+        payload: Dict[str, Any] = {
+            "model": model or self.model,
+            "messages": messages,
+            "temperature": temperature,
+            # Ask OpenRouter for detailed usage, including cached prompt tokens
+            "usage": {"include": True},
+        }
+
+        # Add response_format if provided for structured output
+        if response_format:
+            payload["response_format"] = response_format
+
+        if max_tokens:
+            payload["max_tokens"] = max_tokens
+
+        return payload
+
+    async def _post(self, payload: Dict[str, Any]) -> httpx.Response:
+        """Send one completion request, hedging it if it runs long.
+
+        Args:
+            payload: Request body.
+
+        Returns:
+            HTTP response.
+
+        Raises:
+            httpx.HTTPError: If the request fails.
+        """
+        started_at: float = time.perf_counter()
+        kind: str = call_kind(payload)
+        hedge_delay: Optional[float] = latency_tracker.hedge_delay(
+            payload["model"], kind
+        )
+        if hedge_delay is None:
+            response = await self.client.post("/chat/completions", json=payload)
+        else:
+            response = await self._post_hedged(payload, hedge_delay)
+
+        if response.is_success:
+            latency_tracker.record(
+                payload["model"], kind, (time.perf_counter() - started_at) * 1000
+            )
+        return response
+
+    async def _post_hedged(
+        self, payload: Dict[str, Any], hedge_delay: float
+    ) -> httpx.Response:
+        """Send a request and a duplicate if it is slower than the hedge delay.
+
+        The first non-5xx response wins and the other request is cancelled.
+        Note that a cancelled duplicate may still be billed by the provider.
+
+        Args:
+            payload: Request body.
+            hedge_delay: Seconds to wait before sending the duplicate.
+
+        Returns:
+            HTTP response of the request that answered first.
+
+        Raises:
+            httpx.HTTPError: If both requests fail.
+        """
+        primary = asyncio.create_task(
+            self.client.post("/chat/completions", json=payload)
+        )
+        done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+        if done:
+            return primary.result()
+
+        latency_tracker.hedged_requests += 1
+        hedge = asyncio.create_task(self.client.post("/chat/completions", json=payload))
+        pending = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None and task.result().status_code < 500:
+                        if task is hedge:
+                            latency_tracker.hedge_wins += 1
+                        return task.result()
+            # Neither answered cleanly; surface the primary's outcome
+            return primary.result()
+        finally:
+            for task in (primary, hedge):
+                if not task.done():
+                    task.cancel()
+
+    async def _replay(
+        self, payload: Dict[str, Any], started_at: float
+    ) -> Tuple[str, UsageModel]:
+        """Serve a call from the cassette instead of the network.
+
+        Args:
+            payload: Request body that would be sent to the API.
+            started_at: perf_counter value when the call started.
+
+        Returns:
+            Tuple of (recorded text response, usage of this call).
+
+        Raises:
+            Exception: If the request was never recorded.
+        """
+        recorded = self.cassette.replay(payload)
+        if recorded is None:
+            raise Exception(
+                f"OpenRouter cassette miss: request not recorded in {self.cassette.path}"
+            )
+
+        data, recorded_latency_ms = recorded
+        if self.simulate_latency:
+            await asyncio.sleep(recorded_latency_ms / 1000)
+
+        latency_ms = (time.perf_counter() - started_at) * 1000
+        usage = usage_from_response(data, latency_ms, payload["model"])
+        return data["choices"][0]["message"]["content"], usage
@@ -0,0 +1,195 @@
+"""Prompt compaction: strip quoted replies, signatures and boilerplate.
+
+Customer emails often repeat the whole earlier conversation as quoted text and
+end with signatures, disclaimers and "Sent from my iPhone" lines. Since every
+message is sent to the model, that history makes prompt tokens grow roughly
+quadratically with thread length. Compaction keeps only the new text of each
+message. Patterns are compiled once and each body is scanned in a single pass
+over its lines.
+"""
+
+import re
+from typing import List, Tuple
+
+from database.models import MessageModel, ThreadModel
+from services.openrouter.text_processor import estimate_tokens
+
+# Lines that start quoted history: everything from here on is dropped
+QUOTE_HEADER_PATTERN = re.compile(
+    r"^\s*(?:"
+    r"On\s.{1,200}\swrote:\s*$"  # On Mon, Sep 1, 2025, Jane <j@x.com> wrote:
+    r"|-{2,}\s*(?:Original|Forwarded)\s+Message\s*-{2,}"  # -----Original Message-----
+    r"|_{10,}\s*$"  # Outlook separator line
+    r")",
+    re.IGNORECASE,
+)
+
+# Outlook reply header: a From line followed by Sent/To/Subject-style lines
+OUTLOOK_FROM_PATTERN = re.compile(r"^\s*From:\s.+", re.IGNORECASE)
+OUTLOOK_FIELD_PATTERN = re.compile(
+    r"^\s*(?:Sent|Date|To|Cc|Bcc|Subject):(?:\s.*)?$", re.IGNORECASE
+)
+MIN_OUTLOOK_FIELDS: int = 2
+
+# Lines that start a signature or disclaimer block: the rest is dropped
+SIGNATURE_PATTERN = re.compile(
+    r"^\s*(?:"
+    r"--\s*$"  # RFC 3676 signature delimiter
+    r"|(?:this|the information in this)\s+(?:e-?mail|message)\b.{0,80}\b"
+    r"(?:confidential|privileged|intended (?:solely )?for)"
+    r"|confidentiality notice"
+    r"|disclaimer:"
+    r")",
+    re.IGNORECASE,
+)
+
+# Single boilerplate lines that are removed wherever they appear
+BOILERPLATE_PATTERN = re.compile(
+    r"^\s*(?:"
+    r"sent from my \w+(?:\s\w+)?"
+    r"|sent from (?:outlook|yahoo mail|mail) for \w+"
+    r"|get outlook for \w+"
+    r"|please consider the environment before printing.*"
+    r")\s*$",
+    re.IGNORECASE,
+)
+
+# Sign-offs only end the message when the few lines after them look like a
+# signature. "Thanks" and "Best" are left out: customers open with them too.
+SIGN_OFF_PATTERN = re.compile(
+    r"^\s*(?:(?:best|kind|warm|warmest)\s+regards|regards|sincerely|cheers"
+    r"|yours (?:truly|sincerely))[,!.]?\s*$",
+    re.IGNORECASE,
+)
+MAX_LINES_AFTER_SIGN_OFF: int = 4
+
+# Signature lines: contact details, or a short name/title line with no sentence
+CONTACT_DETAIL_PATTERN = re.compile(
+    r"[\w.+-]+@[\w-]+\.[\w.]+"  # Email address
+    r"|(?:https?://|www\.)\S+"  # Website
+    r"|^\s*(?:(?:tel|phone|mobile|cell|fax)\s*:?\s*)?\+?[\d ()./-]{7,}\s*$",  # Phone
+    re.IGNORECASE,
+)
+# Name and title lines start with a capital and are not questions or sentences
+NAME_LINE_PATTERN = re.compile(r"^\s*[A-Z(][^?!]*$")
+ABBREVIATION_END_PATTERN = re.compile(r"\b(?:Inc|Ltd|LLC|Co|Corp|Jr|Sr)\.\s*$")
+MAX_NAME_LINE_WORDS: int = 6
+MAX_SIGNATURE_LINE_CHARS: int = 60
+
+INLINE_WHITESPACE_PATTERN = re.compile(r"[ \t ]+")
+
+
+def _is_outlook_header(lines: List[str], index: int) -> bool:
+    """Check whether a line starts an Outlook reply header block.
+
+    Args:
+        lines: Lines of the message body.
+        index: Index of the candidate From line.
+
+    Returns:
+        True if the From line is directly followed by header fields.
+    """
+    if not OUTLOOK_FROM_PATTERN.match(lines[index]):
+        return False
+    fields: int = 0
+    for line in lines[index + 1 :]:
+        if not OUTLOOK_FIELD_PATTERN.match(line):
+            break
+        fields += 1
+    return fields >= MIN_OUTLOOK_FIELDS
+
+
+def _is_signature_line(line: str) -> bool:
+    """Check whether a line looks like part of a signature.
+
+    Args:
+        line: Line after a sign-off.
+
+    Returns:
+        True for contact details and short name or title lines.
+    """
+    if not line.strip():
+        return True
+    if len(line.strip()) > MAX_SIGNATURE_LINE_CHARS:
+        return False
+    if CONTACT_DETAIL_PATTERN.search(line):
+        return True
+    if len(line.split()) > MAX_NAME_LINE_WORDS or not NAME_LINE_PATTERN.match(line):
+        return False
+    return not line.rstrip().endswith(".") or bool(
+        ABBREVIATION_END_PATTERN.search(line)
+    )
+
+
+def _is_signature(lines: List[str], index: int) -> bool:
+    """Check whether a sign-off line starts the message's signature.
+
+    Args:
+        lines: Lines of the message body.
+        index: Index of the sign-off line.
+
+    Returns:
+        True if only a few signature-like lines follow the sign-off.
+    """
+    following: List[str] = lines[index + 1 :]
+    return len(following) <= MAX_LINES_AFTER_SIGN_OFF and all(
+        _is_signature_line(line) for line in following
+    )
+
+
+def compact_message_body(body: str) -> str:
+    """Remove quoted history, signatures and boilerplate from a message body.
+
+    Args:
+        body: Raw message body.
+
+    Returns:
+        Compacted body with collapsed whitespace. Falls back to the collapsed
+        original if compaction would leave nothing.
+    """
+    lines: List[str] = body.splitlines()
+    kept: List[str] = []
+
+    for index, line in enumerate(lines):
+        if line.lstrip().startswith(">"):
+            continue
+        if (
+            QUOTE_HEADER_PATTERN.match(line)
+            or _is_outlook_header(lines, index)
+            or SIGNATURE_PATTERN.match(line)
+        ):
+            break
+        if BOILERPLATE_PATTERN.match(line):
+            continue
+        if SIGN_OFF_PATTERN.match(line) and _is_signature(lines, index):
+            break
+
+        line = INLINE_WHITESPACE_PATTERN.sub(" ", line).strip()
+        # Collapse runs of blank lines into one
+        if line or (kept and kept[-1]):
+            kept.append(line)
+
+    compacted: str = "\n".join(kept).strip()
+    return compacted or INLINE_WHITESPACE_PATTERN.sub(" ", body).strip()
+
+
+def compact_thread(thread: ThreadModel) -> Tuple[ThreadModel, int]:
+    """Compact every message of a thread for prompting.
+
+    The stored thread is left untouched so reviewers still see full bodies.
+
+    Args:
+        thread: Thread to compact.
+
+    Returns:
+        Tuple of (thread copy with compacted bodies, estimated prompt tokens saved).
+    """
+    messages: List[MessageModel] = []
+    tokens_saved: int = 0
+
+    for msg in thread.messages:
+        body: str = compact_message_body(msg.body)
+        tokens_saved += estimate_tokens(msg.body) - estimate_tokens(body)
+        messages.append(msg.model_copy(update={"body": body}))
+
+    return thread.model_copy(update={"messages": messages}), tokens_saved
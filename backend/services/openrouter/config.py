@@ -12,3 +12,81 @@ OPENROUTER_BASE_URL: str = "https://openrouter.ai/api/v1"
 # Chunking configuration
 MAX_TOKENS_PER_CHUNK: int = 8000  # Conservative limit for smaller models
 MESSAGES_PER_CHUNK: int = 10  # Process 10 messages at a time for large threads
+# Output token cap for the running notes returned by intermediate chunks
+RUNNING_NOTES_MAX_TOKENS: int = int(os.getenv("RUNNING_NOTES_MAX_TOKENS", "300"))
+
+# Fill order_id, product, customer_email, order_date and ticket_ids locally
+# instead of asking the LLM for them (smaller schema, fewer output tokens)
+LOCAL_CRM_EXTRACTION: bool = os.getenv("LOCAL_CRM_EXTRACTION", "true").lower() == "true"
+
+# Render full_summary_text locally from the structured fields instead of having
+# the LLM generate a markdown summary that repeats them
+LOCAL_SUMMARY_RENDERING: bool = (
+    os.getenv("LOCAL_SUMMARY_RENDERING", "true").lower() == "true"
+)
+
+# Strip quoted replies, signatures and boilerplate from message bodies in prompts
+PROMPT_COMPACTION: bool = os.getenv("PROMPT_COMPACTION", "true").lower() == "true"
+
+# Prompt layout: "cacheable" puts the static instructions in a stable system
+# prefix and the thread data last so provider prompt caching can hit;
+# "legacy" interleaves thread values with the instructions
+PROMPT_LAYOUT: str = os.getenv("PROMPT_LAYOUT", "cacheable").lower()
+
+# Optional batching of small threads into a single completion call
+BATCH_SMALL_THREADS: bool = os.getenv("BATCH_SMALL_THREADS", "false").lower() == "true"
+BATCH_TOKEN_BUDGET: int = int(os.getenv("BATCH_TOKEN_BUDGET", "6000"))  # Prompt tokens
+BATCH_MAX_THREADS: int = int(os.getenv("BATCH_MAX_THREADS", "8"))
+BATCH_MAX_MESSAGES: int = int(os.getenv("BATCH_MAX_MESSAGES", "10"))  # "Small" threads
+
+# Size-based model routing: simple threads go to a cheaper "small" tier, long or
+# sensitive threads (and small-tier validation failures) to the default model
+MODEL_ROUTING: bool = os.getenv("MODEL_ROUTING", "false").lower() == "true"
+OPENROUTER_SMALL_MODEL: str = os.getenv("OPENROUTER_SMALL_MODEL", "openai/gpt-4o-mini")
+ROUTING_SMALL_MAX_MESSAGES: int = int(os.getenv("ROUTING_SMALL_MAX_MESSAGES", "6"))
+ROUTING_SMALL_MAX_TOKENS: int = int(os.getenv("ROUTING_SMALL_MAX_TOKENS", "2000"))
+# Topic keywords that always route to the default tier
+ROUTING_ESCALATION_TOPICS: list[str] = [
+    keyword.strip().lower()
+    for keyword in os.getenv(
+        "ROUTING_ESCALATION_TOPICS", "fraud,security,safety,dispute,legal,escalat"
+    ).split(",")
+    if keyword.strip()
+]
+# Max concurrent summarizations per tier
+ROUTING_SMALL_CONCURRENCY: int = int(os.getenv("ROUTING_SMALL_CONCURRENCY", "8"))
+ROUTING_DEFAULT_CONCURRENCY: int = int(os.getenv("ROUTING_DEFAULT_CONCURRENCY", "4"))
+
+# Hedged requests: once enough latencies are known, send a duplicate request
+# when a call exceeds the HEDGE_PERCENTILE latency and take the first answer
+HEDGE_REQUESTS: bool = os.getenv("HEDGE_REQUESTS", "true").lower() == "true"
+HEDGE_PERCENTILE: float = float(os.getenv("HEDGE_PERCENTILE", "95"))
+HEDGE_MIN_SAMPLES: int = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+
+# Circuit breaker: consecutive upstream failures that open the circuit, and how
+# long calls fail fast (and queued background work pauses) before probing again
+CIRCUIT_FAILURE_THRESHOLD: int = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_SECONDS: float = float(os.getenv("CIRCUIT_RESET_SECONDS", "30"))
+
+# Update the summary of a thread that gained messages from its stored rolling
+# state and the new messages only, instead of re-summarizing the whole thread
+INCREMENTAL_SUMMARIES: bool = (
+    os.getenv("INCREMENTAL_SUMMARIES", "true").lower() == "true"
+)
+
+# Stream on-demand summaries and push the growing issue_summary over SSE
+STREAM_PARTIAL_SUMMARIES: bool = (
+    os.getenv("STREAM_PARTIAL_SUMMARIES", "true").lower() == "true"
+)
+
+# Record/replay configuration for deterministic benchmark runs
+# off: call the API normally; record: call the API and save every exchange;
+# replay: serve saved exchanges without touching the network
+OPENROUTER_CASSETTE_MODE: str = os.getenv("OPENROUTER_CASSETTE_MODE", "off").lower()
+OPENROUTER_CASSETTE_PATH: str = os.getenv(
+    "OPENROUTER_CASSETTE_PATH", "openrouter_cassette.jsonl"
+)
+# Sleep for the originally recorded latency when replaying
+OPENROUTER_CASSETTE_SIMULATE_LATENCY: bool = (
+    os.getenv("OPENROUTER_CASSETTE_SIMULATE_LATENCY", "false").lower() == "true"
+)
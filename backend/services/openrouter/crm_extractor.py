@@ -0,0 +1,114 @@
+"""Deterministic extraction of CRM fields from thread metadata and messages.
+
+Fields that are known from the thread record or can be matched reliably with
+regular expressions are filled in locally instead of being generated by the
+LLM, which shrinks the response schema and the output tokens per call.
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+
+from database.models import ThreadModel
+
+# Key details filled in locally and left out of the LLM response schema
+LOCAL_CRM_FIELDS: tuple = (
+    "order_id",
+    "product",
+    "customer_email",
+    "order_date",
+    "ticket_ids",
+)
+
+EMAIL_PATTERN = re.compile(r"\b[\w.+-]+@[\w-]+(?:\.[\w-]+)*\.[a-zA-Z]{2,}\b")
+
+# Ticket references such as "TKT-0042", "ticket #48213" or "case no. 5521"
+TICKET_PATTERN = re.compile(
+    r"\b((?:TKT|TICKET|CASE|INC)-\d{3,})\b"
+    r"|\b(?:ticket|case)\s*(?:no\.?|number|id)?\s*[#:]?\s*(\d{3,})\b",
+    re.IGNORECASE,
+)
+
+_MONTHS = (
+    r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?"
+    r"|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)"
+)
+_DATE = (
+    r"(\d{4}-\d{2}-\d{2}"
+    r"|\d{1,2}/\d{1,2}/\d{2,4}"
+    rf"|{_MONTHS}\.?\s+\d{{1,2}}(?:st|nd|rd|th)?(?:,?\s+\d{{4}})?"
+    rf"|\d{{1,2}}(?:st|nd|rd|th)?\s+{_MONTHS}(?:,?\s+\d{{4}})?)"
+)
+# Dates tied to the order, e.g. "ordered on Sept 3", "order date: 2025-09-01"
+ORDER_DATE_PATTERN = re.compile(
+    rf"\b(?:order\s+date|ordered|purchased|placed(?:\s+(?:it|the\s+order|my\s+order))?)"
+    rf"\s*(?:on|:|-)?\s*{_DATE}",
+    re.IGNORECASE,
+)
+
+
+def extract_crm_fields(thread: ThreadModel) -> Dict[str, Any]:
+    """Extract the locally known CRM fields for a thread.
+
+    Customer messages are searched before company messages so that the
+    customer's own email address wins over support addresses.
+
+    Args:
+        thread: Thread to extract fields from.
+
+    Returns:
+        Dictionary with a value for every field in LOCAL_CRM_FIELDS.
+    """
+    customer_bodies: List[str] = [
+        msg.body for msg in thread.messages if msg.sender == "customer"
+    ]
+    company_bodies: List[str] = [
+        msg.body for msg in thread.messages if msg.sender != "customer"
+    ]
+
+    return {
+        "order_id": thread.order_id,
+        "product": thread.product,
+        "customer_email": _first_match(EMAIL_PATTERN, customer_bodies + company_bodies),
+        "order_date": _first_match(
+            ORDER_DATE_PATTERN, customer_bodies + company_bodies
+        ),
+        "ticket_ids": _ticket_ids(customer_bodies + company_bodies),
+    }
+
+
+def merge_crm_fields(
+    data: Dict[str, Any], crm_fields: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Merge locally extracted fields into a parsed LLM response.
+
+    Args:
+        data: Parsed JSON response from the LLM.
+        crm_fields: Fields returned by extract_crm_fields.
+
+    Returns:
+        The response data with key_details completed.
+    """
+    key_details: Dict[str, Any] = dict(data.get("key_details") or {})
+    key_details.update(crm_fields)
+    data["key_details"] = key_details
+    return data
+
+
+def _first_match(pattern: re.Pattern, bodies: List[str]) -> Optional[str]:
+    """Return the first captured group of a pattern across message bodies."""
+    for body in bodies:
+        match = pattern.search(body)
+        if match:
+            return next((group for group in match.groups() if group), match.group(0))
+    return None
+
+
+def _ticket_ids(bodies: List[str]) -> List[str]:
+    """Return unique ticket IDs in order of first mention."""
+    ticket_ids: List[str] = []
+    for body in bodies:
+        for match in TICKET_PATTERN.finditer(body):
+            ticket_id: str = (match.group(1) or match.group(2)).upper()
+            if ticket_id not in ticket_ids:
+                ticket_ids.append(ticket_id)
+    return ticket_ids
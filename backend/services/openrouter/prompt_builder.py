@@ -1,16 +1,91 @@
 """Prompt building utilities for OpenRouter API."""
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from database.models import MessageModel, ThreadModel
 from services.openrouter.message_formatter import format_messages_for_summarization
 
+RESOLUTION_GUIDANCE: str = """- If resolved: Explain what was done to resolve it and when
+- If partially resolved: Explain what's been addressed and what remains open
+- If pending: Explain what's waiting and what needs to happen next
+- If escalated: Explain why and to whom
+Include specific details like what support offered, what customer agreed to, next steps, etc."""
+
+FULL_SUMMARY_INSTRUCTIONS: str = (
+    """**Full Summary Text:**
+Create a markdown-formatted summary with these sections:
+
+## Issue Summary
+[2-3 sentences with actual details]
+
+## Key Details
+- **Order ID**: [value]
+- **Product**: [value]
+- **Customer Name**: [if available]
+- **Customer Email**: [if available]
+- **Order Date**: [if mentioned]
+- **Order Status**: [if mentioned]
+- **Ticket IDs**: [if any]
+
+## Resolution Status
+[Write a descriptive explanation of the current status with context]
+"""
+    + RESOLUTION_GUIDANCE
+    + """
+
+Keep it concise and factual. Do NOT include Timeline or Action Items sections."""
+)
+
+# Context, resolution and confidence instructions shared by every prompt layout
+EXTRACTION_INSTRUCTIONS: str = """**Context Extraction:**
+- issue_type: Classify the issue (e.g., damaged product, late delivery, wrong variant, return/refund request, defective item, missing item, billing issue, cancellation request)
+- customer_sentiment: Analyze tone - 'positive', 'neutral', or 'negative'
+- urgency_level: Assess urgency - 'low', 'medium', 'high', or 'urgent'
+  * If resolved, urgency should be 'low' or 'medium'
+  * If unresolved with urgent language, mark as 'high' or 'urgent'
+- customer_intent: What does the customer want? (refund, replacement, return, exchange, credit, tracking update, status inquiry, cancellation, explanation)
+- key_phrases: Extract 3-5 important phrases from the conversation
+
+**Resolution Status:**
+- Field value: Choose one - 'resolved', 'partially resolved', 'pending', or 'escalated'
+- Base this on the final state of the conversation
+
+**Confidence Scores (0-100):**
+Provide confidence scores for: issue_type, customer_sentiment, urgency_level, customer_intent, resolution_status
+- 90-100: Very clear from messages
+- 70-89: Clear with minor ambiguity
+- 50-69: Somewhat clear
+- Below 50: Unclear or conflicting"""
+
+# Used when full_summary_text is rendered locally from the structured fields
+RESOLUTION_DETAILS_INSTRUCTIONS: str = (
+    """**Resolution Details:**
+Write 1-3 sentences explaining the current status with context:
+"""
+    + RESOLUTION_GUIDANCE
+    + """
+
+Do NOT write a markdown summary; it is rendered from the fields above. Keep it concise and factual."""
+)
+
+# Key Details lines when nothing was pre-extracted locally
+KEY_DETAILS_EXTRACTION: str = """- Extract customer_name and customer_email if mentioned
+- Extract order_date and order_status if mentioned
+- List ticket_ids if referenced"""
+
+# Key Details line when the other details were pre-extracted locally
+PRE_EXTRACTED_KEY_DETAILS: str = (
+    "Extract only customer_name and order_status if mentioned"
+)
+
 
 def create_summarization_prompt(
     thread: ThreadModel,
     chunk_messages: Optional[List[MessageModel]] = None,
     is_chunk: bool = False,
     previous_summary: Optional[str] = None,
+    crm_fields: Optional[Dict[str, Any]] = None,
+    render_locally: bool = False,
 ) -> str:
     """Create summarization prompt for OpenRouter.
 
@@ -18,7 +93,11 @@ def create_summarization_prompt(
         thread: Thread model with metadata.
         chunk_messages: Optional subset of messages to process.
         is_chunk: Whether this is a chunk of a larger thread.
-        previous_summary: Previous summary if processing chunks.
+        previous_summary: Running notes of earlier chunks if processing chunks.
+        crm_fields: Locally extracted key details. When given, the model is told
+            not to return them and to only extract the remaining CRM fields.
+        render_locally: Whether the markdown summary is rendered locally, in which
+            case the model only writes the short resolution_details narrative.
 
     Returns:
         Formatted prompt string.
@@ -27,6 +106,9 @@ def create_summarization_prompt(
         chunk_messages if chunk_messages is not None else thread.messages
     )
     messages_text: str = format_messages_for_summarization(messages_to_format)
+    key_details_instructions: str = _key_details_instructions(
+        thread, crm_fields, render_locally
+    )
 
     base_prompt: str = f"""You are a customer experience specialist summarizing email threads between customers and support staff. Your role is to provide accurate, concise summaries that help teams quickly understand customer issues and their resolution status.
 
@@ -43,80 +125,287 @@ Thread Context:
 """
 
     if is_chunk and previous_summary:
-        base_prompt += f"""Previous Summary:
+        base_prompt += f"""Running Notes From Earlier Messages:
 {previous_summary}
 
+The messages below are the latest {len(messages_to_format)} of the thread. Summarize the WHOLE thread using the notes above for earlier context.
+
 """
 
     base_prompt += f"""Email Messages:
 {messages_text}
 
-Analyze this specific email thread carefully and provide a detailed, unique summary. Pay attention to:
-- The specific issue reported by the customer
-- Key details mentioned (order numbers, ticket IDs, etc.)
-- The resolution path taken
-- Any unique aspects of this particular case
+Analyze this specific email thread carefully and provide a detailed, unique summary. {_summary_requirements(key_details_instructions, render_locally)}"""
 
-IMPORTANT: Do NOT include a timeline section in the summary. Users can view the timeline in the Messages tab.
+    return base_prompt
 
-EXTRACTION REQUIREMENTS:
 
-**Issue Summary:**
-Provide a clear 2-3 sentence summary of what happened in this conversation. Include actual details from the messages.
+def create_running_notes_prompt(
+    thread: ThreadModel,
+    chunk_messages: List[MessageModel],
+    previous_notes: Optional[str] = None,
+) -> str:
+    """Create the thread data for an intermediate chunk of a long thread.
 
-**Key Details:**
+    Intermediate chunks only carry context forward, so they ask for compact
+    running notes instead of the full structured summary. The instructions
+    live in get_running_notes_instructions so they form a stable prefix.
+
+    Args:
+        thread: Thread model with metadata.
+        chunk_messages: Messages in this chunk.
+        previous_notes: Running notes from earlier chunks, if any.
+
+    Returns:
+        Formatted prompt string.
+    """
+    messages_text: str = format_messages_for_summarization(chunk_messages)
+    previous: str = previous_notes or "(none - this is the start of the thread)"
+
+    return f"""Thread: Order {thread.order_id} ({thread.product}), topic: {thread.topic}
+
+Previous Notes:
+{previous}
+
+New Messages:
+{messages_text}"""
+
+
+def get_running_notes_instructions(max_words: int = 150) -> str:
+    """Get the static instructions for intermediate chunk running notes.
+
+    Args:
+        max_words: Word budget for the updated notes.
+
+    Returns:
+        Instruction string.
+    """
+    return f"""You maintain running notes for a customer support email thread that is read in chunks. Given the previous notes and the next messages, return updated notes covering the whole thread so far in at most {max_words} words of plain text: the customer's issue and requests, what support did or offered, commitments and dates, names, ticket IDs, and anything still open. Keep only facts from the messages."""
+
+
+def get_static_instructions(local_crm_fields: bool, render_locally: bool) -> str:
+    """Get the summarization instructions shared by every thread.
+
+    Used by the cacheable prompt layout: the instructions depend only on
+    process-wide configuration, so every request starts with the same system
+    prefix and provider-side prompt caching can hit.
+
+    Args:
+        local_crm_fields: Whether key details are pre-extracted locally.
+        render_locally: Whether the markdown summary is rendered locally.
+
+    Returns:
+        System message string.
+    """
+    if local_crm_fields:
+        key_details: str = f"""The details under "Pre-extracted Details" in the thread data were extracted automatically. Do NOT return them in key_details{_usage_note(render_locally)}.
+{PRE_EXTRACTED_KEY_DETAILS}"""
+    else:
+        key_details = f"""- Use the Order ID and Product from the thread context
+{KEY_DETAILS_EXTRACTION}"""
+
+    return f"""{get_system_message()}
+
+You will receive one customer support email thread: its context, optionally running notes covering earlier messages, and the messages themselves. Analyze the ACTUAL messages and create a UNIQUE summary based on what was ACTUALLY said in that conversation. Do NOT use generic templates or placeholder text. {_summary_requirements(key_details, render_locally)}"""
+
+
+def get_batch_instructions(local_crm_fields: bool, render_locally: bool) -> str:
+    """Get the instructions for summarizing several threads in one request.
+
+    Args:
+        local_crm_fields: Whether key details are pre-extracted locally.
+        render_locally: Whether the markdown summary is rendered locally.
+
+    Returns:
+        System message string.
+    """
+    return f"""{get_static_instructions(local_crm_fields, render_locally)}
+
+BATCH MODE: You will receive several independent threads, each starting with a "### Thread <thread_id>" header. Summarize each thread on its own, never mixing details between threads, and return exactly one entry in "summaries" per thread with its thread_id."""
+
+
+def create_batch_data_prompt(
+    threads: List[ThreadModel], crm_fields: List[Optional[Dict[str, Any]]]
+) -> str:
+    """Create the thread data for a batched summarization request.
+
+    Args:
+        threads: Threads in the batch.
+        crm_fields: Locally extracted key details per thread (or None).
+
+    Returns:
+        Formatted prompt string.
+    """
+    return "\n\n".join(
+        f"### Thread {thread.thread_id}\n"
+        + create_thread_data_prompt(thread, crm_fields=fields)
+        for thread, fields in zip(threads, crm_fields)
+    )
+
+
+def create_thread_data_prompt(
+    thread: ThreadModel,
+    chunk_messages: Optional[List[MessageModel]] = None,
+    is_chunk: bool = False,
+    previous_summary: Optional[str] = None,
+    crm_fields: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Create the per-thread part of the cacheable prompt layout.
+
+    Everything that varies between threads is in this user message, after
+    the static system instructions.
+
+    Args:
+        thread: Thread model with metadata.
+        chunk_messages: Optional subset of messages to process.
+        is_chunk: Whether this is a chunk of a larger thread.
+        previous_summary: Running notes of earlier chunks if processing chunks.
+        crm_fields: Locally extracted key details, if any.
+
+    Returns:
+        Formatted prompt string.
+    """
+    messages_to_format: List[MessageModel] = (
+        chunk_messages if chunk_messages is not None else thread.messages
+    )
+    messages_text: str = format_messages_for_summarization(messages_to_format)
+
+    prompt: str = f"""Thread Context:
+- Topic: {thread.topic}
+- Subject: {thread.subject}
 - Order ID: {thread.order_id}
 - Product: {thread.product}
-- Extract customer_name and customer_email if mentioned
-- Extract order_date and order_status if mentioned
-- List ticket_ids if referenced
+- Initiated By: {thread.initiated_by}
+- Total Messages: {len(thread.messages)}
 
-**Context Extraction:**
-- issue_type: Classify the issue (e.g., damaged product, late delivery, wrong variant, return/refund request, defective item, missing item, billing issue, cancellation request)
-- customer_sentiment: Analyze tone - 'positive', 'neutral', or 'negative'
-- urgency_level: Assess urgency - 'low', 'medium', 'high', or 'urgent'
-  * If resolved, urgency should be 'low' or 'medium'
-  * If unresolved with urgent language, mark as 'high' or 'urgent'
-- customer_intent: What does the customer want? (refund, replacement, return, exchange, credit, tracking update, status inquiry, cancellation, explanation)
-- key_phrases: Extract 3-5 important phrases from the conversation
+"""
 
-**Resolution Status:**
-- Field value: Choose one - 'resolved', 'partially resolved', 'pending', or 'escalated'
-- Base this on the final state of the conversation
+    if crm_fields:
+        ticket_ids: str = ", ".join(crm_fields.get("ticket_ids") or []) or "none"
+        prompt += f"""Pre-extracted Details:
+- Customer Email: {crm_fields.get("customer_email") or "not found"}
+- Order Date: {crm_fields.get("order_date") or "not found"}
+- Ticket IDs: {ticket_ids}
 
-**Confidence Scores (0-100):**
-Provide confidence scores for: issue_type, customer_sentiment, urgency_level, customer_intent, resolution_status
-- 90-100: Very clear from messages
-- 70-89: Clear with minor ambiguity
-- 50-69: Somewhat clear
-- Below 50: Unclear or conflicting
+"""
 
-**Full Summary Text:**
-Create a markdown-formatted summary with these sections:
+    if is_chunk and previous_summary:
+        prompt += f"""Running Notes From Earlier Messages:
+{previous_summary}
 
-## Issue Summary
-[2-3 sentences with actual details]
+The messages below are the latest {len(messages_to_format)} of the thread. Summarize the WHOLE thread using the notes above for earlier context.
 
-## Key Details
-- **Order ID**: [value]
-- **Product**: [value]
-- **Customer Name**: [if available]
-- **Customer Email**: [if available]
-- **Order Date**: [if mentioned]
-- **Order Status**: [if mentioned]
-- **Ticket IDs**: [if any]
+"""
 
-## Resolution Status
-[Write a descriptive explanation of the current status with context]
-- If resolved: Explain what was done to resolve it and when
-- If partially resolved: Explain what's been addressed and what remains open
-- If pending: Explain what's waiting and what needs to happen next
-- If escalated: Explain why and to whom
-Include specific details like what support offered, what customer agreed to, next steps, etc.
+    prompt += f"""Email Messages:
+{messages_text}"""
 
-Keep it concise and factual. Do NOT include Timeline or Action Items sections."""
+    return prompt
 
-    return base_prompt
+
+def build_messages(
+    system_text: str, user_text: str, cache_system: bool = False
+) -> List[Dict[str, Any]]:
+    """Build the chat messages for a completion request.
+
+    Args:
+        system_text: System message text.
+        user_text: User message text.
+        cache_system: Whether to mark the system message as a cache breakpoint.
+            Providers such as Anthropic only cache explicitly marked prefixes;
+            others (OpenAI, Grok, DeepSeek) cache shared prefixes automatically.
+
+    Returns:
+        List of message dictionaries with 'role' and 'content'.
+    """
+    system_content: Any = system_text
+    if cache_system:
+        system_content = [
+            {
+                "type": "text",
+                "text": system_text,
+                "cache_control": {"type": "ephemeral"},
+            }
+        ]
+
+    return [
+        {"role": "system", "content": system_content},
+        {"role": "user", "content": user_text},
+    ]
+
+
+def _key_details_instructions(
+    thread: ThreadModel, crm_fields: Optional[Dict[str, Any]], render_locally: bool
+) -> str:
+    """Build the Key Details extraction instructions.
+
+    Args:
+        thread: Thread model with metadata.
+        crm_fields: Locally extracted key details, if any.
+        render_locally: Whether the markdown summary is rendered locally.
+
+    Returns:
+        Instruction lines for the Key Details section.
+    """
+    if not crm_fields:
+        return f"""- Order ID: {thread.order_id}
+- Product: {thread.product}
+{KEY_DETAILS_EXTRACTION}"""
+
+    ticket_ids: str = ", ".join(crm_fields.get("ticket_ids") or []) or "none"
+    return f"""These details were extracted automatically. Do NOT return them in key_details{_usage_note(render_locally)}:
+- Order ID: {crm_fields.get("order_id")}
+- Product: {crm_fields.get("product")}
+- Customer Email: {crm_fields.get("customer_email") or "not found"}
+- Order Date: {crm_fields.get("order_date") or "not found"}
+- Ticket IDs: {ticket_ids}
+{PRE_EXTRACTED_KEY_DETAILS}"""
+
+
+def _usage_note(render_locally: bool) -> str:
+    """Get the note on how pre-extracted details are used.
+
+    Args:
+        render_locally: Whether the markdown summary is rendered locally.
+
+    Returns:
+        Suffix for the "Do NOT return them in key_details" sentence.
+    """
+    return "" if render_locally else ", but use them in the Full Summary Text"
+
+
+def _summary_requirements(key_details: str, render_locally: bool) -> str:
+    """Build the extraction requirements shared by every prompt layout.
+
+    Args:
+        key_details: Instruction lines for the Key Details section.
+        render_locally: Whether the markdown summary is rendered locally.
+
+    Returns:
+        Instructions from the "Pay attention to" list to the output format.
+    """
+    output_instructions: str = (
+        RESOLUTION_DETAILS_INSTRUCTIONS if render_locally else FULL_SUMMARY_INSTRUCTIONS
+    )
+    return f"""Pay attention to:
+- The specific issue reported by the customer
+- Key details mentioned (order numbers, ticket IDs, etc.)
+- The resolution path taken
+- Any unique aspects of this particular case
+
+IMPORTANT: Do NOT include a timeline section in the summary. Users can view the timeline in the Messages tab.
+
+EXTRACTION REQUIREMENTS:
+
+**Issue Summary:**
+Provide a clear 2-3 sentence summary of what happened in this conversation. Include actual details from the messages.
+
+**Key Details:**
+{key_details}
+
+{EXTRACTION_INSTRUCTIONS}
+
+{output_instructions}"""
 
 
 def get_system_message() -> str:
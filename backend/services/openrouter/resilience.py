@@ -0,0 +1,281 @@
+"""Tail-latency hedging and circuit breaking for OpenRouter calls."""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from database.models import (
+    CircuitBreakerStatsModel,
+    HedgingStatsModel,
+    LatencyWindowStatsModel,
+)
+from services.openrouter.config import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_SECONDS,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_PERCENTILE,
+    HEDGE_REQUESTS,
+)
+from services.openrouter.routing import percentile
+
+# Number of recent call latencies kept per window for the hedge delay
+LATENCY_WINDOW: int = 500
+
+CLOSED: str = "closed"
+OPEN: str = "open"
+HALF_OPEN: str = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit breaker is open."""
+
+
+def call_kind(payload: Dict[str, Any]) -> str:
+    """Get the kind of a completion call from its request body.
+
+    Calls of different kinds (a full summary, running notes, a batch, a
+    streamed completion) have very different latencies, so each kind gets
+    its own latency window.
+
+    Args:
+        payload: Request body.
+
+    Returns:
+        The structured output schema name (or "text"), with a ":stream"
+        suffix for streamed calls.
+    """
+    response_format: Dict[str, Any] = payload.get("response_format") or {}
+    kind: str = (response_format.get("json_schema") or {}).get("name") or "text"
+    return f"{kind}:stream" if payload.get("stream") else kind
+
+
+class LatencyTracker:
+    """Track recent call latencies to decide when to hedge a request.
+
+    Latencies are kept per (model, call kind), so a slow model or a long
+    call kind does not set the hedge delay of the others.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = HEDGE_REQUESTS,
+        pct: float = HEDGE_PERCENTILE,
+        min_samples: int = HEDGE_MIN_SAMPLES,
+    ) -> None:
+        """Initialize the tracker.
+
+        Args:
+            enabled: Whether slow requests are hedged at all.
+            pct: Latency percentile after which a duplicate request is sent.
+            min_samples: Latencies required per window before hedging starts.
+        """
+        self.enabled: bool = enabled
+        self.pct: float = pct
+        self.min_samples: int = min_samples
+        self.hedged_requests: int = 0
+        self.hedge_wins: int = 0
+        self._latencies: Dict[Tuple[str, str], Deque[float]] = {}
+
+    def record(self, model: str, kind: str, latency_ms: float) -> None:
+        """Record the latency of a successful call.
+
+        Args:
+            model: Model the call was sent to.
+            kind: Call kind from call_kind.
+            latency_ms: Call latency in milliseconds.
+        """
+        window: Optional[Deque[float]] = self._latencies.get((model, kind))
+        if window is None:
+            window = self._latencies[(model, kind)] = deque(maxlen=LATENCY_WINDOW)
+        window.append(latency_ms)
+
+    def hedge_delay(self, model: str, kind: str) -> Optional[float]:
+        """Get how long to wait before sending a hedge request.
+
+        Args:
+            model: Model the call is sent to.
+            kind: Call kind from call_kind.
+
+        Returns:
+            Delay in seconds, or None when hedging is disabled or the window
+            does not have enough samples yet.
+        """
+        window: Deque[float] = self._latencies.get((model, kind), deque())
+        if not self.enabled or len(window) < self.min_samples:
+            return None
+        return percentile(sorted(window), self.pct) / 1000
+
+    def stats(self) -> HedgingStatsModel:
+        """Get hedging stats."""
+        windows: List[LatencyWindowStatsModel] = []
+        for (model, kind), latencies in sorted(self._latencies.items()):
+            delay: Optional[float] = self.hedge_delay(model, kind)
+            windows.append(
+                LatencyWindowStatsModel(
+                    model=model,
+                    call_kind=kind,
+                    samples=len(latencies),
+                    hedge_delay_ms=round(delay * 1000, 2)
+                    if delay is not None
+                    else None,
+                )
+            )
+        return HedgingStatsModel(
+            enabled=self.enabled,
+            percentile=self.pct,
+            samples=sum(window.samples for window in windows),
+            hedged_requests=self.hedged_requests,
+            hedge_wins=self.hedge_wins,
+            windows=windows,
+        )
+
+
+class CircuitBreaker:
+    """Fail fast while the upstream API is unhealthy.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls are rejected for ``reset_seconds``. The circuit then half-opens:
+    a single call is let through as a probe while other calls wait for it,
+    and its result closes the circuit on success or reopens it on failure.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_seconds: float = CIRCUIT_RESET_SECONDS,
+    ) -> None:
+        """Initialize the breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit.
+            reset_seconds: How long the circuit stays open before probing.
+        """
+        self.failure_threshold: int = failure_threshold
+        self.reset_seconds: float = reset_seconds
+        self.consecutive_failures: int = 0
+        self.opened_count: int = 0
+        self.rejected_calls: int = 0
+        self._opened_at: Optional[float] = None
+        # Token of the call currently probing a half-open circuit
+        self._probe: Optional[object] = None
+        # Set and replaced whenever the state changes, waking waiting calls
+        self._changed: asyncio.Event = asyncio.Event()
+        self._half_open_timer: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def state(self) -> str:
+        """Current breaker state: closed, open or half_open."""
+        if self._opened_at is None:
+            return CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_seconds:
+            return HALF_OPEN
+        return OPEN
+
+    def retry_after(self) -> float:
+        """Get the seconds left until the circuit half-opens."""
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self.reset_seconds - (time.monotonic() - self._opened_at))
+
+    @asynccontextmanager
+    async def guard(self) -> AsyncIterator[None]:
+        """Admit a call through the breaker.
+
+        While the circuit is half-open only one call runs as the probe and
+        the others wait for its result. A probe that ends without recording
+        a success or failure (a 4xx response, cancellation) passes the probe
+        on to the next waiting call.
+
+        Raises:
+            CircuitOpenError: If the circuit is open.
+        """
+        probe: Optional[object] = await self._admit()
+        try:
+            yield
+        finally:
+            if probe is not None and self._probe is probe:
+                self._probe = None
+                self._notify()
+
+    async def _admit(self) -> Optional[object]:
+        """Wait until a call may run.
+
+        Returns:
+            Probe token if the call is the half-open probe, else None.
+
+        Raises:
+            CircuitOpenError: If the circuit is open.
+        """
+        while True:
+            state: str = self.state
+            if state == CLOSED:
+                return None
+            if state == OPEN:
+                self.rejected_calls += 1
+                raise CircuitOpenError(
+                    f"OpenRouter circuit open, retry in {self.retry_after():.0f}s"
+                )
+            if self._probe is None:
+                self._probe = object()
+                return self._probe
+            await self._changed.wait()
+
+    def record_success(self) -> None:
+        """Record a successful call, closing the circuit."""
+        self.consecutive_failures = 0
+        if self._opened_at is not None:
+            self._opened_at = None
+            self._probe = None
+            self._cancel_timer()
+            self._notify()
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the circuit past the threshold."""
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN or (
+            self._opened_at is None
+            and self.consecutive_failures >= self.failure_threshold
+        ):
+            self._opened_at = time.monotonic()
+            self.opened_count += 1
+            self._probe = None
+            self._cancel_timer()
+            # Wake waiting calls again when the circuit half-opens
+            self._half_open_timer = asyncio.get_running_loop().call_later(
+                self.reset_seconds, self._notify
+            )
+            self._notify()
+
+    async def wait_until_available(self) -> None:
+        """Wait while the circuit is open, pausing queued work."""
+        while self.state == OPEN:
+            await self._changed.wait()
+
+    def _notify(self) -> None:
+        """Wake every call waiting for a state change."""
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def _cancel_timer(self) -> None:
+        """Cancel the pending half-open wake-up, if any."""
+        if self._half_open_timer is not None:
+            self._half_open_timer.cancel()
+            self._half_open_timer = None
+
+    def stats(self) -> CircuitBreakerStatsModel:
+        """Get breaker stats."""
+        return CircuitBreakerStatsModel(
+            state=self.state,
+            consecutive_failures=self.consecutive_failures,
+            failure_threshold=self.failure_threshold,
+            retry_after_seconds=round(self.retry_after(), 2),
+            opened_count=self.opened_count,
+            rejected_calls=self.rejected_calls,
+        )
+
+
+# Process-wide instances so every client shares latency history and health
+latency_tracker: LatencyTracker = LatencyTracker()
+circuit_breaker: CircuitBreaker = CircuitBreaker()
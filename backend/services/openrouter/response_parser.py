@@ -2,6 +2,8 @@
 
 import json
 import logging
+import re
+from typing import Any, Dict, Optional
 
 from pydantic import ValidationError
 
@@ -11,13 +13,21 @@ from database.models import (
     SummaryContentModel,
     ThreadModel,
 )
+from services.openrouter.crm_extractor import merge_crm_fields
+from services.openrouter.summary_renderer import render_full_summary_text
 from services.openrouter.text_processor import remove_timeline_section
 
 logger = logging.getLogger(__name__)
 
+# Escape sequence cut off at the end of a streamed JSON string
+PARTIAL_ESCAPE_PATTERN = re.compile(r"\\(u[0-9a-fA-F]{0,3})?$")
+
 
 def parse_summary_response(
-    response_text: str, thread: ThreadModel
+    response_text: str,
+    thread: ThreadModel,
+    crm_fields: Optional[Dict[str, Any]] = None,
+    render_locally: bool = False,
 ) -> SummaryContentModel:
     """Parse API response into SummaryContentModel.
 
@@ -27,6 +37,10 @@ def parse_summary_response(
     Args:
         response_text: Raw response text from API (should be valid JSON).
         thread: Original thread model (used for fallback only).
+        crm_fields: Locally extracted key details, merged into the response when
+            the reduced schema left them out of the LLM request.
+        render_locally: Whether full_summary_text is rendered from the structured
+            fields instead of being taken from the response.
 
     Returns:
         Parsed and validated SummaryContentModel.
@@ -36,32 +50,69 @@ def parse_summary_response(
         data: dict = json.loads(response_text.strip())
 
         # Direct Pydantic validation - schema enforcement means this should always work
-        summary = SummaryContentModel(**data)
-
-        # Post-processing: Remove timeline sections if they somehow got included
-        summary.full_summary_text = remove_timeline_section(summary.full_summary_text)
-
-        return summary
+        return build_summary(data, crm_fields, render_locally)
 
     except json.JSONDecodeError as e:
         # This should never happen with structured output enabled
         logger.error(f"JSON decode error (should not occur with structured output): {e}")
         logger.error(f"Response text: {response_text[:500]}")
-        return _create_fallback_summary(response_text, thread)
+        return _create_fallback_summary(response_text, thread, crm_fields)
 
     except ValidationError as e:
         # This should never happen if JSON schema is correct
         logger.error(f"Pydantic validation error (schema mismatch): {e}")
         logger.error(f"Response data: {response_text[:500]}")
-        return _create_fallback_summary(response_text, thread)
+        return _create_fallback_summary(response_text, thread, crm_fields)
 
     except Exception as e:
         # Catch-all for unexpected errors
         logger.error(f"Unexpected error parsing response: {e}")
-        return _create_fallback_summary(response_text, thread)
+        return _create_fallback_summary(response_text, thread, crm_fields)
+
+
+def build_summary(
+    data: Dict[str, Any],
+    crm_fields: Optional[Dict[str, Any]] = None,
+    render_locally: bool = False,
+) -> SummaryContentModel:
+    """Validate decoded response data into a SummaryContentModel.
+
+    Unlike parse_summary_response this does not fall back, so callers can
+    detect entries that do not match the schema.
+
+    Args:
+        data: Decoded JSON object for one summary.
+        crm_fields: Locally extracted key details to merge in, if any.
+        render_locally: Whether full_summary_text is rendered locally.
+
+    Returns:
+        Validated SummaryContentModel.
+
+    Raises:
+        ValidationError: If the data does not match the summary schema.
+    """
+    if crm_fields:
+        data = merge_crm_fields(data, crm_fields)
+
+    if render_locally:
+        data["full_summary_text"] = ""
 
+    summary = SummaryContentModel(**data)
 
-def _create_fallback_summary(response_text: str, thread: ThreadModel) -> SummaryContentModel:
+    if render_locally:
+        summary.full_summary_text = render_full_summary_text(summary)
+    else:
+        # Post-processing: Remove timeline sections if they somehow got included
+        summary.full_summary_text = remove_timeline_section(summary.full_summary_text)
+
+    return summary
+
+
+def _create_fallback_summary(
+    response_text: str,
+    thread: ThreadModel,
+    crm_fields: Optional[Dict[str, Any]] = None,
+) -> SummaryContentModel:
     """Create a basic fallback summary when parsing fails.
 
     This should rarely be used with structured output enabled.
@@ -69,6 +120,7 @@ def _create_fallback_summary(response_text: str, thread: ThreadModel) -> Summary
     Args:
         response_text: Raw response text.
         thread: Original thread model.
+        crm_fields: Locally extracted key details, if any.
 
     Returns:
         Basic SummaryContentModel with fallback values.
@@ -80,8 +132,7 @@ def _create_fallback_summary(response_text: str, thread: ThreadModel) -> Summary
     return SummaryContentModel(
         issue_summary=cleaned_response[:500] if len(cleaned_response) > 500 else cleaned_response,
         key_details=CRMContextModel(
-            order_id=thread.order_id,
-            product=thread.product,
+            **(crm_fields or {"order_id": thread.order_id, "product": thread.product})
         ),
         context_extraction=ExtractedContextModel(
             issue_type=thread.topic,
@@ -92,3 +143,36 @@ def _create_fallback_summary(response_text: str, thread: ThreadModel) -> Summary
         resolution_status="pending",
         full_summary_text=cleaned_response,
     )
+
+
+def extract_partial_string(response_text: str, key: str) -> Optional[str]:
+    """Extract a string value from a possibly incomplete JSON object.
+
+    Used while a structured response is streaming in, to surface the value of
+    one field before the whole object has arrived.
+
+    Args:
+        response_text: JSON text received so far.
+        key: Top-level key whose string value to extract.
+
+    Returns:
+        The (possibly partial) decoded value, or None if the value has not
+        started yet.
+    """
+    match = re.search(rf'"{re.escape(key)}"\s*:\s*"', response_text)
+    if not match:
+        return None
+
+    # Scan to the closing quote, skipping escaped characters
+    start: int = match.end()
+    end: int = start
+    while end < len(response_text) and response_text[end] != '"':
+        end += 2 if response_text[end] == "\\" else 1
+    raw: str = response_text[start:min(end, len(response_text))]
+
+    # Drop an escape sequence cut off by the end of the stream
+    raw = PARTIAL_ESCAPE_PATTERN.sub("", raw) if end >= len(response_text) else raw
+    try:
+        return json.loads(f'"{raw}"')
+    except json.JSONDecodeError:
+        return None
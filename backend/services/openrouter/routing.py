@@ -0,0 +1,206 @@
+"""Size-based model routing with per-tier concurrency limits and stats."""
+
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, List, Optional
+
+from database.models import ThreadModel, TierStatsModel, UsageModel
+from services.openrouter.config import (
+    MODEL_ROUTING,
+    OPENROUTER_MODEL,
+    OPENROUTER_SMALL_MODEL,
+    ROUTING_DEFAULT_CONCURRENCY,
+    ROUTING_ESCALATION_TOPICS,
+    ROUTING_SMALL_CONCURRENCY,
+    ROUTING_SMALL_MAX_MESSAGES,
+    ROUTING_SMALL_MAX_TOKENS,
+)
+from services.openrouter.text_processor import estimate_tokens
+
+SMALL_TIER: str = "small"
+DEFAULT_TIER: str = "default"
+
+# Number of recent per-thread latencies kept for percentiles
+LATENCY_WINDOW: int = 1000
+
+
+class ModelRouter:
+    """Pick a model tier per thread and track per-tier usage.
+
+    Short threads on routine topics go to the small tier; long threads,
+    sensitive topics and small-tier validation failures go to the default
+    tier. Stats are recorded even when routing is disabled, in which case
+    every thread is counted under the default tier.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = MODEL_ROUTING,
+        small_model: str = OPENROUTER_SMALL_MODEL,
+        default_model: str = OPENROUTER_MODEL,
+        concurrency: Optional[Dict[str, int]] = None,
+    ) -> None:
+        """Initialize the router.
+
+        Args:
+            enabled: Whether threads are routed to the small tier at all.
+            small_model: Model used by the small tier.
+            default_model: Model used by the default tier.
+            concurrency: Max concurrent summarizations per tier. Limits only
+                apply when routing is enabled.
+        """
+        self.enabled: bool = enabled
+        self.models: Dict[str, str] = {
+            SMALL_TIER: small_model,
+            DEFAULT_TIER: default_model,
+        }
+        self.concurrency: Dict[str, int] = concurrency or {
+            SMALL_TIER: ROUTING_SMALL_CONCURRENCY,
+            DEFAULT_TIER: ROUTING_DEFAULT_CONCURRENCY,
+        }
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._in_flight: Dict[str, int] = {tier: 0 for tier in self.models}
+        self._totals: Dict[str, Dict[str, int]] = {
+            tier: {
+                "threads": 0,
+                "fallbacks": 0,
+                "api_calls": 0,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "total_tokens": 0,
+            }
+            for tier in self.models
+        }
+        self._latencies: Dict[str, Deque[float]] = {
+            tier: deque(maxlen=LATENCY_WINDOW) for tier in self.models
+        }
+
+    def select_tier(self, thread: ThreadModel) -> str:
+        """Choose the tier for a thread from its size and topic.
+
+        Args:
+            thread: Thread to route.
+
+        Returns:
+            Tier name.
+        """
+        if not self.enabled:
+            return DEFAULT_TIER
+
+        if len(thread.messages) > ROUTING_SMALL_MAX_MESSAGES:
+            return DEFAULT_TIER
+
+        tokens: int = sum(estimate_tokens(msg.body) for msg in thread.messages)
+        if tokens > ROUTING_SMALL_MAX_TOKENS:
+            return DEFAULT_TIER
+
+        topic: str = thread.topic.lower()
+        if any(keyword in topic for keyword in ROUTING_ESCALATION_TOPICS):
+            return DEFAULT_TIER
+
+        return SMALL_TIER
+
+    def model_for(self, tier: str) -> str:
+        """Get the model a tier routes to."""
+        return self.models[tier]
+
+    @asynccontextmanager
+    async def slot(self, tier: str) -> AsyncIterator[None]:
+        """Hold one of the tier's concurrency slots.
+
+        Args:
+            tier: Tier name.
+        """
+        semaphore: Optional[asyncio.Semaphore] = None
+        if self.enabled:
+            # Created lazily so the semaphore binds to the running event loop
+            semaphore = self._semaphores.get(tier)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self.concurrency[tier])
+                self._semaphores[tier] = semaphore
+            await semaphore.acquire()
+
+        self._in_flight[tier] += 1
+        try:
+            yield
+        finally:
+            self._in_flight[tier] -= 1
+            if semaphore is not None:
+                semaphore.release()
+
+    def record(self, tier: str, usage: UsageModel) -> None:
+        """Record the usage of one summarized thread.
+
+        Args:
+            tier: Tier that produced the summary.
+            usage: Usage of the thread's API calls.
+        """
+        totals: Dict[str, int] = self._totals[tier]
+        totals["threads"] += 1
+        totals["api_calls"] += usage.api_calls
+        totals["prompt_tokens"] += usage.prompt_tokens
+        totals["completion_tokens"] += usage.completion_tokens
+        totals["total_tokens"] += usage.total_tokens
+        self._latencies[tier].append(usage.latency_ms)
+
+    def record_fallback(self, tier: str, usage: UsageModel) -> None:
+        """Record a thread escalated out of a tier after a validation failure.
+
+        Args:
+            tier: Tier whose response failed validation.
+            usage: Usage spent on the failed attempt.
+        """
+        totals: Dict[str, int] = self._totals[tier]
+        totals["fallbacks"] += 1
+        totals["api_calls"] += usage.api_calls
+        totals["prompt_tokens"] += usage.prompt_tokens
+        totals["completion_tokens"] += usage.completion_tokens
+        totals["total_tokens"] += usage.total_tokens
+
+    def stats(self) -> List[TierStatsModel]:
+        """Get per-tier stats.
+
+        Returns:
+            List of TierStatsModel, one per tier.
+        """
+        stats: List[TierStatsModel] = []
+        for tier, model in self.models.items():
+            latencies: List[float] = sorted(self._latencies[tier])
+            stats.append(
+                TierStatsModel(
+                    tier=tier,
+                    model=model,
+                    max_concurrency=self.concurrency[tier] if self.enabled else None,
+                    in_flight=self._in_flight[tier],
+                    avg_latency_ms=(
+                        round(sum(latencies) / len(latencies), 2) if latencies else 0.0
+                    ),
+                    p50_latency_ms=percentile(latencies, 50),
+                    p95_latency_ms=percentile(latencies, 95),
+                    **self._totals[tier],
+                )
+            )
+        return stats
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Get a nearest-rank percentile of already sorted values.
+
+    Args:
+        sorted_values: Values in ascending order.
+        pct: Percentile between 0 and 100.
+
+    Returns:
+        Percentile value, or 0.0 when there are no values.
+    """
+    if not sorted_values:
+        return 0.0
+    rank: int = max(
+        0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1)
+    )
+    return round(sorted_values[rank], 2)
+
+
+# Process-wide router so tier limits and stats span every service instance
+model_router: ModelRouter = ModelRouter()
@@ -1,6 +1,6 @@
 """JSON Schema generation utilities for structured output with OpenRouter."""
 
-from typing import Any, Dict, Type
+from typing import Any, Dict, Iterable, List, Type
 
 from pydantic import BaseModel
 
@@ -9,6 +9,7 @@ def generate_json_schema_response_format(
     model_class: Type[BaseModel],
     schema_name: str,
     strict: bool = True,
+    exclude: Iterable[str] = (),
 ) -> Dict[str, Any]:
     """Generate OpenRouter-compatible JSON schema response format from Pydantic model.
 
@@ -16,6 +17,8 @@ def generate_json_schema_response_format(
         model_class: Pydantic model class to generate schema from.
         schema_name: Name for the schema (used by OpenRouter for identification).
         strict: Whether to enforce strict schema adherence (recommended: True).
+        exclude: Dotted field paths to leave out of the schema
+            (e.g. "key_details.order_id") because they are filled in locally.
 
     Returns:
         Response format dictionary compatible with OpenRouter API.
@@ -27,6 +30,9 @@ def generate_json_schema_response_format(
     # OpenRouter expects a clean schema without reference definitions
     schema = _flatten_schema(json_schema)
 
+    for field_path in exclude:
+        _exclude_field(schema, field_path.split("."))
+
     # Construct OpenRouter response format
     response_format = {
         "type": "json_schema",
@@ -40,6 +46,51 @@ def generate_json_schema_response_format(
     return response_format
 
 
+def generate_batch_json_schema_response_format(
+    model_class: Type[BaseModel],
+    schema_name: str,
+    strict: bool = True,
+    exclude: Iterable[str] = (),
+    items_key: str = "summaries",
+) -> Dict[str, Any]:
+    """Generate a response format for an array of per-thread results.
+
+    Each array item is the model's schema plus a required ``thread_id`` so
+    results of a batched request can be split back per thread.
+
+    Args:
+        model_class: Pydantic model class of a single result.
+        schema_name: Name for the schema.
+        strict: Whether to enforce strict schema adherence.
+        exclude: Dotted field paths to leave out of each item.
+        items_key: Name of the array property.
+
+    Returns:
+        Response format dictionary compatible with OpenRouter API.
+    """
+    item_schema: Dict[str, Any] = generate_json_schema_response_format(
+        model_class, schema_name, strict, exclude
+    )["json_schema"]["schema"]
+    item_schema["properties"] = {
+        "thread_id": {"type": "string", "description": "Thread ID of this entry"},
+        **item_schema.get("properties", {}),
+    }
+    item_schema["required"] = ["thread_id", *item_schema.get("required", [])]
+
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": schema_name,
+            "strict": strict,
+            "schema": {
+                "type": "object",
+                "properties": {items_key: {"type": "array", "items": item_schema}},
+                "required": [items_key],
+            },
+        },
+    }
+
+
 def _flatten_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
     """Flatten JSON schema by resolving $ref references.
 
@@ -58,6 +109,27 @@ def _flatten_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
     return schema
 
 
+def _exclude_field(schema: Dict[str, Any], path: List[str]) -> None:
+    """Remove a (nested) property from a flattened schema in place.
+
+    Args:
+        schema: Flattened object schema.
+        path: Property path split on dots.
+    """
+    properties: Dict[str, Any] = schema.get("properties", {})
+    name: str = path[0]
+    if name not in properties:
+        return
+
+    if len(path) > 1:
+        _exclude_field(properties[name], path[1:])
+        return
+
+    del properties[name]
+    if name in schema.get("required", []):
+        schema["required"] = [field for field in schema["required"] if field != name]
+
+
 def _resolve_refs(obj: Any, defs: Dict[str, Any]) -> Any:
     """Recursively resolve $ref references in schema.
 
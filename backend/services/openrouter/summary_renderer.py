@@ -0,0 +1,84 @@
+"""Local rendering of the markdown summary from structured fields."""
+
+from typing import List, Optional, Tuple
+
+from database.models import SummaryContentModel
+
+
+def render_full_summary_text(summary: SummaryContentModel) -> str:
+    """Render the markdown summary shown to reviewers.
+
+    The layout matches the sections the model used to generate itself
+    (Issue Summary, Key Details, Resolution Status), so the model only has to
+    produce the short narrative fields.
+
+    Args:
+        summary: Structured summary content.
+
+    Returns:
+        Markdown-formatted summary text.
+    """
+    details = summary.key_details
+    detail_rows: List[Tuple[str, Optional[str]]] = [
+        ("Order ID", details.order_id),
+        ("Product", details.product),
+        ("Customer Name", details.customer_name),
+        ("Customer Email", details.customer_email),
+        ("Order Date", details.order_date),
+        ("Order Status", details.order_status),
+        ("Ticket IDs", ", ".join(details.ticket_ids)),
+    ]
+    key_details: str = "\n".join(
+        f"- **{label}**: {value}" for label, value in detail_rows if value
+    )
+
+    resolution: str = f"**{summary.resolution_status.strip().capitalize()}**"
+    if summary.resolution_details:
+        resolution += f" - {summary.resolution_details.strip()}"
+
+    return (
+        f"## Issue Summary\n{summary.issue_summary.strip()}\n\n"
+        f"## Key Details\n{key_details}\n\n"
+        f"## Resolution Status\n{resolution}"
+    )
+
+
+def render_rolling_state(summary: SummaryContentModel) -> str:
+    """Render the compact notes an incremental update starts from.
+
+    The notes stand in for the messages already summarized, so they keep
+    every fact the next summary may need to repeat.
+
+    Args:
+        summary: Structured summary content.
+
+    Returns:
+        Plain-text notes on the thread so far.
+    """
+    details = summary.key_details
+    context = summary.context_extraction
+    detail_rows: List[Tuple[str, Optional[str]]] = [
+        ("Order ID", details.order_id),
+        ("Product", details.product),
+        ("Customer Name", details.customer_name),
+        ("Customer Email", details.customer_email),
+        ("Order Date", details.order_date),
+        ("Order Status", details.order_status),
+        ("Ticket IDs", ", ".join(details.ticket_ids)),
+    ]
+    lines: List[str] = [
+        f"Issue: {summary.issue_summary.strip()}",
+        f"Issue type: {context.issue_type}; customer intent: {context.customer_intent}; "
+        f"sentiment: {context.customer_sentiment}; urgency: {context.urgency_level}",
+        "Details: "
+        + "; ".join(f"{label}: {value}" for label, value in detail_rows if value),
+        f"Status: {summary.resolution_status.strip()}"
+        + (
+            f" - {summary.resolution_details.strip()}"
+            if summary.resolution_details
+            else ""
+        ),
+    ]
+    if context.key_phrases:
+        lines.append(f"Key phrases: {', '.join(context.key_phrases)}")
+    return "\n".join(lines)
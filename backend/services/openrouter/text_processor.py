@@ -43,3 +43,17 @@ def remove_timeline_section(text: str) -> str:
         filtered_lines.append(line)
 
     return '\n'.join(filtered_lines).strip()
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of text without a tokenizer.
+
+    Uses the common heuristic of roughly four characters per token.
+
+    Args:
+        text: Text to measure.
+
+    Returns:
+        Estimated number of tokens.
+    """
+    return (len(text) + 3) // 4
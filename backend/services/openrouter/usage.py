@@ -0,0 +1,56 @@
+"""Token usage and latency accounting for OpenRouter API calls."""
+
+from typing import Any, Dict
+
+from database.models import UsageModel
+
+
+def usage_from_response(
+    data: Dict[str, Any], latency_ms: float, model: str
+) -> UsageModel:
+    """Build usage for a single completion from the raw API response.
+
+    Args:
+        data: Decoded JSON response from the completions endpoint.
+        latency_ms: Wall-clock latency of the call in milliseconds.
+        model: Model requested for the call.
+
+    Returns:
+        UsageModel describing one API call.
+    """
+    usage: Dict[str, Any] = data.get("usage") or {}
+    prompt_tokens: int = int(usage.get("prompt_tokens") or 0)
+    completion_tokens: int = int(usage.get("completion_tokens") or 0)
+    # OpenAI-compatible providers report prompt cache hits in prompt_tokens_details
+    prompt_details: Dict[str, Any] = usage.get("prompt_tokens_details") or {}
+
+    return UsageModel(
+        # OpenRouter reports the model that actually served the request
+        model=data.get("model") or model,
+        prompt_tokens=prompt_tokens,
+        cached_tokens=int(prompt_details.get("cached_tokens") or 0),
+        completion_tokens=completion_tokens,
+        total_tokens=int(
+            usage.get("total_tokens") or prompt_tokens + completion_tokens
+        ),
+        api_calls=1,
+        latency_ms=round(latency_ms, 2),
+    )
+
+
+def accumulate_usage(total: UsageModel, call: UsageModel) -> None:
+    """Add the token counts of one API call to a running total.
+
+    Latency is not summed here; callers measure wall-clock time around the
+    whole operation instead.
+
+    Args:
+        total: Running usage total, updated in place.
+        call: Usage of a single API call.
+    """
+    total.prompt_tokens += call.prompt_tokens
+    total.cached_tokens += call.cached_tokens
+    total.completion_tokens += call.completion_tokens
+    total.total_tokens += call.total_tokens
+    total.api_calls += call.api_calls
+    total.model = call.model or total.model
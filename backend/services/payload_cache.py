@@ -0,0 +1,144 @@
+"""Size-bounded LRU cache of rendered JSON payloads."""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+from database.models import CacheStatsModel
+
+
+class PayloadCache:
+    """Least recently used cache of serialized payloads, bounded by total size.
+
+    Each entry stores the version it was rendered from. A lookup with a
+    different version is a miss, so rows that changed since they were
+    rendered are never served stale even if an invalidation was missed.
+
+    Safe to use from the event loop and from threadpool workers (streamed
+    response bodies) at once.
+    """
+
+    def __init__(self, name: str, max_bytes: int) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            name: Cache name reported in stats.
+            max_bytes: Upper bound on the summed size of cached payloads.
+                0 disables caching.
+        """
+        self.name: str = name
+        self.max_bytes: int = max(0, max_bytes)
+        self._entries: "OrderedDict[Hashable, Tuple[Any, bytes]]" = OrderedDict()
+        self._bytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.invalidations: int = 0
+        self._lock: threading.Lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of cached payloads."""
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        """Summed size of cached payloads."""
+        return self._bytes
+
+    def get(self, key: Hashable, version: Any) -> Optional[bytes]:
+        """Get a cached payload.
+
+        Args:
+            key: Entry key.
+            version: Version the payload must have been rendered from.
+
+        Returns:
+            Payload bytes, or None on a miss.
+        """
+        with self._lock:
+            entry: Optional[Tuple[Any, bytes]] = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def get_current(self, key: Hashable) -> Optional[bytes]:
+        """Get a cached payload whatever version it was rendered from.
+
+        Only for caches whose writers call invalidate(), so lookups need not
+        read the source to learn its version.
+
+        Args:
+            key: Entry key.
+
+        Returns:
+            Payload bytes, or None on a miss.
+        """
+        with self._lock:
+            entry: Optional[Tuple[Any, bytes]] = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, version: Any, payload: bytes) -> None:
+        """Cache a payload, evicting least recently used entries as needed.
+
+        Args:
+            key: Entry key.
+            version: Version the payload was rendered from.
+            payload: Serialized payload.
+        """
+        with self._lock:
+            self._discard(key)
+            if len(payload) > self.max_bytes:
+                return
+            self._entries[key] = (version, payload)
+            self._bytes += len(payload)
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop an entry if present.
+
+        Args:
+            key: Entry key.
+        """
+        with self._lock:
+            if self._discard(key):
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> CacheStatsModel:
+        """Get cache stats."""
+        lookups: int = self.hits + self.misses
+        return CacheStatsModel(
+            name=self.name,
+            entries=len(self._entries),
+            size_bytes=self._bytes,
+            max_bytes=self.max_bytes,
+            hits=self.hits,
+            misses=self.misses,
+            hit_rate=round(self.hits / lookups, 4) if lookups else 0.0,
+            evictions=self.evictions,
+            invalidations=self.invalidations,
+        )
+
+    def _discard(self, key: Hashable) -> bool:
+        """Drop an entry if present; the caller holds the lock."""
+        entry: Optional[Tuple[Any, bytes]] = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._bytes -= len(entry[1])
+        return True
@@ -0,0 +1,167 @@
+"""Reviewer work queue over pending summaries.
+
+A claim is a lease on a pending summary. Other reviewers do not get the
+summary until the lease expires; after that it is claimable again, so
+abandoned claims need no cleanup job. Claiming is a single UPDATE whose
+subquery picks the next summary from ix_summaries_review_queue. SQLite
+runs it under the writer lock, so two reviewers never claim the same
+summary.
+"""
+
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session
+
+from database import Summary, Thread
+from database.models import SummaryStatus
+
+# Seconds a claim lasts unless renewed
+REVIEW_LEASE_SECONDS: int = int(os.getenv("REVIEW_LEASE_SECONDS", "600"))
+
+
+def _lease_expiry(now: datetime) -> datetime:
+    """Get the expiry of a lease taken or renewed at now."""
+    return now + timedelta(seconds=REVIEW_LEASE_SECONDS)
+
+
+def held_by_another_reviewer(summary_db: Summary, reviewer: Optional[str]) -> bool:
+    """Check whether someone other than reviewer holds a live lease.
+
+    Args:
+        summary_db: Summary row.
+        reviewer: Reviewer acting on the summary, or None if anonymous.
+
+    Returns:
+        True if the summary is leased to another reviewer and the lease has
+        not expired.
+    """
+    return (
+        summary_db.claimed_by is not None
+        and summary_db.claimed_by != reviewer
+        and summary_db.lease_expires_at is not None
+        and summary_db.lease_expires_at >= datetime.utcnow()
+    )
+
+
+def lease_allows(reviewer: Optional[str], now: datetime):
+    """SQL criterion for summaries nobody else holds a live lease on.
+
+    Args:
+        reviewer: Reviewer acting on the summaries, or None if anonymous.
+        now: Current time.
+
+    Returns:
+        Criterion matching unclaimed summaries, expired leases and leases
+        held by reviewer.
+    """
+    return or_(
+        Summary.claimed_by.is_(None),
+        Summary.lease_expires_at < now,
+        Summary.claimed_by == reviewer,
+    )
+
+
+def claim_next(
+    db: Session, reviewer: str, file_db_id: Optional[int] = None
+) -> Optional[Summary]:
+    """Claim the most urgent pending summary that nobody holds a lease on.
+
+    Ties are broken by age (oldest first). The claim does not touch
+    updated_at, which tracks changes to the summary itself.
+
+    Args:
+        db: Database session.
+        reviewer: Reviewer taking the lease.
+        file_db_id: Internal ID of the file to claim from, or None for any.
+
+    Returns:
+        Claimed summary row, or None when nothing is claimable.
+    """
+    now: datetime = datetime.utcnow()
+    candidate = (
+        select(Summary.id)
+        .where(
+            Summary.status == SummaryStatus.PENDING,
+            or_(Summary.lease_expires_at.is_(None), Summary.lease_expires_at < now),
+        )
+        .order_by(Summary.review_priority.desc(), Summary.id)
+        .limit(1)
+    )
+    if file_db_id is not None:
+        candidate = candidate.where(
+            Summary.thread_id.in_(select(Thread.id).where(Thread.file_id == file_db_id))
+        )
+
+    claimed_id: Optional[int] = db.execute(
+        update(Summary)
+        .where(Summary.id == candidate.scalar_subquery())
+        .values(
+            claimed_by=reviewer,
+            lease_expires_at=_lease_expiry(now),
+            updated_at=Summary.updated_at,
+        )
+        .returning(Summary.id)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+    db.commit()
+
+    if claimed_id is None:
+        return None
+    return db.get(Summary, claimed_id)
+
+
+def renew_lease(db: Session, summary_id: str, reviewer: str) -> Optional[Summary]:
+    """Extend a reviewer's unexpired lease on a pending summary.
+
+    Args:
+        db: Database session.
+        summary_id: Summary identifier.
+        reviewer: Reviewer holding the lease.
+
+    Returns:
+        Summary row with the new expiry, or None if the reviewer holds no
+        live lease on it.
+    """
+    now: datetime = datetime.utcnow()
+    renewed_id: Optional[int] = db.execute(
+        update(Summary)
+        .where(
+            Summary.summary_id == summary_id,
+            Summary.status == SummaryStatus.PENDING,
+            Summary.claimed_by == reviewer,
+            Summary.lease_expires_at >= now,
+        )
+        .values(lease_expires_at=_lease_expiry(now), updated_at=Summary.updated_at)
+        .returning(Summary.id)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+    db.commit()
+
+    if renewed_id is None:
+        return None
+    return db.get(Summary, renewed_id)
+
+
+def release_lease(db: Session, summary_id: str, reviewer: str) -> bool:
+    """Give a claimed summary back to the queue.
+
+    Args:
+        db: Database session.
+        summary_id: Summary identifier.
+        reviewer: Reviewer holding the lease.
+
+    Returns:
+        True if the reviewer held the claim and it was released.
+    """
+    released: Optional[int] = db.execute(
+        update(Summary)
+        .where(Summary.summary_id == summary_id, Summary.claimed_by == reviewer)
+        .values(claimed_by=None, lease_expires_at=None, updated_at=Summary.updated_at)
+        .returning(Summary.id)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+    db.commit()
+    return released is not None
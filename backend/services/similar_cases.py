@@ -0,0 +1,520 @@
+"""Hashed TF-IDF index of approved summaries for "similar past cases" lookups.
+
+Summaries are turned into hashed term features (words of the narrative
+fields, key phrases, issue type and intent). Documents use log term
+frequencies with cosine normalization and queries add IDF weights (the
+lnc.ltc scheme), so stored vectors do not depend on corpus statistics and
+approvals only append to the index.
+
+The index is kept in NumPy arrays: a compressed sparse column segment of the
+features of most documents and a small uncompressed tail of recently added
+ones, merged into the segment once it grows. On the event loop the merge
+runs in a worker thread, so an approval never waits for it. A lookup only
+reads the postings of the query's features and scores every document with
+one ``bincount``.
+"""
+
+import asyncio
+import json
+import math
+import re
+import zlib
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from database import SessionLocal, Summary
+from database.models import SummaryContentModel, SummaryStatus
+
+# Hashed feature space; collisions between rare terms barely move scores
+N_FEATURES: int = 1 << 20
+# Recently added documents kept uncompressed before a merge
+TAIL_MERGE_MIN_ROWS: int = 2000
+TAIL_MERGE_RATIO: float = 0.1
+
+_TOKEN_PATTERN = re.compile(r"[a-z]{3,}")
+_STOPWORDS = frozenset(
+    "the and for with that this was were has have had not but are from you your "
+    "our they their them his her she him its will would could should been being "
+    "into about after before than then there here when what which who whom also "
+    "any all can did does per via customer support order".split()
+)
+
+
+def _feature(term: str) -> int:
+    """Hash a term into the feature space."""
+    return zlib.crc32(term.encode("utf-8")) % N_FEATURES
+
+
+def summary_features(
+    structured_data: Optional[SummaryContentModel], summary_text: Optional[str]
+) -> Dict[int, float]:
+    """Get the log-scaled term frequencies of a summary.
+
+    Args:
+        structured_data: Structured summary content, if available.
+        summary_text: Reviewer-edited or original summary text.
+
+    Returns:
+        Mapping of feature to 1 + log(term frequency).
+    """
+    texts: List[str] = [summary_text or ""]
+    terms: List[str] = []
+    if structured_data is not None:
+        context = structured_data.context_extraction
+        texts += [
+            structured_data.issue_summary,
+            structured_data.resolution_details or "",
+            context.issue_type,
+            context.customer_intent,
+        ]
+        # Whole labels and phrases match more precisely than their words
+        terms += [
+            f"type:{context.issue_type.strip().lower()}",
+            f"intent:{context.customer_intent.strip().lower()}",
+        ]
+        for phrase in context.key_phrases:
+            terms.append(f"phrase:{' '.join(_TOKEN_PATTERN.findall(phrase.lower()))}")
+            texts.append(phrase)
+
+    for text in texts:
+        terms += [
+            token
+            for token in _TOKEN_PATTERN.findall(text.lower())
+            if token not in _STOPWORDS
+        ]
+
+    counts: Dict[int, int] = {}
+    for term in terms:
+        feature: int = _feature(term)
+        counts[feature] = counts.get(feature, 0) + 1
+    return {feature: 1 + math.log(count) for feature, count in counts.items()}
+
+
+def features_from_row(summary_db: Summary) -> Dict[int, float]:
+    """Get the features of a summary row.
+
+    Args:
+        summary_db: Summary row.
+
+    Returns:
+        Mapping of feature to log-scaled term frequency.
+    """
+    structured_data: Optional[SummaryContentModel] = None
+    if summary_db.structured_data_json:
+        try:
+            structured_data = SummaryContentModel(
+                **json.loads(summary_db.structured_data_json)
+            )
+        except (json.JSONDecodeError, ValueError):
+            pass
+    return summary_features(
+        structured_data, summary_db.edited_summary or summary_db.original_summary
+    )
+
+
+class SimilarCasesIndex:
+    """Incrementally updated cosine similarity index over approved summaries.
+
+    Rows are addressed by the summary's database ID. Removed rows are masked
+    out and dropped at the next merge; their document frequencies are
+    subtracted right away, so IDF weights always describe the indexed
+    summaries.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty, not yet loaded index."""
+        self.loaded: bool = False
+        self._load_lock: asyncio.Lock = asyncio.Lock()
+        # Changes made while a build runs, replayed onto the built index
+        self._pending: Optional[List[Tuple[int, Optional[Dict[int, float]]]]] = None
+        # Merge running in a worker thread, if any
+        self._merge_task: Optional[asyncio.Task] = None
+        self._reset()
+
+    def _reset(self) -> None:
+        """Empty the index."""
+        self._row_of: Dict[int, int] = {}
+        self._ids: List[int] = []
+        # Grown by doubling; only the first len(_ids) entries are rows
+        self._active: np.ndarray = np.zeros(1024, dtype=bool)
+        self._df: np.ndarray = np.zeros(N_FEATURES, dtype=np.int32)
+        # Compressed segment: postings of feature f are rows/vals[indptr[f]:indptr[f+1]]
+        self._indptr: np.ndarray = np.zeros(N_FEATURES + 1, dtype=np.int64)
+        self._seg_rows: np.ndarray = np.zeros(0, dtype=np.int32)
+        self._seg_vals: np.ndarray = np.zeros(0, dtype=np.float32)
+        # Features of segment row r are row_cols[row_indptr[r]:row_indptr[r+1]]
+        self._row_indptr: np.ndarray = np.zeros(1, dtype=np.int64)
+        self._row_cols: np.ndarray = np.zeros(0, dtype=np.int32)
+        # Tail of recently added (row, feature, weight) triples
+        self._tail: List[Tuple[int, np.ndarray, np.ndarray]] = []
+        self._tail_arrays: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+    def __len__(self) -> int:
+        """Number of indexed summaries."""
+        return len(self._row_of)
+
+    def load(self, db: Session) -> None:
+        """Build the index from every approved summary in the database.
+
+        Args:
+            db: Database session.
+        """
+        self._reset()
+        for summary_db in db.query(Summary).filter(
+            Summary.status == SummaryStatus.APPROVED
+        ):
+            self._append(summary_db.id, features_from_row(summary_db))
+        self._merge()
+        self.loaded = True
+
+    async def ensure_loaded(
+        self, session_factory: Callable[[], Session] = SessionLocal
+    ) -> "SimilarCasesIndex":
+        """Build the index on first use without blocking the event loop.
+
+        The build runs in a worker thread into a separate index, so lookups
+        and updates on the event loop never see it half-built. Concurrent
+        callers wait for the same build, and additions and removals made
+        while it runs are replayed onto the result.
+
+        Args:
+            session_factory: Creates the database session used by the build.
+
+        Returns:
+            The loaded index.
+        """
+        if self.loaded:
+            return self
+        async with self._load_lock:
+            if self.loaded:
+                return self
+            self._pending = []
+            try:
+                built: SimilarCasesIndex = await asyncio.to_thread(
+                    _build_index, session_factory
+                )
+                pending = self._pending
+                self._pending = None
+                self._adopt(built)
+                for summary_db_id, features in pending:
+                    if features is None:
+                        self.remove(summary_db_id)
+                    else:
+                        self.add(summary_db_id, features)
+            finally:
+                self._pending = None
+        return self
+
+    def _adopt(self, built: "SimilarCasesIndex") -> None:
+        """Take over the contents of an index built elsewhere."""
+        self._row_of, self._ids, self._active = built._row_of, built._ids, built._active
+        self._df, self._indptr = built._df, built._indptr
+        self._seg_rows, self._seg_vals = built._seg_rows, built._seg_vals
+        self._row_indptr, self._row_cols = built._row_indptr, built._row_cols
+        self._tail, self._tail_arrays = built._tail, built._tail_arrays
+        self.loaded = True
+
+    def add(self, summary_db_id: int, features: Dict[int, float]) -> None:
+        """Index a summary, replacing its previous version.
+
+        No-op until the index is loaded; loading reads the current state.
+        Once the tail is large enough it is merged into the segment, in a
+        worker thread when called on the event loop. One merge runs at a
+        time.
+
+        Args:
+            summary_db_id: Database ID of the summary.
+            features: Features from summary_features.
+        """
+        if not self.loaded:
+            if self._pending is not None:
+                self._pending.append((summary_db_id, features))
+            return
+        self._append(summary_db_id, features)
+        segment_rows: int = len(self._ids) - len(self._tail)
+        if self._merge_task is not None or len(self._tail) < max(
+            TAIL_MERGE_MIN_ROWS, segment_rows * TAIL_MERGE_RATIO
+        ):
+            return
+        try:
+            loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Not on the event loop (e.g. building in a worker thread)
+            self._merge()
+            return
+        self._merge_task = loop.create_task(self._merge_in_background())
+
+    def _append(self, summary_db_id: int, features: Dict[int, float]) -> None:
+        """Add a row for a summary to the tail, masking out its previous row."""
+        self.remove(summary_db_id)
+        if not features:
+            return
+
+        cols: np.ndarray = np.fromiter(features.keys(), dtype=np.int32)
+        vals: np.ndarray = np.fromiter(features.values(), dtype=np.float32)
+        vals /= np.linalg.norm(vals)
+
+        row: int = len(self._ids)
+        if row == len(self._active):
+            self._active = np.concatenate([self._active, np.zeros(row, dtype=bool)])
+        self._ids.append(summary_db_id)
+        self._active[row] = True
+        self._row_of[summary_db_id] = row
+        self._df[cols] += 1
+        self._tail.append((row, cols, vals))
+        self._tail_arrays = None
+
+    def remove(self, summary_db_id: int) -> None:
+        """Drop a summary from the index if present.
+
+        Args:
+            summary_db_id: Database ID of the summary.
+        """
+        if not self.loaded and self._pending is not None:
+            self._pending.append((summary_db_id, None))
+        row: Optional[int] = self._row_of.pop(summary_db_id, None)
+        if row is None:
+            return
+        self._active[row] = False
+        segment_rows: int = len(self._row_indptr) - 1
+        if row < segment_rows:
+            cols: np.ndarray = self._row_cols[
+                self._row_indptr[row] : self._row_indptr[row + 1]
+            ]
+        else:
+            cols = self._tail[row - segment_rows][1]
+        self._df[cols] -= 1
+
+    def query(
+        self,
+        features: Dict[int, float],
+        k: int = 5,
+        exclude: Optional[int] = None,
+    ) -> List[Tuple[int, float]]:
+        """Find the approved summaries most similar to a set of features.
+
+        Args:
+            features: Features of the query summary.
+            k: Number of matches to return.
+            exclude: Optional summary database ID to leave out (the query itself).
+
+        Returns:
+            List of (summary database ID, cosine similarity), best first.
+        """
+        if not self._row_of or not features or k <= 0:
+            return []
+
+        qcols: np.ndarray = np.fromiter(features.keys(), dtype=np.int64)
+        qtf: np.ndarray = np.fromiter(features.values(), dtype=np.float32)
+        idf: np.ndarray = (
+            np.log((1 + len(self._row_of)) / (1 + self._df[qcols])) + 1
+        ).astype(np.float32)
+        qweights: np.ndarray = qtf * idf
+        qweights /= np.linalg.norm(qweights)
+
+        n_rows: int = len(self._ids)
+        starts: np.ndarray = self._indptr[qcols]
+        ends: np.ndarray = self._indptr[qcols + 1]
+        rows: np.ndarray = np.concatenate(
+            [self._seg_rows[s:e] for s, e in zip(starts, ends)]
+        )
+        weights: np.ndarray = np.concatenate(
+            [self._seg_vals[s:e] * w for s, e, w in zip(starts, ends, qweights)]
+        )
+        # bincount returns integers when the segment has no matching rows
+        scores: np.ndarray = np.bincount(
+            rows, weights=weights, minlength=n_rows
+        ).astype(np.float64, copy=False)
+
+        if self._tail:
+            tail_rows, tail_cols, tail_vals = self._tail_columns()
+            order: np.ndarray = np.argsort(qcols)
+            sorted_cols: np.ndarray = qcols[order]
+            positions: np.ndarray = np.searchsorted(sorted_cols, tail_cols)
+            positions[positions == len(sorted_cols)] = 0
+            hits: np.ndarray = sorted_cols[positions] == tail_cols
+            scores += np.bincount(
+                tail_rows[hits],
+                weights=tail_vals[hits] * qweights[order][positions[hits]],
+                minlength=n_rows,
+            )
+
+        scores[~self._active[:n_rows]] = 0.0
+        if exclude is not None and exclude in self._row_of:
+            scores[self._row_of[exclude]] = 0.0
+
+        k = min(k, n_rows)
+        top: np.ndarray = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            (self._ids[row], round(float(scores[row]), 4))
+            for row in top
+            if scores[row] > 0
+        ]
+
+    def _tail_columns(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get the tail as flat (row, feature, weight) arrays."""
+        if self._tail_arrays is None:
+            self._tail_arrays = (
+                np.concatenate(
+                    [
+                        np.full(len(cols), row, dtype=np.int32)
+                        for row, cols, _ in self._tail
+                    ]
+                ),
+                np.concatenate([cols for _, cols, _ in self._tail]).astype(np.int64),
+                np.concatenate([vals for _, _, vals in self._tail]),
+            )
+        return self._tail_arrays
+
+    def _merge(self) -> None:
+        """Fold the tail into the compressed segment and drop removed rows."""
+        rows, tail_size = len(self._ids), len(self._tail)
+        self._install_merge(rows, tail_size, _merge_segment(*self._snapshot()))
+
+    async def _merge_in_background(self) -> None:
+        """Merge in a worker thread, keeping changes made meanwhile."""
+        try:
+            rows, tail_size = len(self._ids), len(self._tail)
+            merged: _MergedSegment = await asyncio.to_thread(
+                _merge_segment, *self._snapshot()
+            )
+            self._install_merge(rows, tail_size, merged)
+        finally:
+            self._merge_task = None
+
+    def _snapshot(self) -> tuple:
+        """Get the arguments of _merge_segment for the current rows.
+
+        Removing a row later flips its flag in _active, so the flags are
+        copied; the other arrays are replaced, never written in place.
+        """
+        return (
+            self._seg_rows,
+            self._seg_vals,
+            self._indptr,
+            list(self._tail),
+            self._active[: len(self._ids)].copy(),
+        )
+
+    def _install_merge(
+        self, rows: int, tail_size: int, merged: "_MergedSegment"
+    ) -> None:
+        """Replace the segment with a merge of the first rows of the index.
+
+        Rows added after the snapshot stay in the tail and rows removed
+        after it stay masked out until the next merge.
+
+        Args:
+            rows: Number of rows when the snapshot was taken.
+            tail_size: Number of tail entries when the snapshot was taken.
+            merged: Result of _merge_segment on the snapshot.
+        """
+        kept: np.ndarray = np.flatnonzero(merged.new_row >= 0)
+        current_active: np.ndarray = self._active[: len(self._ids)]
+
+        self._ids = [self._ids[row] for row in kept.tolist()] + self._ids[rows:]
+        self._active = np.zeros(max(1024, 2 * len(self._ids)), dtype=bool)
+        self._active[: len(kept)] = current_active[kept]
+        self._active[len(kept) : len(self._ids)] = current_active[rows:]
+        self._row_of = {
+            summary_db_id: row
+            for row, summary_db_id in enumerate(self._ids)
+            if self._active[row]
+        }
+        self._seg_rows, self._seg_vals = merged.seg_rows, merged.seg_vals
+        self._indptr = merged.indptr
+        self._row_indptr, self._row_cols = merged.row_indptr, merged.row_cols
+        self._tail = [
+            (row - rows + len(kept), cols, vals)
+            for row, cols, vals in self._tail[tail_size:]
+        ]
+        self._tail_arrays = None
+
+
+class _MergedSegment(NamedTuple):
+    """Compressed segment built from a snapshot of the index."""
+
+    # Old row -> new row, or -1 for dropped rows
+    new_row: np.ndarray
+    seg_rows: np.ndarray
+    seg_vals: np.ndarray
+    indptr: np.ndarray
+    row_indptr: np.ndarray
+    row_cols: np.ndarray
+
+
+def _merge_segment(
+    seg_rows: np.ndarray,
+    seg_vals: np.ndarray,
+    indptr: np.ndarray,
+    tail: List[Tuple[int, np.ndarray, np.ndarray]],
+    active: np.ndarray,
+) -> _MergedSegment:
+    """Fold tail rows into a segment and drop inactive rows.
+
+    Only reads its arguments, so it can run in a worker thread while the
+    index keeps changing.
+
+    Args:
+        seg_rows: Row of each posting of the segment.
+        seg_vals: Weight of each posting of the segment.
+        indptr: Posting offsets per feature.
+        tail: Tail (row, features, weights) entries.
+        active: Whether each row is still indexed.
+
+    Returns:
+        The merged segment, with rows renumbered densely.
+    """
+    rows: np.ndarray = seg_rows
+    cols: np.ndarray = np.repeat(np.arange(N_FEATURES, dtype=np.int64), np.diff(indptr))
+    vals: np.ndarray = seg_vals
+    if tail:
+        rows = np.concatenate(
+            [rows] + [np.full(len(c), row, dtype=np.int32) for row, c, _ in tail]
+        )
+        cols = np.concatenate([cols] + [c.astype(np.int64) for _, c, _ in tail])
+        vals = np.concatenate([vals] + [v for _, _, v in tail])
+
+    # Renumber the surviving rows densely
+    keep: np.ndarray = active[rows]
+    new_row: np.ndarray = np.where(active, np.cumsum(active, dtype=np.int64) - 1, -1)
+    rows, cols, vals = new_row[rows[keep]].astype(np.int32), cols[keep], vals[keep]
+    kept_rows: int = int(active.sum())
+
+    order: np.ndarray = np.argsort(cols, kind="stable")
+    counts: np.ndarray = np.bincount(cols, minlength=N_FEATURES)
+    by_row: np.ndarray = np.argsort(rows, kind="stable")
+    row_counts: np.ndarray = np.bincount(rows, minlength=kept_rows)
+    return _MergedSegment(
+        new_row=new_row,
+        seg_rows=rows[order],
+        seg_vals=vals[order],
+        indptr=np.concatenate([[0], np.cumsum(counts)]).astype(np.int64),
+        row_indptr=np.concatenate([[0], np.cumsum(row_counts)]).astype(np.int64),
+        row_cols=cols[by_row].astype(np.int32),
+    )
+
+
+def _build_index(session_factory: Callable[[], Session]) -> SimilarCasesIndex:
+    """Build an index from the database in its own session.
+
+    Args:
+        session_factory: Creates the database session.
+
+    Returns:
+        The loaded index.
+    """
+    index: SimilarCasesIndex = SimilarCasesIndex()
+    db: Session = session_factory()
+    try:
+        index.load(db)
+    finally:
+        db.close()
+    return index
+
+
+# Process-wide index, built from approved summaries on the first lookup
+similar_cases_index: SimilarCasesIndex = SimilarCasesIndex()
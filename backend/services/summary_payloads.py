@@ -0,0 +1,196 @@
+"""Rendering and caching of summary response payloads.
+
+Every summary endpoint responds with the same JSON document per summary.
+It is rendered once per summary version (row ID, summary ID and
+``updated_at``, which changes on every write) and cached as bytes, so reads
+and list responses skip JSON parsing and Pydantic validation for
+unchanged summaries.
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Query, Session
+
+from database import SessionLocal, Summary, Thread
+from database.models import SummaryContentModel, SummaryModel
+from services.background.database_ops import LOOKUP_CHUNK_SIZE, usage_from_summary
+from services.payload_cache import PayloadCache
+
+# Upper bound on the memory held by cached summary payloads
+SUMMARY_PAYLOAD_CACHE_BYTES: int = (
+    int(os.getenv("SUMMARY_PAYLOAD_CACHE_MB", "64")) * 1024 * 1024
+)
+
+# Version of a cached payload: (summary_id, updated_at)
+SummaryVersion = Tuple[str, Optional[str]]
+# (row ID, summary_id, updated_at, thread_id) of a listed summary
+VersionRow = Tuple[int, str, Optional[datetime], Optional[str]]
+
+summary_payload_cache: PayloadCache = PayloadCache(
+    "summary_payloads", SUMMARY_PAYLOAD_CACHE_BYTES
+)
+
+
+def render_summary(summary_db: Summary, thread_id: str) -> bytes:
+    """Render the response payload of a summary.
+
+    Args:
+        summary_db: Summary row.
+        thread_id: Identifier of the summary's thread.
+
+    Returns:
+        JSON document of the SummaryModel.
+    """
+    # Parse structured_data_json if available
+    structured_data: Optional[SummaryContentModel] = None
+    if summary_db.structured_data_json:
+        try:
+            structured_data_dict = json.loads(summary_db.structured_data_json)
+            structured_data = SummaryContentModel(**structured_data_dict)
+        except (json.JSONDecodeError, ValueError):
+            pass
+
+    return (
+        SummaryModel(
+            id=summary_db.summary_id,
+            thread_id=thread_id,
+            original_summary=summary_db.original_summary,
+            edited_summary=summary_db.edited_summary,
+            status=summary_db.status.value,
+            approved_by=summary_db.approved_by,
+            approved_at=summary_db.approved_at.isoformat()
+            if summary_db.approved_at
+            else None,
+            remarks=summary_db.remarks,
+            rejection_reason=summary_db.rejection_reason,
+            created_at=summary_db.created_at.isoformat(),
+            updated_at=summary_db.updated_at.isoformat(),
+            structured_data=structured_data,
+            usage=usage_from_summary(summary_db),
+        )
+        .model_dump_json()
+        .encode("utf-8")
+    )
+
+
+def _version(summary_id: str, updated_at: Optional[datetime]) -> SummaryVersion:
+    """Get the cache version of a summary from its row values."""
+    return summary_id, updated_at.isoformat() if updated_at else None
+
+
+def summary_payload(summary_db: Summary, thread_id: Optional[str] = None) -> bytes:
+    """Get the response payload of a summary, rendering it on a cache miss.
+
+    Args:
+        summary_db: Summary row.
+        thread_id: Identifier of the summary's thread; looked up through the
+            row's relationship when omitted.
+
+    Returns:
+        JSON document of the SummaryModel.
+    """
+    version: SummaryVersion = _version(summary_db.summary_id, summary_db.updated_at)
+    payload: Optional[bytes] = summary_payload_cache.get(summary_db.id, version)
+    if payload is None:
+        if thread_id is None:
+            thread_id = summary_db.thread.thread_id if summary_db.thread else "unknown"
+        payload = render_summary(summary_db, thread_id)
+        summary_payload_cache.put(summary_db.id, version, payload)
+    return payload
+
+
+def summary_response(summary_db: Summary) -> Response:
+    """Build the response of a single summary endpoint.
+
+    Args:
+        summary_db: Summary row, reflecting any write made by the endpoint.
+
+    Returns:
+        JSON response with the summary payload.
+    """
+    return Response(content=summary_payload(summary_db), media_type="application/json")
+
+
+def _stream_summaries(version_rows: List[VersionRow]) -> Iterator[bytes]:
+    """Yield a JSON array of summary payloads.
+
+    Cached payloads are written as they are; the rows of misses are loaded
+    in chunks and rendered.
+
+    Args:
+        version_rows: Listed summaries, in response order.
+    """
+    yield b"["
+    first: bool = True
+    db: Session = SessionLocal()
+    try:
+        for start in range(0, len(version_rows), LOOKUP_CHUNK_SIZE):
+            chunk = version_rows[start : start + LOOKUP_CHUNK_SIZE]
+            payloads: List[Optional[bytes]] = [
+                summary_payload_cache.get(row_id, _version(summary_id, updated_at))
+                for row_id, summary_id, updated_at, _ in chunk
+            ]
+            missing: List[int] = [
+                row_id
+                for (row_id, *_), payload in zip(chunk, payloads)
+                if payload is None
+            ]
+            rows_by_id = (
+                {
+                    summary_db.id: summary_db
+                    for summary_db in db.query(Summary).filter(Summary.id.in_(missing))
+                }
+                if missing
+                else {}
+            )
+
+            parts: List[bytes] = []
+            for (row_id, _, _, thread_id), payload in zip(chunk, payloads):
+                if payload is None:
+                    summary_db: Optional[Summary] = rows_by_id.get(row_id)
+                    if summary_db is None:
+                        # Deleted since the listing query
+                        continue
+                    payload = render_summary(summary_db, thread_id or "unknown")
+                    summary_payload_cache.put(
+                        row_id,
+                        _version(summary_db.summary_id, summary_db.updated_at),
+                        payload,
+                    )
+                parts.append(payload)
+            if parts:
+                yield (b"" if first else b",") + b",".join(parts)
+                first = False
+    finally:
+        db.close()
+    yield b"]"
+
+
+def summary_list_response(query: Query) -> StreamingResponse:
+    """Stream the payloads of the summaries matched by a query.
+
+    Only the row versions are read up front; the body is streamed from
+    cached payloads, loading and rendering changed summaries on the way.
+
+    Args:
+        query: Query over Summary with the endpoint's filters applied.
+
+    Returns:
+        Streaming JSON array response.
+    """
+    version_rows: List[VersionRow] = [
+        tuple(row)
+        for row in query.outerjoin(Thread, Thread.id == Summary.thread_id)
+        .with_entities(
+            Summary.id, Summary.summary_id, Summary.updated_at, Thread.thread_id
+        )
+        .order_by(Summary.id)
+    ]
+    return StreamingResponse(
+        _stream_summaries(version_rows), media_type="application/json"
+    )
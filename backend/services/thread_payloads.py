@@ -0,0 +1,239 @@
+"""Read-through cache of serialized threads.
+
+Threads and their messages only change when a file is re-uploaded or
+deleted, and both paths invalidate the thread's entry. Cached threads are
+therefore served without querying SQLite. Entries also record the thread's
+content fingerprint, so callers that already hold the thread row can check
+the entry against it.
+
+Thread lists are streamed instead: rows are read from the cursor in
+batches, each batch's messages are loaded with one query, and the batch is
+written out before the next is read. Exports bypass the cache so they do
+not evict the threads being reviewed.
+"""
+
+import os
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Row, select
+from sqlalchemy.orm import Session
+
+from database import Message, SessionLocal, Thread
+from database.models import MessageModel, ThreadModel, ThreadsResponseModel
+from services.payload_cache import PayloadCache
+
+# Upper bound on the memory held by cached thread payloads
+THREAD_CACHE_BYTES: int = int(os.getenv("THREAD_CACHE_MB", "64")) * 1024 * 1024
+
+# Threads per streamed batch; also bounds the message query's IN list
+STREAM_BATCH_SIZE: int = 500
+
+# Columns read to render a thread payload
+THREAD_COLUMNS = (
+    Thread.id,
+    Thread.thread_id,
+    Thread.topic,
+    Thread.subject,
+    Thread.initiated_by,
+    Thread.order_id,
+    Thread.product,
+)
+MESSAGE_COLUMNS = (
+    Message.thread_id,
+    Message.message_id,
+    Message.sender,
+    Message.timestamp,
+    Message.body,
+)
+
+thread_payload_cache: PayloadCache = PayloadCache("threads", THREAD_CACHE_BYTES)
+
+
+def _render(thread_db: Any, messages_db: List[Any]) -> bytes:
+    """Render a thread payload from its row and ordered message rows.
+
+    Rows may be ORM instances or column projections with the same names.
+    """
+    messages: List[dict] = [
+        {
+            "id": msg.message_id,
+            "sender": msg.sender.value,
+            "timestamp": msg.timestamp,
+            "body": msg.body,
+        }
+        for msg in messages_db
+    ]
+
+    return (
+        ThreadModel(
+            thread_id=thread_db.thread_id,
+            topic=thread_db.topic,
+            subject=thread_db.subject,
+            initiated_by=thread_db.initiated_by.value,
+            order_id=thread_db.order_id,
+            product=thread_db.product,
+            messages=[MessageModel(**msg) for msg in messages],
+        )
+        .model_dump_json()
+        .encode("utf-8")
+    )
+
+
+def render_thread(db: Session, thread_db: Thread) -> bytes:
+    """Render the payload of a thread with its messages.
+
+    Args:
+        db: Database session.
+        thread_db: Thread row.
+
+    Returns:
+        JSON document of the ThreadModel.
+    """
+    messages_db: List[Message] = (
+        db.query(Message)
+        .filter(Message.thread_id == thread_db.id)
+        .order_by(Message.timestamp, Message.id)
+        .all()
+    )
+    return _render(thread_db, messages_db)
+
+
+def render_threads(db: Session, threads_db: Sequence[Row]) -> List[bytes]:
+    """Render the payloads of a batch of threads with one message query.
+
+    Only the columns in the payload are read, so no ORM instances are built.
+
+    Args:
+        db: Database session.
+        threads_db: Rows of THREAD_COLUMNS, at most STREAM_BATCH_SIZE.
+
+    Returns:
+        JSON documents of the ThreadModels, in the order of threads_db.
+    """
+    messages_by_thread: Dict[int, List[Row]] = {
+        thread_db.id: [] for thread_db in threads_db
+    }
+    if messages_by_thread:
+        for msg in (
+            db.query(*MESSAGE_COLUMNS)
+            .filter(Message.thread_id.in_(list(messages_by_thread)))
+            .order_by(Message.thread_id, Message.timestamp, Message.id)
+        ):
+            messages_by_thread[msg.thread_id].append(msg)
+    return [
+        _render(thread_db, messages_by_thread[thread_db.id]) for thread_db in threads_db
+    ]
+
+
+def thread_payload(db: Session, thread_db: Thread) -> bytes:
+    """Get the payload of a thread, rendering it on a cache miss.
+
+    Args:
+        db: Database session.
+        thread_db: Thread row.
+
+    Returns:
+        JSON document of the ThreadModel.
+    """
+    payload: Optional[bytes] = thread_payload_cache.get(
+        thread_db.thread_id, thread_db.content_hash
+    )
+    if payload is None:
+        payload = render_thread(db, thread_db)
+        thread_payload_cache.put(thread_db.thread_id, thread_db.content_hash, payload)
+    return payload
+
+
+def thread_payload_by_id(db: Session, thread_id: str) -> Optional[bytes]:
+    """Get the payload of a thread, reading the database only on a cache miss.
+
+    Args:
+        db: Database session.
+        thread_id: Thread identifier.
+
+    Returns:
+        JSON document of the ThreadModel, or None if the thread does not exist.
+    """
+    payload: Optional[bytes] = thread_payload_cache.get_current(thread_id)
+    if payload is None:
+        thread_db: Optional[Thread] = (
+            db.query(Thread).filter(Thread.thread_id == thread_id).first()
+        )
+        if thread_db is None:
+            return None
+        payload = render_thread(db, thread_db)
+        thread_payload_cache.put(thread_id, thread_db.content_hash, payload)
+    return payload
+
+
+def load_thread_model(db: Session, thread_db: Thread) -> ThreadModel:
+    """Get a thread with its messages through the cache.
+
+    Args:
+        db: Database session.
+        thread_db: Thread row.
+
+    Returns:
+        ThreadModel instance.
+    """
+    return ThreadModel.model_validate_json(thread_payload(db, thread_db))
+
+
+def _stream_threads(envelope: bytes, file_db_id: Optional[int]) -> Iterator[bytes]:
+    """Yield a threads response document, one batch of threads at a time.
+
+    Args:
+        envelope: Serialized ThreadsResponseModel with an empty threads list.
+        file_db_id: Internal ID of the file to list threads of, or None for
+            all threads.
+    """
+    closing: bytes = b"]}"
+    yield envelope[: -len(closing)]
+    first: bool = True
+    db: Session = SessionLocal()
+    try:
+        statement = (
+            select(*THREAD_COLUMNS)
+            .order_by(Thread.id)
+            .execution_options(yield_per=STREAM_BATCH_SIZE)
+        )
+        if file_db_id is not None:
+            statement = statement.where(Thread.file_id == file_db_id)
+        for threads_db in db.execute(statement).partitions():
+            yield (b"" if first else b",") + b",".join(render_threads(db, threads_db))
+            first = False
+    finally:
+        db.close()
+    yield closing
+
+
+def thread_list_response(
+    description: str, file_db_id: Optional[int] = None
+) -> StreamingResponse:
+    """Stream the threads of a file, or of every file, with their messages.
+
+    Memory stays bounded by one batch of threads whatever the list size,
+    and the first bytes are sent before the rest of the list is read.
+
+    Args:
+        description: Description field of the response.
+        file_db_id: Internal ID of the file to list threads of, or None for
+            all threads.
+
+    Returns:
+        Streaming ThreadsResponseModel response.
+    """
+    envelope: bytes = (
+        ThreadsResponseModel(
+            version="v2",
+            generated_at="2025-09-15T10:39:29",
+            description=description,
+            threads=[],
+        )
+        .model_dump_json()
+        .encode("utf-8")
+    )
+    return StreamingResponse(
+        _stream_threads(envelope, file_db_id), media_type="application/json"
+    )
@@ -0,0 +1,13 @@
+"""Shared pytest fixtures."""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_cwd(tmp_path, monkeypatch):
+    """Run every test in a temporary directory.
+
+    The SQLite database and cassette paths are relative to the working
+    directory, so tests never touch a developer's files.
+    """
+    monkeypatch.chdir(tmp_path)
@@ -0,0 +1,117 @@
+"""Tests for recording and replaying OpenRouter calls."""
+
+import asyncio
+import json
+from typing import List
+
+import httpx
+import pytest
+
+import services.openrouter.cassette as cassette_module
+import services.openrouter.client as client_module
+from services.openrouter.cassette import request_key
+from services.openrouter.client import OpenRouterClient
+from services.openrouter.resilience import CircuitBreaker, LatencyTracker
+
+MESSAGES = [{"role": "user", "content": "Summarize this thread"}]
+
+
+@pytest.fixture(autouse=True)
+def isolated_client_state(monkeypatch):
+    """Fresh cassettes, circuit breaker and latency tracker for every test."""
+    monkeypatch.setattr(cassette_module, "_cassettes", {})
+    monkeypatch.setattr(client_module, "circuit_breaker", CircuitBreaker())
+    monkeypatch.setattr(client_module, "latency_tracker", LatencyTracker(enabled=False))
+
+
+def _client(mode: str, path, handler) -> OpenRouterClient:
+    client = OpenRouterClient(
+        api_key="test", model="test-model", cassette_mode=mode, cassette_path=str(path)
+    )
+    client.client = httpx.AsyncClient(
+        base_url="https://openrouter.test", transport=httpx.MockTransport(handler)
+    )
+    return client
+
+
+def _completion(content: str) -> dict:
+    return {
+        "model": "test-model",
+        "choices": [{"message": {"content": content}}],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 2, "total_tokens": 12},
+    }
+
+
+def _offline(request: httpx.Request) -> httpx.Response:
+    raise AssertionError("replay must not reach the network")
+
+
+def test_recorded_calls_replay_in_order_without_the_network(tmp_path):
+    path = tmp_path / "cassette.jsonl"
+    answers = iter(["first", "second"])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=_completion(next(answers)))
+
+    async def record():
+        client = _client("record", path, handler)
+        return [await client.call_api_with_usage(MESSAGES) for _ in range(2)]
+
+    recorded = asyncio.run(record())
+
+    assert [text for text, _ in recorded] == ["first", "second"]
+    entries = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(entries) == 2
+    assert entries[0]["key"] == request_key(entries[0]["request"])
+    assert entries[0]["request"]["messages"] == MESSAGES
+
+    async def replay():
+        client = _client("replay", path, _offline)
+        # Once the recordings are used up, the last one is served again
+        return [await client.call_api_with_usage(MESSAGES) for _ in range(3)]
+
+    replayed = asyncio.run(replay())
+
+    assert [text for text, _ in replayed] == ["first", "second", "second"]
+    assert [usage.total_tokens for _, usage in replayed] == [12, 12, 12]
+
+
+def test_streamed_calls_are_recorded_as_one_completion(tmp_path):
+    path = tmp_path / "cassette.jsonl"
+    deltas = ['{"issue_summary": "Cracked', ' screen"}']
+    events = [
+        {"model": "test-model", "choices": [{"delta": {"content": delta}}]}
+        for delta in deltas
+    ] + [{"choices": [], "usage": {"prompt_tokens": 10, "completion_tokens": 4}}]
+    stream = "".join(f"data: {json.dumps(event)}\n\n" for event in events)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=(stream + "data: [DONE]\n\n").encode())
+
+    asyncio.run(_client("record", path, handler).call_api_stream(MESSAGES))
+
+    seen: List[str] = []
+
+    async def replay():
+        client = _client("replay", path, _offline)
+        return await client.call_api_stream(MESSAGES, on_text=seen.append)
+
+    text, usage = asyncio.run(replay())
+
+    assert text == "".join(deltas)
+    assert seen == [text]
+    assert usage.completion_tokens == 4
+
+
+def test_unrecorded_request_is_a_replay_miss(tmp_path):
+    path = tmp_path / "cassette.jsonl"
+    path.write_text("")
+    client = _client("replay", path, _offline)
+
+    with pytest.raises(Exception, match="cassette miss"):
+        asyncio.run(client.call_api_with_usage(MESSAGES))
+
+
+def test_replay_needs_an_existing_cassette(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        _client("replay", tmp_path / "missing.jsonl", _offline)
@@ -0,0 +1,128 @@
+"""Tests for prompt compaction of message bodies."""
+
+from database.models import MessageModel, ThreadModel
+from services.openrouter.compactor import compact_message_body, compact_thread
+
+
+def test_thanks_does_not_end_the_message():
+    body = (
+        "Hi,\n"
+        "Thank you\n"
+        "I still have not received a refund for order 123.\n"
+        "It has been three weeks."
+    )
+
+    assert compact_message_body(body) == body
+
+
+def test_thanks_before_the_request_is_kept():
+    body = "Thanks for getting back to me.\nBest\nThe replacement also arrived broken."
+
+    assert "replacement also arrived broken" in compact_message_body(body)
+
+
+def test_from_in_prose_is_not_a_quote_header():
+    body = (
+        "Hello team,\n"
+        "From: the warehouse photos it is clear the item was damaged.\n"
+        "I want a replacement."
+    )
+
+    assert compact_message_body(body) == body
+
+
+def test_outlook_header_block_drops_quoted_history():
+    body = (
+        "Any update on this? I am still waiting.\n"
+        "\n"
+        "From: Acme Support <support@acme.com>\n"
+        "Sent: Monday, September 1, 2025 10:02 AM\n"
+        "To: Jane Doe <jane@example.com>\n"
+        "Subject: RE: Order ORD-5521 damaged\n"
+        "\n"
+        "We have opened a claim with the carrier."
+    )
+
+    assert compact_message_body(body) == "Any update on this? I am still waiting."
+
+
+def test_gmail_quote_and_quoted_lines_are_dropped():
+    body = (
+        "The tracking link still shows no movement.\n"
+        "\n"
+        "On Tue, Sep 2, 2025 at 9:14 AM Acme Support <support@acme.com> wrote:\n"
+        "> Your parcel left our warehouse yesterday."
+    )
+
+    assert compact_message_body(body) == "The tracking link still shows no movement."
+
+
+def test_signature_with_name_and_contact_details_is_dropped():
+    body = (
+        "Please cancel order ORD-8812, it was placed twice.\n"
+        "\n"
+        "Kind regards,\n"
+        "Jane Doe\n"
+        "Procurement Lead | Northwind Ltd.\n"
+        "+1 (555) 123-4567\n"
+        "jane.doe@northwind.example"
+    )
+
+    assert compact_message_body(body) == (
+        "Please cancel order ORD-8812, it was placed twice."
+    )
+
+
+def test_sign_off_followed_by_sentences_is_kept():
+    body = (
+        "My order is late.\n"
+        "\n"
+        "Regards,\n"
+        "Please call me back about order 555 tomorrow morning."
+    )
+
+    assert compact_message_body(body) == body
+
+
+def test_boilerplate_and_disclaimer_are_removed():
+    body = (
+        "The charger stopped working after two days.\n"
+        "Sent from my iPhone\n"
+        "\n"
+        "CONFIDENTIALITY NOTICE: this message is intended solely for the addressee."
+    )
+
+    assert compact_message_body(body) == "The charger stopped working after two days."
+
+
+def test_body_that_would_compact_to_nothing_is_kept():
+    assert compact_message_body("> only quoted text") == "> only quoted text"
+
+
+def test_compact_thread_reports_tokens_saved_and_keeps_original():
+    body = (
+        "Still no refund.\n"
+        "\n"
+        "On Mon, Sep 1, 2025 at 8:00 AM Acme <a@acme.com> wrote:\n"
+        + "> We are processing your refund and will update you shortly.\n"
+        * 20
+    )
+    thread = ThreadModel(
+        thread_id="CE-1",
+        topic="Refund",
+        subject="Refund",
+        initiated_by="customer",
+        order_id="ORD-1",
+        product="Widget",
+        messages=[
+            MessageModel(
+                id="m1", sender="customer", timestamp="2025-09-02T10:00:00", body=body
+            )
+        ],
+    )
+
+    compacted, tokens_saved = compact_thread(thread)
+
+    assert compacted.messages[0].body == "Still no refund."
+    assert tokens_saved > 0
+    assert thread.messages[0].body == body
@@ -0,0 +1,215 @@
+"""Tests for Accept-Encoding negotiation and the compression middleware."""
+
+import asyncio
+import gzip
+import zlib
+from typing import List
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from starlette.types import Message
+
+import services.compression as compression
+from services.compression import CompressionMiddleware, negotiate_encoding
+from services.etags import etag_headers, etag_matches, not_modified
+
+ETAG = '"0123abcd"'
+ITEMS = [
+    {"id": i, "status": "pending", "summary": "Cracked screen"} for i in range(200)
+]
+CHUNKS = [b"data: first\n\n", b"data: second\n\n", b"data: third\n\n"]
+
+needs_brotli = pytest.mark.skipif(
+    compression.brotli is None, reason="brotli is not installed"
+)
+
+
+def _app(minimum_size: int = 500) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items")
+    def items(request: Request):
+        if etag_matches(request, ETAG):
+            return not_modified(ETAG)
+        return JSONResponse(ITEMS, headers=etag_headers(ETAG))
+
+    @app.get("/small")
+    def small():
+        return PlainTextResponse("ok")
+
+    @app.get("/encoded")
+    def encoded():
+        return PlainTextResponse(
+            gzip.compress(b"x" * 2000), headers={"Content-Encoding": "gzip"}
+        )
+
+    @app.get("/events")
+    def events():
+        return StreamingResponse(iter(CHUNKS), media_type="text/event-stream")
+
+    app.add_middleware(CompressionMiddleware, minimum_size=minimum_size)
+    return app
+
+
+@pytest.fixture
+def client():
+    """Test client for an app behind the compression middleware."""
+    with TestClient(_app()) as client:
+        yield client
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("gzip, deflate, br", "br"),
+        ("gzip, br;q=0.5", "gzip"),
+        ("br;q=0, gzip", "gzip"),
+        ("gzip;q=0, br;q=0", None),
+        ("*", "br"),
+        ("*;q=0.5, br;q=0", "gzip"),
+        ("deflate", None),
+        ("", None),
+        ("gzip;q=oops, br", "br"),
+    ],
+)
+def test_negotiate_encoding(monkeypatch, header, expected):
+    # Only whether the package is importable matters here
+    monkeypatch.setattr(compression, "brotli", object())
+
+    assert negotiate_encoding(header) == expected
+
+
+def test_gzip_is_used_without_brotli(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+
+    assert negotiate_encoding("br, gzip;q=0.1") == "gzip"
+    assert negotiate_encoding("br") is None
+
+
+@pytest.mark.parametrize("encoding", ["gzip", pytest.param("br", marks=needs_brotli)])
+def test_large_body_round_trips(client, encoding):
+    response = client.get("/items", headers={"Accept-Encoding": encoding})
+
+    assert response.headers["content-encoding"] == encoding
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.json() == ITEMS
+    raw_length = int(response.headers["content-length"])
+    assert raw_length < len(response.content)
+
+
+def test_identity_request_is_not_compressed(client):
+    response = client.get("/items", headers={"Accept-Encoding": "identity"})
+
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == ETAG
+    assert response.json() == ITEMS
+
+
+@pytest.mark.parametrize(
+    "path, encoding, body",
+    [
+        ("/small", None, b"ok"),
+        # Already gzipped by the endpoint, so not wrapped a second time
+        ("/encoded", "gzip", b"x" * 2000),
+        ("/events", None, b"".join(CHUNKS)),
+    ],
+)
+def test_bodies_that_are_sent_as_they_are(client, path, encoding, body):
+    response = client.get(path, headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers.get("content-encoding") == encoding
+    assert "vary" not in response.headers
+    assert response.content == body
+
+
+def test_compressed_etag_is_weak_and_still_revalidates(client):
+    response = client.get("/items", headers={"Accept-Encoding": "gzip"})
+    etag = response.headers["etag"]
+
+    assert etag == f"W/{ETAG}"
+    revalidated = client.get(
+        "/items", headers={"Accept-Encoding": "gzip", "If-None-Match": etag}
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    # The 304 repeats the validator the client holds
+    assert revalidated.headers["etag"] == etag
+    assert revalidated.headers["vary"] == "Accept-Encoding"
+
+
+def test_weak_current_etag_matches_either_form():
+    request = Request({"type": "http", "headers": [(b"if-none-match", ETAG.encode())]})
+
+    assert etag_matches(request, f"W/{ETAG}")
+
+
+def _send_stream(encoding: str) -> List[Message]:
+    """Run a streamed response through the middleware at the ASGI level."""
+    messages: List[Message] = []
+
+    async def app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"text/plain"),
+                    (b"content-length", b"42"),
+                    (b"etag", ETAG.encode()),
+                ],
+            }
+        )
+        for i, chunk in enumerate(CHUNKS):
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": chunk,
+                    "more_body": i < len(CHUNKS) - 1,
+                }
+            )
+
+    async def receive():
+        return {"type": "http.request"}
+
+    async def send(message: Message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/stream",
+        "headers": [(b"accept-encoding", encoding.encode())],
+    }
+    asyncio.run(CompressionMiddleware(app, minimum_size=10_000)(scope, receive, send))
+    return messages
+
+
+def test_streamed_gzip_chunks_are_flushed_one_by_one():
+    start, *bodies = _send_stream("gzip")
+    headers = dict(start["headers"])
+
+    assert headers[b"content-encoding"] == b"gzip"
+    assert headers[b"etag"] == f"W/{ETAG}".encode()
+    # The length of a streamed compressed body is unknown up front
+    assert b"content-length" not in headers
+    assert len(bodies) == len(CHUNKS)
+    decompressor = zlib.decompressobj(31)
+    for chunk, message in zip(CHUNKS, bodies):
+        # Each message decodes to its chunk before the stream has ended
+        assert decompressor.decompress(message["body"]) == chunk
+    decompressor.flush()
+    assert decompressor.eof
+
+
+@needs_brotli
+def test_streamed_brotli_chunks_are_flushed_one_by_one():
+    start, *bodies = _send_stream("br")
+
+    assert dict(start["headers"])[b"content-encoding"] == b"br"
+    decompressor = compression.brotli.Decompressor()
+    for chunk, message in zip(CHUNKS, bodies):
+        assert decompressor.process(message["body"]) == chunk
+    assert decompressor.is_finished()
+    assert bodies[-1].get("more_body") is False
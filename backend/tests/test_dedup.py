@@ -0,0 +1,197 @@
+"""Tests for MinHash near-duplicate detection and summary reuse."""
+
+from typing import List
+
+import pytest
+
+import services.background.dedup as dedup
+from database.models import (
+    CRMContextModel,
+    ExtractedContextModel,
+    MessageModel,
+    SummaryContentModel,
+    ThreadModel,
+)
+from services.background.dedup import (
+    NearDuplicateIndex,
+    derive_summary,
+    estimate_similarity,
+    find_near_duplicates,
+    minhash_signature,
+    sign_threads,
+)
+
+COMPLAINT = (
+    "Hello, my order {order} arrived with a cracked screen and the box was "
+    "crushed. I paid ${amount} for it on the 3rd and would like a replacement "
+    "sent as soon as possible. Please let me know what you need from me."
+)
+
+
+def _thread(
+    thread_id: str,
+    bodies: List[str],
+    topic: str = "Damaged product",
+    order_id: str = "111-222",
+    product: str = "LED Monitor",
+) -> ThreadModel:
+    return ThreadModel(
+        thread_id=thread_id,
+        topic=topic,
+        subject="Damaged on arrival",
+        initiated_by="customer",
+        order_id=order_id,
+        product=product,
+        messages=[
+            MessageModel(
+                id=f"{thread_id}-{i}",
+                sender="customer",
+                timestamp="2025-09-01T10:00:00Z",
+                body=body,
+            )
+            for i, body in enumerate(bodies)
+        ],
+    )
+
+
+def _complaint(thread_id: str, order: str, amount: str = "249", **kwargs):
+    return _thread(thread_id, [COMPLAINT.format(order=order, amount=amount)], **kwargs)
+
+
+def _source_summary() -> SummaryContentModel:
+    return SummaryContentModel(
+        issue_summary="Order 111-222 (LED Monitor) arrived with a cracked screen.",
+        key_details=CRMContextModel(
+            order_id="111-222",
+            product="LED Monitor",
+            customer_name="Jane Doe",
+            customer_email="jane@example.com",
+            order_date="2025-09-03",
+            order_status="delivered",
+            ticket_ids=["TCK-1001"],
+        ),
+        context_extraction=ExtractedContextModel(
+            issue_type="damaged product",
+            customer_sentiment="negative",
+            urgency_level="high",
+            customer_intent="replacement",
+            key_phrases=["cracked screen"],
+        ),
+        resolution_status="pending",
+        resolution_details="Waiting for photos of order 111-222.",
+        full_summary_text="## Issue Summary\nOrder 111-222 arrived broken.",
+    )
+
+
+def test_numbers_are_masked_before_signing():
+    first = minhash_signature(_complaint("T1", "111-222", amount="249"))
+    second = minhash_signature(_complaint("T2", "333-444", amount="199"))
+
+    assert first == second
+
+
+def test_different_bodies_have_low_similarity():
+    first = minhash_signature(_complaint("T1", "111-222"))
+    second = minhash_signature(
+        _thread("T2", ["Where is my refund? It has been three weeks already."])
+    )
+
+    assert estimate_similarity(first, second) < 0.2
+
+
+@pytest.mark.parametrize("bodies", [[""], ["   "], ["!!! ... ???"], []])
+def test_threads_without_tokens_are_not_signed(bodies):
+    assert minhash_signature(_thread("T1", bodies)) is None
+
+
+def test_threads_without_tokens_never_match_each_other():
+    index = NearDuplicateIndex(threshold=0.9)
+    threads = [_thread("T1", [""]), _thread("T2", [""]), _thread("T3", ["..."])]
+
+    duplicates = find_near_duplicates(index, threads, sign_threads(threads))
+
+    assert duplicates == {}
+    assert len(index) == 0
+
+
+def test_later_thread_of_an_upload_matches_an_earlier_one():
+    index = NearDuplicateIndex(threshold=0.9)
+    threads = [_complaint("T1", "111-222"), _complaint("T2", "333-444")]
+
+    duplicates = find_near_duplicates(index, threads, sign_threads(threads))
+
+    assert list(duplicates) == ["T2"]
+    assert duplicates["T2"][0] == "T1"
+    assert duplicates["T2"][1] == pytest.approx(1.0)
+    # Only the representative stays indexed
+    assert len(index) == 1
+
+
+def test_threads_of_other_topics_do_not_match():
+    index = NearDuplicateIndex(threshold=0.9)
+    threads = [
+        _complaint("T1", "111-222", topic="Damaged product"),
+        _complaint("T2", "333-444", topic="Late delivery"),
+    ]
+
+    assert find_near_duplicates(index, threads, sign_threads(threads)) == {}
+    assert len(index) == 2
+
+
+def test_removed_thread_is_no_longer_matched():
+    index = NearDuplicateIndex(threshold=0.9)
+    original = _complaint("T1", "111-222")
+    index.add("T1", original.topic, minhash_signature(original))
+    index.remove("T1")
+    resent = _complaint("T2", "333-444")
+
+    assert index.query("T2", resent.topic, minhash_signature(resent)) is None
+
+
+def test_thread_that_lost_its_tokens_is_dropped_from_the_index():
+    index = NearDuplicateIndex(threshold=0.9)
+    original = _complaint("T1", "111-222")
+    index.add("T1", original.topic, minhash_signature(original))
+    emptied = _thread("T1", [""])
+
+    find_near_duplicates(index, [emptied], sign_threads([emptied]))
+
+    assert len(index) == 0
+
+
+def test_derived_summary_clears_other_customers_details(monkeypatch):
+    monkeypatch.setattr(dedup, "LOCAL_CRM_EXTRACTION", False)
+    monkeypatch.setattr(dedup, "LOCAL_SUMMARY_RENDERING", False)
+    thread = _thread(
+        "T2",
+        ["My order 333-444 came with a cracked screen."],
+        order_id="333-444",
+        product="LED Monitor Pro",
+    )
+
+    derived = derive_summary(_source_summary(), "111-222", "LED Monitor", thread)
+
+    assert derived.key_details == CRMContextModel(
+        order_id="333-444", product="LED Monitor Pro"
+    )
+    assert "333-444" in derived.issue_summary
+    assert "111-222" not in derived.resolution_details
+
+
+def test_derived_summary_uses_locally_extracted_details(monkeypatch):
+    monkeypatch.setattr(dedup, "LOCAL_CRM_EXTRACTION", True)
+    monkeypatch.setattr(dedup, "LOCAL_SUMMARY_RENDERING", False)
+    thread = _thread(
+        "T2",
+        ["Jane Doe here, order 333-444 broke. Reach me at jane.doe@example.org"],
+        order_id="333-444",
+    )
+
+    derived = derive_summary(_source_summary(), "111-222", "LED Monitor", thread)
+
+    assert derived.key_details.customer_email == "jane.doe@example.org"
+    # Mentioned by the thread itself, so the name is kept
+    assert derived.key_details.customer_name == "Jane Doe"
+    # Not re-derived: the match's order status and ticket IDs are dropped
+    assert derived.key_details.order_status is None
+    assert derived.key_details.ticket_ids == []
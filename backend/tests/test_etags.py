@@ -0,0 +1,132 @@
+"""Tests for table change sequences and conditional list requests."""
+
+from typing import Dict
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+
+import database.database as database_module
+import services.summary_payloads as summary_payloads
+from database import Base, Summary, TableVersion, get_db
+from database.models import SummaryStatus
+from routers import summaries
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    """Session factory for a fresh database with change triggers installed."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'etags.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(engine)
+    monkeypatch.setattr(database_module, "engine", engine)
+    database_module._create_change_triggers()
+    factory = sessionmaker(bind=engine)
+    db = factory()
+    db.add(
+        Summary(
+            id=1,
+            thread_id=1,
+            summary_id="sum-1",
+            original_summary="Monitor arrived with a cracked screen",
+        )
+    )
+    db.commit()
+    db.close()
+    yield factory
+    engine.dispose()
+
+
+def _versions(session_factory) -> Dict[str, int]:
+    db = session_factory()
+    try:
+        return dict(db.query(TableVersion.table_name, TableVersion.version))
+    finally:
+        db.close()
+
+
+def test_writes_bump_only_their_table_version(session_factory):
+    # Installing the triggers again is a no-op
+    database_module._create_change_triggers()
+    assert _versions(session_factory) == {
+        "files": 0,
+        "threads": 0,
+        "messages": 0,
+        "summaries": 1,
+    }
+
+    db = session_factory()
+    db.query(Summary).filter(Summary.id == 1).update(
+        {Summary.status: SummaryStatus.APPROVED}
+    )
+    db.commit()
+    # Set-based statements that bypass the ORM unit of work count too
+    db.execute(update(Summary).values(remarks="Checked"))
+    db.commit()
+    db.query(Summary).delete()
+    db.commit()
+    db.close()
+
+    assert _versions(session_factory)["summaries"] == 4
+    assert _versions(session_factory)["threads"] == 0
+
+
+@pytest.fixture
+def client(session_factory, monkeypatch):
+    """Test client for the summaries routes."""
+    # The detail view streams its rows from a session of its own
+    monkeypatch.setattr(summary_payloads, "SessionLocal", session_factory)
+    app = FastAPI()
+    app.include_router(summaries.router)
+
+    def get_test_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = get_test_db
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.mark.parametrize("view", ["summary", "detail"])
+def test_unchanged_list_is_answered_with_304(client, view):
+    response = client.get("/api/summaries/", params={"view": view})
+    etag = response.headers["etag"]
+
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "no-cache"
+    revalidated = client.get(
+        "/api/summaries/", params={"view": view}, headers={"If-None-Match": etag}
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == etag
+    assert revalidated.content == b""
+
+
+def test_writes_and_other_parameters_change_the_etag(client, session_factory):
+    etag = client.get("/api/summaries/").headers["etag"]
+
+    filtered = client.get(
+        "/api/summaries/",
+        params={"status": "approved"},
+        headers={"If-None-Match": etag},
+    )
+    assert filtered.status_code == 200
+    assert filtered.headers["etag"] != etag
+
+    db = session_factory()
+    db.query(Summary).update({Summary.status: SummaryStatus.APPROVED})
+    db.commit()
+    db.close()
+
+    changed = client.get("/api/summaries/", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()[0]["status"] == "approved"
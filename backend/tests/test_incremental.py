@@ -0,0 +1,177 @@
+"""Tests for incremental summaries resumed from a rolling state."""
+
+import asyncio
+from typing import List
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import services.background.database_ops as database_ops
+from database import Base, Summary
+from database.models import (
+    CRMContextModel,
+    ExtractedContextModel,
+    MessageModel,
+    SummaryContentModel,
+    ThreadModel,
+    UsageModel,
+)
+from services.background.database_ops import (
+    apply_rolling_state,
+    get_incremental_states,
+)
+from services.background.fingerprints import prefix_fingerprint
+from services.openrouter import OpenRouterService
+
+BODIES = [
+    "My monitor arrived with a cracked screen.",
+    "Please send photos of the damage.",
+    "Photos attached, the stand is bent too.",
+]
+ROLLING_STATE = "Rolling notes: cracked screen, photos requested."
+
+
+def _thread_model(message_count: int = 3) -> ThreadModel:
+    return ThreadModel(
+        thread_id="T1",
+        topic="Damaged product",
+        subject="Damaged on arrival",
+        initiated_by="customer",
+        order_id="111-222",
+        product="LED Monitor",
+        messages=[
+            MessageModel(
+                id=f"m{number}",
+                sender="customer" if number % 2 == 0 else "company",
+                timestamp=f"2025-09-0{number + 1}T10:00:00Z",
+                body=body,
+            )
+            for number, body in enumerate(BODIES[:message_count])
+        ],
+    )
+
+
+def _summary_content() -> SummaryContentModel:
+    return SummaryContentModel(
+        issue_summary="Monitor arrived with a cracked screen and bent stand.",
+        key_details=CRMContextModel(order_id="111-222", product="LED Monitor"),
+        context_extraction=ExtractedContextModel(
+            issue_type="damaged product",
+            customer_sentiment="negative",
+            urgency_level="high",
+            customer_intent="replacement",
+        ),
+        resolution_status="pending",
+        full_summary_text="## Issue Summary\nCracked screen, bent stand.",
+    )
+
+
+@pytest.fixture
+def service(monkeypatch):
+    """Summarization service whose API calls are recorded instead of sent."""
+    service = OpenRouterService(api_key="test-key", model="test-model")
+    prompts: List[str] = []
+
+    async def call_api_with_usage(messages, **kwargs):
+        prompts.append("\n".join(message["content"] for message in messages))
+        response_text = _summary_content().model_dump_json()
+        return response_text, UsageModel(model="test-model", api_calls=1)
+
+    monkeypatch.setattr(service.client, "call_api_with_usage", call_api_with_usage)
+    service.prompts = prompts
+    return service
+
+
+def test_incremental_update_sends_only_new_messages(service):
+    summary, usage = asyncio.run(
+        service.summarize_thread_with_usage(
+            _thread_model(), resume_from=2, rolling_state=ROLLING_STATE
+        )
+    )
+
+    assert len(service.prompts) == 1
+    assert ROLLING_STATE in service.prompts[0]
+    assert BODIES[2] in service.prompts[0]
+    assert BODIES[0] not in service.prompts[0]
+    assert usage.api_calls == 1
+    assert summary.issue_summary == _summary_content().issue_summary
+
+
+def test_rolling_state_without_new_messages_summarizes_from_scratch(service):
+    asyncio.run(
+        service.summarize_thread_with_usage(
+            _thread_model(), resume_from=3, rolling_state=ROLLING_STATE
+        )
+    )
+
+    assert len(service.prompts) == 1
+    assert ROLLING_STATE not in service.prompts[0]
+    assert all(body in service.prompts[0] for body in BODIES)
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    """Session factory for a fresh database used by the incremental lookups."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'incremental.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(database_ops, "SessionLocal", factory)
+    yield factory
+    engine.dispose()
+
+
+def _store_summary(session_factory, thread_db_id: int, thread: ThreadModel) -> None:
+    db = session_factory()
+    summary_db = Summary(
+        thread_id=thread_db_id,
+        summary_id=f"sum-{thread_db_id}",
+        original_summary="Monitor arrived with a cracked screen",
+    )
+    apply_rolling_state(summary_db, thread, _summary_content())
+    db.add(summary_db)
+    db.commit()
+    db.close()
+
+
+def test_rolling_state_records_what_the_summary_covers(session_factory):
+    thread = _thread_model(2)
+    _store_summary(session_factory, 1, thread)
+
+    db = session_factory()
+    summary_db = db.query(Summary).one()
+    db.close()
+    assert summary_db.summarized_message_count == 2
+    assert summary_db.summarized_hash == prefix_fingerprint(_thread_model(), 2)
+    assert _summary_content().issue_summary in summary_db.rolling_state
+
+
+def test_only_threads_that_grew_from_the_summarized_prefix_resume(
+    session_factory, monkeypatch
+):
+    monkeypatch.setattr(database_ops, "LOOKUP_CHUNK_SIZE", 1)
+    for thread_db_id in (1, 2, 3):
+        _store_summary(session_factory, thread_db_id, _thread_model(2))
+
+    grown = _thread_model()
+    edited = _thread_model()
+    edited.messages[0] = edited.messages[0].model_copy(
+        update={"body": "Screen and stand both broken."}
+    )
+    unchanged = _thread_model(2)
+    states = get_incremental_states(
+        [
+            grown,
+            edited.model_copy(update={"thread_id": "T2"}),
+            unchanged.model_copy(update={"thread_id": "T3"}),
+        ],
+        {"T1": 1, "T2": 2, "T3": 3},
+    )
+
+    assert list(states) == ["T1"]
+    count, rolling_state = states["T1"]
+    assert count == 2
+    assert _summary_content().issue_summary in rolling_state
@@ -0,0 +1,379 @@
+"""Tests for request hedging and the OpenRouter circuit breaker."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+import services.openrouter.client as client_module
+from services.openrouter.client import OpenRouterClient
+from services.openrouter.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    LatencyTracker,
+    call_kind,
+)
+
+MESSAGES = [{"role": "user", "content": "Summarize this thread"}]
+
+
+def _completion(content: str = "ok") -> dict:
+    return {
+        "model": "test-model",
+        "choices": [{"message": {"content": content}}],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 2, "total_tokens": 12},
+    }
+
+
+def _open_breaker(breaker: CircuitBreaker) -> None:
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+
+@pytest.fixture
+def tracker(monkeypatch):
+    """Fresh latency tracker used by the client."""
+    tracker = LatencyTracker(enabled=True, pct=95, min_samples=3)
+    monkeypatch.setattr(client_module, "latency_tracker", tracker)
+    return tracker
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    """Fresh circuit breaker used by the client."""
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=0.05)
+    monkeypatch.setattr(client_module, "circuit_breaker", breaker)
+    return breaker
+
+
+def _client(handler) -> OpenRouterClient:
+    client = OpenRouterClient(api_key="test", model="test-model", cassette_mode="off")
+    client.client = httpx.AsyncClient(
+        base_url="https://openrouter.test", transport=httpx.MockTransport(handler)
+    )
+    return client
+
+
+def test_call_kind_uses_schema_name_and_stream_flag():
+    structured = {
+        "response_format": {
+            "type": "json_schema",
+            "json_schema": {"name": "email_thread_summary"},
+        }
+    }
+
+    assert call_kind(structured) == "email_thread_summary"
+    assert call_kind({**structured, "stream": True}) == "email_thread_summary:stream"
+    assert call_kind({}) == "text"
+
+
+def test_latency_windows_are_kept_per_model_and_kind():
+    tracker = LatencyTracker(enabled=True, pct=95, min_samples=3)
+    for latency_ms in (100, 200, 300):
+        tracker.record("fast-model", "email_thread_summary", latency_ms)
+    for latency_ms in (5000, 6000):
+        tracker.record("slow-model", "email_thread_summary", latency_ms)
+
+    assert tracker.hedge_delay("fast-model", "email_thread_summary") == 0.3
+    # Too few samples for the slow model, and none for another call kind
+    assert tracker.hedge_delay("slow-model", "email_thread_summary") is None
+    assert tracker.hedge_delay("fast-model", "running_notes") is None
+
+    stats = tracker.stats()
+    assert stats.samples == 5
+    assert [(w.model, w.samples) for w in stats.windows] == [
+        ("fast-model", 3),
+        ("slow-model", 2),
+    ]
+
+
+def test_disabled_tracker_never_hedges():
+    tracker = LatencyTracker(enabled=False, pct=95, min_samples=1)
+    tracker.record("model", "text", 100)
+
+    assert tracker.hedge_delay("model", "text") is None
+
+
+def test_breaker_opens_after_threshold_and_rejects_calls():
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=60)
+
+    async def scenario():
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        with pytest.raises(CircuitOpenError):
+            async with breaker.guard():
+                pass
+
+    asyncio.run(scenario())
+    assert breaker.rejected_calls == 1
+    assert breaker.opened_count == 1
+
+
+def test_success_resets_the_failure_count():
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=60)
+
+    async def scenario():
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+    asyncio.run(scenario())
+    assert breaker.state == CLOSED
+
+
+def test_half_open_admits_a_single_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.01)
+    events = []
+
+    async def call(name: str):
+        async with breaker.guard():
+            events.append(f"{name} start")
+            await asyncio.sleep(0.01)
+            events.append(f"{name} end")
+            breaker.record_success()
+
+    async def scenario():
+        _open_breaker(breaker)
+        await asyncio.sleep(0.02)
+        assert breaker.state == HALF_OPEN
+        await asyncio.gather(call("a"), call("b"), call("c"))
+
+    asyncio.run(scenario())
+    # Nobody else starts until the probe has finished
+    assert events[:2] == ["a start", "a end"]
+    assert breaker.state == CLOSED
+
+
+def test_waiters_run_concurrently_once_the_probe_succeeds():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.01)
+    started = []
+
+    async def probe():
+        async with breaker.guard():
+            started.append("probe")
+            await asyncio.sleep(0.05)
+            breaker.record_success()
+
+    async def waiter(name: str):
+        async with breaker.guard():
+            started.append(name)
+            await asyncio.sleep(0.05)
+
+    async def scenario():
+        _open_breaker(breaker)
+        await asyncio.sleep(0.02)
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        await asyncio.gather(probe(), waiter("a"), waiter("b"))
+        return loop.time() - started_at
+
+    elapsed = asyncio.run(scenario())
+    assert started[0] == "probe"
+    assert sorted(started[1:]) == ["a", "b"]
+    # The probe runs alone, then both waiters run together (not one by one)
+    assert elapsed < 0.14
+
+
+def test_failed_probe_reopens_and_rejects_waiters():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.01)
+    outcomes = []
+
+    async def call(name: str):
+        try:
+            async with breaker.guard():
+                await asyncio.sleep(0.005)
+                breaker.record_failure()
+                outcomes.append((name, "ran"))
+        except CircuitOpenError:
+            outcomes.append((name, "rejected"))
+
+    async def scenario():
+        _open_breaker(breaker)
+        await asyncio.sleep(0.02)
+        await asyncio.gather(call("probe"), call("waiter"))
+
+    asyncio.run(scenario())
+    assert outcomes == [("probe", "ran"), ("waiter", "rejected")]
+    assert breaker.state == OPEN
+    assert breaker.opened_count == 2
+
+
+def test_probe_without_a_result_hands_over_to_a_waiter():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.01)
+    probes = []
+
+    async def call(name: str, succeed: bool):
+        async with breaker.guard():
+            probes.append(name)
+            await asyncio.sleep(0.005)
+            if succeed:
+                breaker.record_success()
+
+    async def scenario():
+        _open_breaker(breaker)
+        await asyncio.sleep(0.02)
+        # The first probe gets a 4xx-like outcome and records nothing
+        await asyncio.gather(call("first", False), call("second", True))
+
+    asyncio.run(scenario())
+    assert probes == ["first", "second"]
+    assert breaker.state == CLOSED
+
+
+def test_wait_until_available_wakes_when_the_circuit_half_opens():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.05)
+
+    async def scenario():
+        _open_breaker(breaker)
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        await asyncio.wait_for(breaker.wait_until_available(), timeout=1)
+        return loop.time() - started_at
+
+    elapsed = asyncio.run(scenario())
+    assert 0.04 <= elapsed < 0.5
+    assert breaker.state == HALF_OPEN
+
+
+def test_wait_until_available_returns_at_once_when_closed():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=60)
+
+    asyncio.run(asyncio.wait_for(breaker.wait_until_available(), timeout=0.1))
+
+
+def test_server_errors_open_the_circuit_and_stop_requests(tracker, breaker):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(503, json={"error": "unavailable"})
+
+    async def scenario():
+        async with _client(handler) as client:
+            for _ in range(breaker.failure_threshold):
+                with pytest.raises(Exception, match="OpenRouter API error"):
+                    await client.call_api(MESSAGES)
+            with pytest.raises(CircuitOpenError):
+                await client.call_api(MESSAGES)
+
+    asyncio.run(scenario())
+    assert len(requests) == breaker.failure_threshold
+    assert breaker.state == OPEN
+
+
+def test_client_error_does_not_hold_the_probe(tracker, breaker):
+    statuses = iter([400, 200])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        status = next(statuses)
+        if status == 200:
+            return httpx.Response(200, json=_completion())
+        return httpx.Response(status, json={"error": "bad request"})
+
+    async def scenario():
+        _open_breaker(breaker)
+        await asyncio.sleep(0.06)
+        async with _client(handler) as client:
+            with pytest.raises(Exception, match="OpenRouter API error"):
+                await client.call_api(MESSAGES)
+            return await asyncio.wait_for(client.call_api(MESSAGES), timeout=1)
+
+    assert asyncio.run(scenario()) == "ok"
+    assert breaker.state == CLOSED
+
+
+def test_slow_request_is_hedged_and_the_duplicate_wins(tracker, breaker):
+    calls = 0
+    cancelled = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+        return httpx.Response(200, json=_completion("hedged"))
+
+    for latency_ms in (10, 10, 10):
+        tracker.record("test-model", "text", latency_ms)
+
+    async def scenario():
+        async with _client(handler) as client:
+            return await asyncio.wait_for(client.call_api(MESSAGES), timeout=0.5)
+
+    assert asyncio.run(scenario()) == "hedged"
+    assert calls == 2
+    assert cancelled == [True]
+    assert tracker.hedged_requests == 1
+    assert tracker.hedge_wins == 1
+
+
+def test_fast_request_is_not_hedged(tracker, breaker):
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(200, json=_completion())
+
+    for latency_ms in (1000, 1000, 1000):
+        tracker.record("test-model", "text", latency_ms)
+
+    async def scenario():
+        async with _client(handler) as client:
+            await client.call_api(MESSAGES)
+
+    asyncio.run(scenario())
+    assert calls == 1
+    assert tracker.hedged_requests == 0
+    # The successful call is recorded in its own window
+    assert tracker.stats().windows[0].samples == 4
+
+
+def test_hedge_delay_of_another_model_is_not_used(tracker, breaker):
+    calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json=_completion())
+
+    for latency_ms in (1, 1, 1):
+        tracker.record("other-model", "text", latency_ms)
+
+    async def scenario():
+        async with _client(handler) as client:
+            await client.call_api(MESSAGES)
+
+    asyncio.run(scenario())
+    assert calls == 1
+    assert tracker.hedged_requests == 0
+
+
+def test_failed_stream_and_its_fallback_count_as_one_failure(tracker, breaker):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content).get("stream", False))
+        return httpx.Response(503, json={"error": "unavailable"})
+
+    async def scenario():
+        async with _client(handler) as client:
+            with pytest.raises(Exception, match="OpenRouter API error"):
+                await client.call_api_stream(MESSAGES, max_retries=1)
+
+    asyncio.run(scenario())
+    # Streamed first, then the non-streaming fallback
+    assert requests == [True, False]
+    assert breaker.consecutive_failures == 1
+    assert breaker.state == CLOSED
@@ -0,0 +1,168 @@
+"""Tests for skipping unchanged threads and diffing messages on re-upload."""
+
+import asyncio
+from typing import List
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import services.background.database_ops as database_ops
+from database import Base, Message, Summary, Thread
+from database.models import MessageModel, SenderType, ThreadModel
+from services.background.database_ops import (
+    _apply_message_diff,
+    find_unchanged_threads,
+    prepare_thread_in_db,
+)
+
+
+def _message(message_id: str, body: str) -> MessageModel:
+    return MessageModel(
+        id=message_id,
+        sender="customer",
+        timestamp="2025-09-01T10:00:00Z",
+        body=body,
+    )
+
+
+def _thread_model(thread_id: str, messages: List[MessageModel]) -> ThreadModel:
+    return ThreadModel(
+        thread_id=thread_id,
+        topic="Damaged product",
+        subject="Damaged on arrival",
+        initiated_by="customer",
+        order_id="111-222",
+        product="LED Monitor",
+        messages=messages,
+    )
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    """Session factory for a fresh database used by the upload helpers."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'reupload.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(database_ops, "SessionLocal", factory)
+    yield factory
+    engine.dispose()
+
+
+def _summarize(session_factory, thread_db_id: int) -> None:
+    db = session_factory()
+    db.add(
+        Summary(
+            thread_id=thread_db_id,
+            summary_id=f"sum-{thread_db_id}",
+            original_summary="Monitor arrived with a cracked screen",
+        )
+    )
+    db.commit()
+    db.close()
+
+
+def _stored_messages(session_factory, thread_db_id: int):
+    db = session_factory()
+    try:
+        return {
+            row.message_id: (row.id, row.body)
+            for row in db.query(Message).filter(Message.thread_id == thread_db_id)
+        }
+    finally:
+        db.close()
+
+
+def test_only_unchanged_summarized_threads_are_skipped(session_factory, monkeypatch):
+    # One thread per lookup query
+    monkeypatch.setattr(database_ops, "LOOKUP_CHUNK_SIZE", 1)
+    messages = [_message("m1", "My monitor arrived with a cracked screen.")]
+    stored = {
+        thread_id: asyncio.run(
+            prepare_thread_in_db(_thread_model(thread_id, messages), None)
+        )
+        for thread_id in ("T1", "T2", "T3")
+    }
+    _summarize(session_factory, stored["T1"])
+    _summarize(session_factory, stored["T2"])
+
+    uploaded = [
+        _thread_model("T1", messages),
+        _thread_model("T2", messages + [_message("m2", "Any update?")]),
+        # Stored unchanged, but never summarized
+        _thread_model("T3", messages),
+        _thread_model("T4", messages),
+    ]
+    unchanged = asyncio.run(find_unchanged_threads(uploaded, file_id=7))
+
+    assert unchanged == {"T1": stored["T1"]}
+    db = session_factory()
+    file_ids = dict(db.query(Thread.thread_id, Thread.file_id))
+    db.close()
+    # Skipped threads are relinked to the new file, the others are untouched
+    assert file_ids == {"T1": 7, "T2": None, "T3": None}
+
+
+def test_reupload_writes_only_changed_messages(session_factory):
+    first = _thread_model(
+        "T1",
+        [
+            _message("m1", "My monitor arrived with a cracked screen."),
+            _message("m2", "Can I get a replacement?"),
+            _message("m3", "Hello?"),
+        ],
+    )
+    thread_db_id = asyncio.run(prepare_thread_in_db(first, None))
+    before = _stored_messages(session_factory, thread_db_id)
+
+    second = _thread_model(
+        "T1",
+        [
+            _message("m1", "My monitor arrived with a cracked screen."),
+            _message("m2", "Can I get a refund instead?"),
+            _message("m4", "Photos attached."),
+        ],
+    )
+    assert asyncio.run(prepare_thread_in_db(second, None)) == thread_db_id
+
+    after = _stored_messages(session_factory, thread_db_id)
+    assert set(after) == {"m1", "m2", "m4"}
+    # Edited and unchanged messages keep their rows
+    assert after["m1"] == before["m1"]
+    assert after["m2"] == (before["m2"][0], "Can I get a refund instead?")
+    assert after["m4"][1] == "Photos attached."
+    db = session_factory()
+    content_hash = db.get(Thread, thread_db_id).content_hash
+    db.close()
+    assert content_hash == database_ops.thread_fingerprint(second)
+
+
+def test_message_diff_fingerprints_legacy_rows_and_drops_duplicates(
+    session_factory,
+):
+    db = session_factory()
+    for body in ("Cracked screen.", "Cracked screen, again."):
+        # Stored before fingerprints existed
+        db.add(
+            Message(
+                thread_id=1,
+                message_id="m1",
+                sender=SenderType.CUSTOMER,
+                timestamp="2025-09-01T10:00:00Z",
+                body=body,
+            )
+        )
+    db.commit()
+
+    _apply_message_diff(db, 1, [_message("m1", "Cracked screen.")])
+    db.commit()
+
+    rows = db.query(Message).filter(Message.thread_id == 1).all()
+    assert [(row.message_id, row.body) for row in rows] == [("m1", "Cracked screen.")]
+    assert rows[0].content_hash == database_ops.message_fingerprint(
+        "customer", "2025-09-01T10:00:00Z", "Cracked screen."
+    )
+    db.close()
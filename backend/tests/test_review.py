@@ -0,0 +1,309 @@
+"""Tests for review queue leases and the summary workflow endpoints."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from database import Base, Summary, get_db
+from database.models import SummaryStatus
+from routers import review, summaries
+from services.event_bus import event_bus
+from services.similar_cases import SimilarCasesIndex
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """Session factory for a fresh database with two pending summaries."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'review.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    db = factory()
+    for number in (1, 2):
+        db.add(
+            Summary(
+                id=number,
+                thread_id=number,
+                summary_id=f"sum-{number}",
+                original_summary="Monitor arrived with a cracked screen",
+                status=SummaryStatus.PENDING,
+                review_priority=number,
+            )
+        )
+    db.commit()
+    db.close()
+    yield factory
+    engine.dispose()
+
+
+@pytest.fixture
+def client(session_factory):
+    """Test client for the summaries and review routes."""
+    app = FastAPI()
+    app.include_router(summaries.router)
+    app.include_router(review.router)
+
+    def get_test_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = get_test_db
+    with TestClient(app) as client:
+        yield client
+
+
+def _summary(session_factory, summary_id: str) -> Summary:
+    db = session_factory()
+    try:
+        return db.query(Summary).filter(Summary.summary_id == summary_id).one()
+    finally:
+        db.close()
+
+
+def _claim(client, reviewer: str) -> str:
+    response = client.post("/api/review/next", json={"reviewer": reviewer})
+    assert response.status_code == 200
+    return response.json()["summary"]["id"]
+
+
+def test_reviewers_claim_different_summaries(client):
+    first = _claim(client, "ana")
+    second = _claim(client, "ben")
+
+    # Highest priority first
+    assert (first, second) == ("sum-2", "sum-1")
+    assert client.post("/api/review/next", json={"reviewer": "cy"}).status_code == 204
+
+
+@pytest.mark.parametrize(
+    "action, body",
+    [("approve", {"remarks": "Looks right"}), ("reject", {"reason": "Wrong order"})],
+)
+def test_action_on_summary_leased_to_another_reviewer_conflicts(
+    client, session_factory, action, body
+):
+    summary_id = _claim(client, "ana")
+
+    for reviewer in ("ben", None):
+        response = client.post(
+            f"/api/summaries/{summary_id}/{action}", json={**body, "reviewer": reviewer}
+        )
+        assert response.status_code == 409
+
+    summary_db = _summary(session_factory, summary_id)
+    assert summary_db.status == SummaryStatus.PENDING
+    assert summary_db.claimed_by == "ana"
+
+
+def test_lease_holder_can_approve_and_the_claim_ends(client, session_factory):
+    summary_id = _claim(client, "ana")
+
+    response = client.post(
+        f"/api/summaries/{summary_id}/approve",
+        json={"remarks": "Looks right", "reviewer": "ana"},
+    )
+
+    assert response.status_code == 200
+    summary_db = _summary(session_factory, summary_id)
+    assert summary_db.status == SummaryStatus.APPROVED
+    assert summary_db.approved_by == "ana"
+    assert summary_db.claimed_by is None
+    assert summary_db.lease_expires_at is None
+
+
+def test_expired_lease_does_not_block_other_reviewers(client, session_factory):
+    summary_id = _claim(client, "ana")
+    db = session_factory()
+    db.query(Summary).filter(Summary.summary_id == summary_id).update(
+        {Summary.lease_expires_at: datetime.utcnow() - timedelta(seconds=1)}
+    )
+    db.commit()
+    db.close()
+
+    response = client.post(
+        f"/api/summaries/{summary_id}/reject",
+        json={"reason": "Wrong order", "reviewer": "ben"},
+    )
+
+    assert response.status_code == 200
+    assert _summary(session_factory, summary_id).status == SummaryStatus.REJECTED
+
+
+def test_unclaimed_summary_can_be_approved_anonymously(client, session_factory):
+    response = client.post("/api/summaries/sum-1/approve", json={"remarks": "Fine"})
+
+    assert response.status_code == 200
+    assert _summary(session_factory, "sum-1").approved_by == "system"
+
+
+def test_only_the_lease_holder_can_renew_or_release(client):
+    summary_id = _claim(client, "ana")
+
+    for path in ("renew", "release"):
+        response = client.post(
+            f"/api/review/{summary_id}/{path}", json={"reviewer": "ben"}
+        )
+        assert response.status_code == 409
+
+    renewed = client.post(f"/api/review/{summary_id}/renew", json={"reviewer": "ana"})
+    assert renewed.status_code == 200
+    released = client.post(
+        f"/api/review/{summary_id}/release", json={"reviewer": "ana"}
+    )
+    assert released.status_code == 204
+    # Back in the queue
+    assert _claim(client, "ben") == summary_id
+
+
+def test_undo_on_summary_leased_to_another_reviewer_conflicts(client, session_factory):
+    summary_id = _claim(client, "ana")
+
+    assert client.post(f"/api/summaries/{summary_id}/undo").status_code == 409
+    response = client.post(
+        f"/api/summaries/{summary_id}/undo", json={"reviewer": "ben"}
+    )
+    assert response.status_code == 409
+    assert _summary(session_factory, summary_id).claimed_by == "ana"
+
+    response = client.post(
+        f"/api/summaries/{summary_id}/undo", json={"reviewer": "ana"}
+    )
+    assert response.status_code == 200
+    assert _summary(session_factory, summary_id).claimed_by is None
+
+
+def test_bulk_action_skips_summaries_leased_to_another_reviewer(
+    client, session_factory
+):
+    summary_id = _claim(client, "ana")
+
+    response = client.post(
+        "/api/summaries/bulk",
+        json={
+            "action": "approve",
+            "remarks": "Checked in triage",
+            "reviewer": "ben",
+            "summary_ids": ["sum-1", "sum-2", "sum-9"],
+        },
+    )
+
+    assert response.status_code == 200
+    results = {result["id"]: result for result in response.json()["results"]}
+    assert response.json()["updated"] == 1
+    assert results["sum-1"]["updated"] is True
+    assert results[summary_id] == {
+        "id": summary_id,
+        "updated": False,
+        "status": None,
+        "detail": "Summary is leased to another reviewer",
+    }
+    assert results["sum-9"]["detail"] == "Summary not found"
+    summary_db = _summary(session_factory, summary_id)
+    assert summary_db.status == SummaryStatus.PENDING
+    assert summary_db.claimed_by == "ana"
+
+
+def test_bulk_filter_reports_leased_summaries(client, session_factory):
+    summary_id = _claim(client, "ana")
+
+    response = client.post(
+        "/api/summaries/bulk",
+        json={
+            "action": "reject",
+            "reason": "Wrong order",
+            "filter": {"status": "pending"},
+        },
+    )
+
+    results = response.json()["results"]
+    assert [(r["id"], r["updated"]) for r in results] == [
+        ("sum-1", True),
+        (summary_id, False),
+    ]
+    assert _summary(session_factory, summary_id).status == SummaryStatus.PENDING
+
+
+def test_lease_holder_can_use_bulk_actions(client, session_factory):
+    summary_id = _claim(client, "ana")
+
+    response = client.post(
+        "/api/summaries/bulk",
+        json={
+            "action": "approve",
+            "remarks": "Checked",
+            "reviewer": "ana",
+            "summary_ids": [summary_id],
+        },
+    )
+
+    assert response.json()["updated"] == 1
+    summary_db = _summary(session_factory, summary_id)
+    assert summary_db.approved_by == "ana"
+    assert summary_db.claimed_by is None
+
+
+def test_bulk_ids_are_updated_chunk_by_chunk_in_one_statement_each(
+    client, session_factory, monkeypatch
+):
+    monkeypatch.setattr(summaries, "LOOKUP_CHUNK_SIZE", 1)
+    index = SimilarCasesIndex()
+    index.loaded = True
+    monkeypatch.setattr(summaries, "similar_cases_index", index)
+    updates = []
+
+    def record_update(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("UPDATE summaries"):
+            updates.append(statement)
+
+    engine = session_factory.kw["bind"]
+    event.listen(engine, "before_cursor_execute", record_update)
+    events = event_bus.subscribe()
+    try:
+        response = client.post(
+            "/api/summaries/bulk",
+            json={
+                "action": "approve",
+                "remarks": "Checked in triage",
+                "summary_ids": ["sum-2", "sum-1", "sum-2", "sum-9"],
+            },
+        )
+    finally:
+        event_bus.unsubscribe(events)
+        event.remove(engine, "before_cursor_execute", record_update)
+
+    assert response.json()["updated"] == 2
+    # Deduplicated, in request order
+    assert [(r["id"], r["updated"]) for r in response.json()["results"]] == [
+        ("sum-2", True),
+        ("sum-1", True),
+        ("sum-9", False),
+    ]
+    assert len(updates) == 3
+    assert all("RETURNING" in statement for statement in updates)
+    published = events.get_nowait()
+    assert published["type"] == "summaries_updated"
+    assert published["summary_ids"] == ["sum-1", "sum-2"]
+    assert events.empty()
+    assert len(index) == 2
+    for summary_id in ("sum-1", "sum-2"):
+        summary_db = _summary(session_factory, summary_id)
+        assert summary_db.status == SummaryStatus.APPROVED
+        assert summary_db.remarks == "Checked in triage"
+
+    undone = client.post(
+        "/api/summaries/bulk",
+        json={"action": "undo", "summary_ids": ["sum-1", "sum-2"]},
+    )
+
+    assert undone.json()["updated"] == 2
+    assert len(index) == 0
+    assert _summary(session_factory, "sum-1").status == SummaryStatus.PENDING
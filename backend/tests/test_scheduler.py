@@ -0,0 +1,222 @@
+"""Tests for the LLM call scheduler lanes and fair queuing."""
+
+import asyncio
+from typing import Any, List, Optional
+
+import pytest
+
+from services.background.scheduler import (
+    BULK_LANE,
+    INTERACTIVE_LANE,
+    LLMScheduler,
+)
+
+
+async def _queue(
+    scheduler: LLMScheduler,
+    order: List[str],
+    name: str,
+    flow_id: Optional[str] = None,
+    priority: Any = 0,
+) -> asyncio.Task:
+    """Queue a bulk item that records its name when it is dispatched."""
+
+    async def item():
+        async with scheduler.slot(BULK_LANE, priority, flow_id=flow_id):
+            order.append(name)
+            await asyncio.sleep(0)
+
+    task = asyncio.create_task(item())
+    # Let the item reach the scheduler queue
+    await asyncio.sleep(0)
+    return task
+
+
+async def _run_queued(scheduler: LLMScheduler, queue_items) -> List[str]:
+    """Queue items behind a blocked slot, then let them run one at a time.
+
+    The scheduler has a single slot, held by an interactive item until
+    everything is queued, so the recorded order is the dispatch order.
+    """
+    order: List[str] = []
+    release = asyncio.Event()
+
+    async def blocker():
+        async with scheduler.slot(INTERACTIVE_LANE):
+            await release.wait()
+
+    blocking = asyncio.create_task(blocker())
+    await asyncio.sleep(0)
+    tasks = await queue_items(order)
+    release.set()
+    await asyncio.gather(blocking, *tasks)
+    return order
+
+
+def test_items_in_a_flow_run_by_priority_then_arrival():
+    async def queue_items(order):
+        items = [("c", 3), ("a", 1), ("b1", 2), ("b2", 2)]
+        return [
+            await _queue(scheduler, order, name, "upload", priority)
+            for name, priority in items
+        ]
+
+    scheduler = LLMScheduler(max_in_flight=1, interactive_reserved=0)
+
+    assert asyncio.run(_run_queued(scheduler, queue_items)) == ["a", "b1", "b2", "c"]
+
+
+def test_small_flow_is_not_starved_by_a_large_backlog():
+    async def queue_items(order):
+        tasks = [await _queue(scheduler, order, f"big{i}", "big") for i in range(6)]
+        tasks += [
+            await _queue(scheduler, order, f"small{i}", "small") for i in range(2)
+        ]
+        return tasks
+
+    scheduler = LLMScheduler(max_in_flight=1, interactive_reserved=0)
+    order = asyncio.run(_run_queued(scheduler, queue_items))
+
+    assert order[:4] == ["big0", "small0", "big1", "small1"]
+
+
+def test_flows_share_slots_equally():
+    async def queue_items(order):
+        tasks = []
+        for flow in ("a", "b", "c"):
+            tasks += [await _queue(scheduler, order, flow, flow) for _ in range(4)]
+        return tasks
+
+    scheduler = LLMScheduler(max_in_flight=1, interactive_reserved=0)
+    order = asyncio.run(_run_queued(scheduler, queue_items))
+
+    assert order == ["a", "b", "c"] * 4
+
+
+def test_new_flow_starts_at_the_current_virtual_time():
+    scheduler = LLMScheduler(max_in_flight=1, interactive_reserved=0)
+
+    async def scenario():
+        order: List[str] = []
+        late_tasks: List[asyncio.Task] = []
+
+        async def old_item(i: int):
+            async with scheduler.slot(BULK_LANE, i, flow_id="old"):
+                order.append("old")
+                if i == 3:
+                    # A new upload arrives after the old one has had 4 slots
+                    for _ in range(3):
+                        late_tasks.append(await _queue(scheduler, order, "new", "new"))
+
+        tasks = []
+        for i in range(8):
+            tasks.append(asyncio.create_task(old_item(i)))
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+        await asyncio.gather(*late_tasks)
+        return order
+
+    order = asyncio.run(scenario())
+
+    # The idle time of the new flow earns it no burst: it alternates
+    # with the old flow instead of taking every slot first
+    assert order[:4] == ["old"] * 4
+    assert order[4:10] == ["new", "old", "new", "old", "new", "old"]
+
+
+def test_interactive_work_uses_the_reserved_slot():
+    scheduler = LLMScheduler(max_in_flight=2, interactive_reserved=1)
+
+    async def scenario():
+        release = asyncio.Event()
+        started: List[str] = []
+
+        async def item(lane: str, name: str):
+            async with scheduler.slot(lane):
+                started.append(name)
+                await release.wait()
+
+        tasks = [
+            asyncio.create_task(item(BULK_LANE, "bulk1")),
+            asyncio.create_task(item(BULK_LANE, "bulk2")),
+        ]
+        await asyncio.sleep(0)
+        # Bulk work is capped below the global limit
+        assert started == ["bulk1"]
+
+        tasks.append(asyncio.create_task(item(INTERACTIVE_LANE, "interactive")))
+        await asyncio.sleep(0)
+        assert started == ["bulk1", "interactive"]
+
+        stats = {lane.lane: lane for lane in scheduler.stats().lanes}
+        assert stats[BULK_LANE].in_flight == 1
+        assert stats[BULK_LANE].queued == 1
+        assert stats[INTERACTIVE_LANE].in_flight == 1
+
+        release.set()
+        await asyncio.gather(*tasks)
+        return started
+
+    assert asyncio.run(scenario()) == ["bulk1", "interactive", "bulk2"]
+
+
+def test_interactive_work_is_dispatched_before_queued_bulk_work():
+    async def queue_items(order):
+        tasks = [await _queue(scheduler, order, "bulk", "upload") for _ in range(2)]
+
+        async def interactive():
+            async with scheduler.slot(INTERACTIVE_LANE):
+                order.append("interactive")
+
+        tasks.append(asyncio.create_task(interactive()))
+        await asyncio.sleep(0)
+        return tasks
+
+    scheduler = LLMScheduler(max_in_flight=1, interactive_reserved=0)
+
+    assert asyncio.run(_run_queued(scheduler, queue_items)) == [
+        "interactive",
+        "bulk",
+        "bulk",
+    ]
+
+
+def test_cancelled_waiter_gives_up_its_place():
+    scheduler = LLMScheduler(max_in_flight=1, interactive_reserved=0)
+
+    async def scenario():
+        async def queue_items(order):
+            cancelled = await _queue(scheduler, order, "cancelled", "upload")
+            kept = await _queue(scheduler, order, "kept", "upload")
+            cancelled.cancel()
+            await asyncio.sleep(0)
+            return [kept]
+
+        order = await _run_queued(scheduler, queue_items)
+        stats = {lane.lane: lane for lane in scheduler.stats().lanes}
+        return order, stats
+
+    order, stats = asyncio.run(scenario())
+
+    assert order == ["kept"]
+    assert stats[BULK_LANE].in_flight == 0
+    assert stats[BULK_LANE].queued == 0
+    assert stats[BULK_LANE].flows == []
+
+
+def test_failed_work_releases_its_slot():
+    scheduler = LLMScheduler(max_in_flight=1, interactive_reserved=0)
+
+    async def enter():
+        async with scheduler.slot(BULK_LANE, flow_id="upload"):
+            pass
+
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            async with scheduler.slot(BULK_LANE, flow_id="upload"):
+                raise RuntimeError("LLM call failed")
+        await asyncio.wait_for(enter(), timeout=0.5)
+
+    asyncio.run(scenario())
+    stats = {lane.lane: lane for lane in scheduler.stats().lanes}
+    assert stats[BULK_LANE].in_flight == 0
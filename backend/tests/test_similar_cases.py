@@ -0,0 +1,307 @@
+"""Tests for the similar past cases index."""
+
+import asyncio
+import math
+import random
+import threading
+from typing import Dict, List
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import services.similar_cases as similar_cases
+from database import Base, Summary
+from database.models import SummaryStatus
+from services.similar_cases import SimilarCasesIndex, summary_features
+
+
+def _random_documents(count: int, seed: int = 7) -> Dict[int, Dict[int, float]]:
+    rng = random.Random(seed)
+    return {
+        doc_id: {
+            rng.randrange(200): 1 + math.log(rng.randint(1, 3))
+            for _ in range(rng.randint(3, 12))
+        }
+        for doc_id in range(1, count + 1)
+    }
+
+
+def _brute_force(
+    documents: Dict[int, Dict[int, float]], query: Dict[int, float], k: int
+) -> List[int]:
+    """Rank documents by lnc.ltc cosine similarity."""
+    df: Dict[int, int] = {}
+    for features in documents.values():
+        for feature in features:
+            df[feature] = df.get(feature, 0) + 1
+    weights = {
+        f: tf * (math.log((1 + len(documents)) / (1 + df.get(f, 0))) + 1)
+        for f, tf in query.items()
+    }
+    query_norm = math.sqrt(sum(w * w for w in weights.values()))
+    scores = {}
+    for doc_id, features in documents.items():
+        norm = math.sqrt(sum(v * v for v in features.values()))
+        score = sum(weights[f] * v / norm for f, v in features.items() if f in weights)
+        if score > 0:
+            scores[doc_id] = score / query_norm
+    return sorted(scores, key=lambda doc_id: -scores[doc_id])[:k]
+
+
+def _loaded_index() -> SimilarCasesIndex:
+    index = SimilarCasesIndex()
+    index.loaded = True
+    return index
+
+
+def test_query_matches_brute_force_across_segment_and_tail(monkeypatch):
+    # Merge often so matches come from both the segment and the tail
+    monkeypatch.setattr(similar_cases, "TAIL_MERGE_MIN_ROWS", 40)
+    documents = _random_documents(300)
+    index = _loaded_index()
+    for doc_id, features in documents.items():
+        index.add(doc_id, features)
+
+    for query_id in (1, 150, 300):
+        query = documents[query_id]
+        matches = index.query(query, k=5)
+
+        assert [doc_id for doc_id, _ in matches] == _brute_force(documents, query, 5)
+        assert matches[0][0] == query_id
+
+
+def test_removed_and_excluded_summaries_are_not_returned():
+    index = _loaded_index()
+    index.add(1, {10: 1.0, 11: 1.0})
+    index.add(2, {10: 1.0, 11: 1.0})
+    index.add(3, {10: 1.0, 12: 1.0})
+
+    index.remove(2)
+
+    assert [doc_id for doc_id, _ in index.query({10: 1.0, 11: 1.0}, exclude=1)] == [3]
+    assert len(index) == 2
+
+
+def test_adding_a_summary_again_replaces_its_features():
+    index = _loaded_index()
+    index.add(1, {10: 1.0})
+    index.add(1, {20: 1.0})
+
+    assert index.query({10: 1.0}) == []
+    assert [doc_id for doc_id, _ in index.query({20: 1.0})] == [1]
+    assert len(index) == 1
+
+
+def test_empty_queries_and_index_return_nothing():
+    index = _loaded_index()
+
+    assert index.query({10: 1.0}) == []
+    index.add(1, {10: 1.0})
+    assert index.query({}) == []
+    assert index.query({10: 1.0}, k=0) == []
+
+
+def test_changes_before_loading_are_ignored():
+    index = SimilarCasesIndex()
+    index.add(1, {10: 1.0})
+
+    assert len(index) == 0
+
+
+def test_summary_features_skip_stopwords_and_add_labels():
+    features = summary_features(None, "The customer wants a replacement monitor")
+
+    assert similar_cases._feature("replacement") in features
+    assert similar_cases._feature("monitor") in features
+    assert similar_cases._feature("the") not in features
+    assert similar_cases._feature("customer") not in features
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """Session factory for a fresh database with a few summaries."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'similar.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    db = factory()
+    statuses = [
+        SummaryStatus.APPROVED,
+        SummaryStatus.APPROVED,
+        SummaryStatus.PENDING,
+        SummaryStatus.REJECTED,
+    ]
+    texts = [
+        "Monitor arrived with a cracked screen, replacement shipped",
+        "Cracked screen on delivery, replacement approved",
+        "Cracked screen reported, waiting for photos",
+        "Refund for a late delivery",
+    ]
+    for number, (status, text) in enumerate(zip(statuses, texts), start=1):
+        db.add(
+            Summary(
+                id=number,
+                thread_id=number,
+                summary_id=f"sum-{number}",
+                original_summary=text,
+                status=status,
+            )
+        )
+    db.commit()
+    db.close()
+    yield factory
+    engine.dispose()
+
+
+def test_ensure_loaded_indexes_approved_summaries_in_a_worker_thread(
+    session_factory, monkeypatch
+):
+    build_threads = []
+    build_index = similar_cases._build_index
+
+    def recording_build(factory):
+        build_threads.append(threading.current_thread())
+        return build_index(factory)
+
+    monkeypatch.setattr(similar_cases, "_build_index", recording_build)
+    index = SimilarCasesIndex()
+
+    async def scenario():
+        # Concurrent first lookups share one build
+        return await asyncio.gather(
+            index.ensure_loaded(session_factory),
+            index.ensure_loaded(session_factory),
+        )
+
+    loaded = asyncio.run(scenario())
+
+    assert loaded == [index, index]
+    assert len(build_threads) == 1
+    assert build_threads[0] is not threading.main_thread()
+    assert index.loaded
+    matches = index.query(summary_features(None, "cracked screen replacement"))
+    assert sorted(doc_id for doc_id, _ in matches) == [1, 2]
+
+
+def test_changes_during_the_build_are_replayed(session_factory, monkeypatch):
+    started = threading.Event()
+    resume = threading.Event()
+    build_index = similar_cases._build_index
+
+    def slow_build(factory):
+        started.set()
+        resume.wait(timeout=5)
+        return build_index(factory)
+
+    monkeypatch.setattr(similar_cases, "_build_index", slow_build)
+    index = SimilarCasesIndex()
+
+    async def scenario():
+        loading = asyncio.create_task(index.ensure_loaded(session_factory))
+        await asyncio.to_thread(started.wait, 5)
+        # A summary is approved and another un-approved while the build runs
+        index.add(3, summary_features(None, "Cracked screen reported"))
+        index.remove(1)
+        resume.set()
+        await loading
+
+    asyncio.run(scenario())
+
+    matches = index.query(summary_features(None, "cracked screen"))
+    assert sorted(doc_id for doc_id, _ in matches) == [2, 3]
+
+
+def test_failed_build_is_retried(session_factory, monkeypatch):
+    attempts = []
+    build_index = similar_cases._build_index
+
+    def flaky_build(factory):
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("database is locked")
+        return build_index(factory)
+
+    monkeypatch.setattr(similar_cases, "_build_index", flaky_build)
+    index = SimilarCasesIndex()
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(index.ensure_loaded(session_factory))
+    assert not index.loaded
+
+    asyncio.run(index.ensure_loaded(session_factory))
+    assert index.loaded
+    assert len(index) == 2
+
+
+def test_removals_update_document_frequencies_right_away(monkeypatch):
+    monkeypatch.setattr(similar_cases, "TAIL_MERGE_MIN_ROWS", 40)
+    documents = _random_documents(300)
+    index = _loaded_index()
+    for doc_id, features in documents.items():
+        index.add(doc_id, features)
+    # From the segment and from the tail, without a merge in between
+    removed = list(range(1, 300, 7))
+    for doc_id in removed:
+        index.remove(doc_id)
+        del documents[doc_id]
+
+    expected_df = np.zeros(similar_cases.N_FEATURES, dtype=np.int32)
+    for features in documents.values():
+        expected_df[list(features)] += 1
+    assert np.array_equal(index._df, expected_df)
+    for query_id in (2, 151, 300):
+        query = documents[query_id]
+        matches = index.query(query, k=5)
+        assert [doc_id for doc_id, _ in matches] == _brute_force(documents, query, 5)
+
+
+def test_merge_runs_in_a_worker_thread_and_keeps_changes_made_meanwhile(
+    monkeypatch,
+):
+    monkeypatch.setattr(similar_cases, "TAIL_MERGE_MIN_ROWS", 10)
+    documents = _random_documents(60)
+    merge_threads = []
+    started = threading.Event()
+    resume = threading.Event()
+    merge_segment = similar_cases._merge_segment
+
+    def slow_merge(*args):
+        merge_threads.append(threading.current_thread())
+        started.set()
+        resume.wait(timeout=5)
+        return merge_segment(*args)
+
+    monkeypatch.setattr(similar_cases, "_merge_segment", slow_merge)
+    index = _loaded_index()
+
+    async def scenario():
+        for doc_id in range(1, 11):
+            index.add(doc_id, documents[doc_id])
+        merging = index._merge_task
+        assert merging is not None
+        await asyncio.to_thread(started.wait, 5)
+        # Approvals and removals keep working while the merge runs
+        for doc_id in range(11, 61):
+            index.add(doc_id, documents[doc_id])
+        for doc_id in (3, 12, 40):
+            index.remove(doc_id)
+            del documents[doc_id]
+        index.add(5, documents[6])
+        documents[5] = documents[6]
+        resume.set()
+        await merging
+
+    asyncio.run(scenario())
+
+    assert merge_threads and merge_threads[0] is not threading.main_thread()
+    assert len(index) == len(documents)
+    for query_id in (1, 5, 20, 60):
+        query = documents[query_id]
+        matches = index.query(query, k=5)
+        assert sorted(doc_id for doc_id, _ in matches) == sorted(
+            _brute_force(documents, query, 5)
+        )
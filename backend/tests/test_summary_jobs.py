@@ -0,0 +1,230 @@
+"""Tests for on-demand summary jobs and single-flight coalescing."""
+
+import asyncio
+from typing import List, Optional
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import services.background.summary_jobs as summary_jobs
+from database import Base, Thread, get_db
+from database.models import (
+    CRMContextModel,
+    ExtractedContextModel,
+    MessageModel,
+    SenderType,
+    SummaryContentModel,
+    ThreadModel,
+    UsageModel,
+)
+from routers import summaries
+from services.background.summary_jobs import run_summary_job, start_summary_job
+from services.background.task_manager import BackgroundTaskManager
+from services.event_bus import event_bus
+
+
+def _thread_model(thread_id: str = "T1") -> ThreadModel:
+    return ThreadModel(
+        thread_id=thread_id,
+        topic="Damaged product",
+        subject="Damaged on arrival",
+        initiated_by="customer",
+        order_id="111-222",
+        product="LED Monitor",
+        messages=[
+            MessageModel(
+                id=f"{thread_id}-0",
+                sender="customer",
+                timestamp="2025-09-01T10:00:00Z",
+                body="My monitor arrived with a cracked screen.",
+            )
+        ],
+    )
+
+
+def _summary_content() -> SummaryContentModel:
+    return SummaryContentModel(
+        issue_summary="Monitor arrived with a cracked screen.",
+        key_details=CRMContextModel(order_id="111-222", product="LED Monitor"),
+        context_extraction=ExtractedContextModel(
+            issue_type="damaged product",
+            customer_sentiment="negative",
+            urgency_level="high",
+            customer_intent="replacement",
+        ),
+        resolution_status="pending",
+        full_summary_text="## Issue Summary\nCracked screen.",
+    )
+
+
+@pytest.fixture(autouse=True)
+def no_jobs_in_flight(monkeypatch):
+    """Start every test with an empty in-flight job table."""
+    monkeypatch.setattr(summary_jobs, "_in_flight_jobs", {})
+
+
+@pytest.fixture
+def fake_service(monkeypatch):
+    """Replace OpenRouter with a service that waits until released."""
+
+    class FakeService:
+        calls: List[str] = []
+        release: asyncio.Event
+        error: Optional[Exception] = None
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc_info):
+            return None
+
+        async def summarize_thread_with_usage(self, thread, **kwargs):
+            FakeService.calls.append(thread.thread_id)
+            await FakeService.release.wait()
+            if FakeService.error is not None:
+                raise FakeService.error
+            return _summary_content(), UsageModel(model="test-model", api_calls=1)
+
+    async def save_regenerated_summary(thread_db_id, thread_id, *args):
+        return f"sum-{thread_id}"
+
+    monkeypatch.setattr(summary_jobs, "OpenRouterService", FakeService)
+    monkeypatch.setattr(summary_jobs, "INCREMENTAL_SUMMARIES", False)
+    monkeypatch.setattr(
+        summary_jobs, "save_regenerated_summary", save_regenerated_summary
+    )
+    return FakeService
+
+
+def test_requests_for_a_running_thread_join_its_job():
+    task_manager = BackgroundTaskManager()
+
+    first_id, first_coalesced = start_summary_job("T1", task_manager)
+    second_id, second_coalesced = start_summary_job("T1", task_manager)
+    other_id, other_coalesced = start_summary_job("T2", task_manager)
+
+    assert (first_coalesced, second_coalesced, other_coalesced) == (
+        False,
+        True,
+        False,
+    )
+    assert second_id == first_id
+    assert other_id != first_id
+
+
+def test_finished_job_publishes_summary_ready_and_leaves_flight(fake_service):
+    task_manager = BackgroundTaskManager()
+
+    async def scenario():
+        events = event_bus.subscribe()
+        fake_service.release = asyncio.Event()
+        job_id, _ = start_summary_job("T1", task_manager)
+        running = asyncio.create_task(
+            run_summary_job(job_id, _thread_model(), 1, "file-1", task_manager)
+        )
+        await asyncio.sleep(0)
+        # Joined while the LLM call is running: no second call is made
+        assert start_summary_job("T1", task_manager) == (job_id, True)
+        fake_service.release.set()
+        await running
+        event_bus.unsubscribe(events)
+        return job_id, events.get_nowait()
+
+    job_id, ready = asyncio.run(scenario())
+
+    assert fake_service.calls == ["T1"]
+    assert ready["type"] == "summary_ready"
+    assert ready["job_id"] == job_id
+    assert ready["status"] == "completed"
+    assert ready["summary_id"] == "sum-T1"
+    assert task_manager.get_task_status(job_id)["summary_id"] == "sum-T1"
+    # The next request starts a fresh job
+    assert start_summary_job("T1", task_manager)[1] is False
+
+
+def test_failed_job_reports_the_error_and_leaves_flight(fake_service):
+    task_manager = BackgroundTaskManager()
+    fake_service.error = RuntimeError("upstream timeout")
+
+    async def scenario():
+        events = event_bus.subscribe()
+        fake_service.release = asyncio.Event()
+        fake_service.release.set()
+        job_id, _ = start_summary_job("T1", task_manager)
+        await run_summary_job(job_id, _thread_model(), 1, None, task_manager)
+        event_bus.unsubscribe(events)
+        return events.get_nowait()
+
+    ready = asyncio.run(scenario())
+
+    assert ready["status"] == "failed"
+    assert "upstream timeout" in ready["message"]
+    assert summary_jobs._in_flight_jobs == {}
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Test client for the summaries routes over a database with one thread."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'jobs.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    db = factory()
+    db.add(
+        Thread(
+            thread_id="T1",
+            topic="Damaged product",
+            subject="Damaged on arrival",
+            initiated_by=SenderType.CUSTOMER,
+            order_id="111-222",
+            product="LED Monitor",
+        )
+    )
+    db.commit()
+    db.close()
+
+    started: List[str] = []
+
+    async def record_job(job_id, **kwargs):
+        started.append(job_id)
+
+    monkeypatch.setattr(summaries, "run_summary_job", record_job)
+    app = FastAPI()
+    app.include_router(summaries.router)
+
+    def get_test_db():
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = get_test_db
+    with TestClient(app, raise_server_exceptions=False) as client:
+        client.started = started
+        yield client
+    engine.dispose()
+
+
+def test_thread_that_fails_to_load_does_not_leave_a_job_in_flight(client, monkeypatch):
+    def broken_load(db, thread_db):
+        raise ValueError("corrupted message")
+
+    monkeypatch.setattr(summaries, "load_thread_model", broken_load)
+    response = client.post("/api/summaries/threads/T1/summarize", json={})
+    assert response.status_code == 500
+    assert summary_jobs._in_flight_jobs == {}
+
+    monkeypatch.setattr(
+        summaries, "load_thread_model", lambda db, thread_db: _thread_model()
+    )
+    response = client.post("/api/summaries/threads/T1/summarize", json={})
+
+    assert response.status_code == 202
+    assert response.json()["coalesced"] is False
+    assert client.started == [response.json()["job_id"]]
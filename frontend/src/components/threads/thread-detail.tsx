@@ -16,6 +16,7 @@ import {
 	Loader2,
 } from "lucide-react";
 import { useState, useEffect } from "react";
+import { useQuery } from "@tanstack/react-query";
 import { Badge } from "@/components/ui/badge";
 import { Button } from "@/components/ui/button";
 import {
@@ -29,6 +30,7 @@ import { ScrollArea } from "@/components/ui/scroll-area";
 import { Tabs, TabsContent, TabsList, TabsTrigger } from "@/components/ui/tabs";
 import { Textarea } from "@/components/ui/textarea";
 import type { Thread } from "@/lib/mock-data";
+import { queryKeys } from "@/lib/query-keys";
 import { cn } from "@/lib/utils";
 import { ApproveDialog, RejectDialog, SummaryHighlights, UserFeedbackCard } from "@/components/summaries";
 import { MarkdownRenderer } from "@/components/common";
@@ -67,6 +69,17 @@ export function ThreadDetail({
 	const [isRejectDialogOpen, setIsRejectDialogOpen] = useState(false);
 	const [isEditing, setIsEditing] = useState(false);
 
+	// Issue summary streamed over SSE while a summary is being generated
+	const { data: partialIssueSummary } = useQuery<string | null>({
+		queryKey: queryKeys.summaries.partial(thread.thread_id),
+		queryFn: () => null,
+		enabled: false,
+	});
+	const displayedSummary =
+		isRegenerating && partialIssueSummary
+			? `## Issue Summary\n\n${partialIssueSummary}`
+			: editedSummary;
+
 	// Use controlled tab from URL if provided, otherwise use local state
 	const [localActiveTab, setLocalActiveTab] = useState("summary");
 	const activeTab = controlledActiveTab ?? localActiveTab;
@@ -317,8 +330,8 @@ export function ThreadDetail({
 												/>
 											) : (
 												<div className="min-h-[400px] p-4 rounded-lg border bg-muted/30">
-													{editedSummary ? (
-														<MarkdownRenderer content={editedSummary} />
+													{displayedSummary ? (
+														<MarkdownRenderer content={displayedSummary} />
 													) : (
 														<div className="flex flex-col items-center justify-center h-full min-h-[400px] text-center space-y-4">
 															<div className="p-4 rounded-full bg-primary/10">
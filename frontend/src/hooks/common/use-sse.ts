@@ -3,13 +3,33 @@ import { useQueryClient } from "@tanstack/react-query";
 import { queryKeys } from "@/lib/query-keys";
 
 interface SSEEvent {
-	type: "connected" | "file_progress" | "task_status" | "error";
+	type:
+		| "connected"
+		| "file_progress"
+		| "task_status"
+		| "summary_partial"
+		| "summary_ready"
+		| "summaries_updated"
+		| "error";
 	file_id?: string;
 	task_id?: string;
+	thread_id?: string;
+	issue_summary?: string;
+	job_id?: string;
+	summary_id?: string | null;
+	summary_ids?: string[];
+	action?: "approve" | "reject" | "undo";
 	processed_threads?: number;
 	total_threads?: number;
 	progress?: number;
-	status?: "processing" | "completed" | "failed";
+	// Job status, or the new summary status of a summaries_updated event
+	status?:
+		| "processing"
+		| "completed"
+		| "failed"
+		| "pending"
+		| "approved"
+		| "rejected";
 	message?: string;
 	[key: string]: unknown;
 }
@@ -17,6 +37,7 @@ interface SSEEvent {
 interface UseSSEOptions {
 	fileId?: string;
 	taskId?: string;
+	threadId?: string;
 	enabled?: boolean;
 	onEvent?: (event: SSEEvent) => void;
 }
@@ -28,7 +49,7 @@ interface UseSSEOptions {
  * @returns Connection status and error state
  */
 export function useSSE(options: UseSSEOptions = {}) {
-	const { fileId, taskId, enabled = true, onEvent } = options;
+	const { fileId, taskId, threadId, enabled = true, onEvent } = options;
 	const queryClient = useQueryClient();
 	const [isConnected, setIsConnected] = useState(false);
 	const [error, setError] = useState<Error | null>(null);
@@ -43,6 +64,7 @@ export function useSSE(options: UseSSEOptions = {}) {
 		const params = new URLSearchParams();
 		if (fileId) params.append("file_id", fileId);
 		if (taskId) params.append("task_id", taskId);
+		if (threadId) params.append("thread_id", threadId);
 
 		const apiUrl = import.meta.env.VITE_API_URL || "http://localhost:8000/api";
 		const url = `${apiUrl}/events/stream?${params.toString()}`;
@@ -113,6 +135,33 @@ export function useSSE(options: UseSSEOptions = {}) {
 						}
 						break;
 
+					case "summary_partial":
+						// Store the streamed issue summary until the final summary arrives
+						if (data.thread_id) {
+							queryClient.setQueryData(
+								queryKeys.summaries.partial(data.thread_id),
+								data.issue_summary,
+							);
+						}
+						break;
+
+					case "summary_ready":
+						// A summary job finished (possibly started by another reviewer)
+						if (data.thread_id) {
+							queryClient.removeQueries({
+								queryKey: queryKeys.summaries.partial(data.thread_id),
+							});
+						}
+						queryClient.invalidateQueries({ queryKey: queryKeys.threads.all });
+						queryClient.invalidateQueries({ queryKey: queryKeys.summaries.all });
+						break;
+
+					case "summaries_updated":
+						// A bulk action changed the status of many summaries at once
+						queryClient.invalidateQueries({ queryKey: queryKeys.summaries.all });
+						queryClient.invalidateQueries({ queryKey: queryKeys.threads.all });
+						break;
+
 					case "error":
 						setError(new Error(data.message || "Unknown error"));
 						break;
@@ -149,7 +198,7 @@ export function useSSE(options: UseSSEOptions = {}) {
 			eventSourceRef.current = null;
 			setIsConnected(false);
 		};
-	}, [fileId, taskId, enabled, queryClient, onEvent]);
+	}, [fileId, taskId, threadId, enabled, queryClient, onEvent]);
 
 	return {
 		isConnected,
@@ -1,4 +1,9 @@
-import { useMutation, useQueryClient } from "@tanstack/react-query";
+import { useEffect, useRef } from "react";
+import {
+	type QueryClient,
+	useMutation,
+	useQueryClient,
+} from "@tanstack/react-query";
 import { z } from "zod";
 import { api, fetchWithValidation } from "@/lib/api";
 import { type Summary, summarySchema } from "@/lib/schemas";
@@ -8,24 +13,171 @@ const createSummarySchema = z.object({
 	thread_id: z.string(),
 });
 
+const summaryJobSchema = z.object({
+	job_id: z.string(),
+	thread_id: z.string(),
+	status: z.string(),
+	coalesced: z.boolean(),
+});
+
+const jobStatusSchema = z.object({
+	status: z.enum(["processing", "completed", "failed"]),
+	summary_id: z.string().nullable().optional(),
+	error: z.string().nullable().optional(),
+});
+
+type SummaryJob = z.infer<typeof summaryJobSchema>;
+type JobStatus = z.infer<typeof jobStatusSchema>;
+
+// Give up waiting for a job after this long; the job itself keeps running
+const JOB_TIMEOUT_MS = 5 * 60 * 1000;
+
+/**
+ * Wait for a summarization job to finish.
+ *
+ * Completion is pushed as a summary_ready SSE event. The job status is
+ * also checked whenever the event stream (re)connects, so a job that
+ * finished before the stream was open is not missed. summary_partial
+ * events are stored in the query cache, so the streamed issue summary
+ * shows up on any page that starts a summary.
+ *
+ * @returns ID of the generated summary
+ */
+function waitForJob(
+	job: SummaryJob,
+	queryClient: QueryClient,
+	signal: AbortSignal,
+): Promise<string> {
+	return new Promise((resolve, reject) => {
+		const apiUrl = import.meta.env.VITE_API_URL || "http://localhost:8000/api";
+		const params = new URLSearchParams({ thread_id: job.thread_id });
+		const eventSource = new EventSource(
+			`${apiUrl}/events/stream?${params.toString()}`,
+		);
+
+		const finish = (result: string | Error) => {
+			clearTimeout(timeout);
+			eventSource.close();
+			signal.removeEventListener("abort", onAbort);
+			if (result instanceof Error) {
+				reject(result);
+			} else {
+				resolve(result);
+			}
+		};
+		const settle = (status: JobStatus) => {
+			if (status.status === "failed") {
+				finish(new Error(status.error || "Summary generation failed"));
+			} else if (status.status === "completed" && status.summary_id) {
+				finish(status.summary_id);
+			}
+		};
+		const onAbort = () =>
+			finish(new DOMException("Summary wait aborted", "AbortError"));
+
+		const timeout = setTimeout(
+			() => finish(new Error("Timed out waiting for the summary")),
+			JOB_TIMEOUT_MS,
+		);
+		if (signal.aborted) {
+			onAbort();
+			return;
+		}
+		signal.addEventListener("abort", onAbort);
+
+		eventSource.onopen = () => {
+			fetchWithValidation(
+				api.get(`threads/task/${job.job_id}/status`, { signal }).json(),
+				jobStatusSchema,
+			)
+				.then(settle)
+				.catch(() => {
+					// The summary_ready event still settles the job
+				});
+		};
+
+		eventSource.onmessage = (event) => {
+			try {
+				const data = JSON.parse(event.data);
+				if (
+					data.type === "summary_partial" &&
+					data.thread_id === job.thread_id
+				) {
+					queryClient.setQueryData(
+						queryKeys.summaries.partial(job.thread_id),
+						data.issue_summary,
+					);
+				} else if (
+					data.type === "summary_ready" &&
+					data.job_id === job.job_id
+				) {
+					settle(
+						jobStatusSchema.parse({
+							status: data.status,
+							summary_id: data.summary_id,
+							error: data.message,
+						}),
+					);
+				}
+			} catch (err) {
+				console.error("Error parsing SSE event:", err);
+			}
+		};
+	});
+}
+
+/**
+ * Start (or join) a summarization job and wait for it to finish.
+ *
+ * The partial issue summary streams in over SSE meanwhile.
+ */
 async function createSummary(
 	data: z.infer<typeof createSummarySchema>,
+	queryClient: QueryClient,
+	signal: AbortSignal,
 ): Promise<Summary> {
-	return fetchWithValidation(
+	const job = await fetchWithValidation(
 		api
 			.post(`summaries/threads/${data.thread_id}/summarize`, {
 				json: data,
+				signal,
 			})
 			.json(),
+		summaryJobSchema,
+	);
+
+	const summaryId = await waitForJob(job, queryClient, signal);
+	return fetchWithValidation(
+		api.get(`summaries/${summaryId}`, { signal }).json(),
 		summarySchema,
 	);
 }
 
 export function useCreateSummary() {
 	const queryClient = useQueryClient();
+	const controllersRef = useRef(new Set<AbortController>());
+
+	// Stop waiting for jobs when the component unmounts
+	useEffect(() => {
+		const controllers = controllersRef.current;
+		return () => {
+			for (const controller of controllers) {
+				controller.abort();
+			}
+			controllers.clear();
+		};
+	}, []);
 
 	return useMutation({
-		mutationFn: createSummary,
+		mutationFn: async (data: z.infer<typeof createSummarySchema>) => {
+			const controller = new AbortController();
+			controllersRef.current.add(controller);
+			try {
+				return await createSummary(data, queryClient, controller.signal);
+			} finally {
+				controllersRef.current.delete(controller);
+			}
+		},
 		onSuccess: (data) => {
 			// Update summary in cache
 			queryClient.setQueryData(queryKeys.summaries.detail(data.id), data);
@@ -34,5 +186,11 @@ export function useCreateSummary() {
 			queryClient.invalidateQueries({ queryKey: queryKeys.threads.all });
 			queryClient.invalidateQueries({ queryKey: queryKeys.summaries.all });
 		},
+		onSettled: (_data, _error, variables) => {
+			// Drop the streamed partial once generation has finished
+			queryClient.removeQueries({
+				queryKey: queryKeys.summaries.partial(variables.thread_id),
+			});
+		},
 	});
 }
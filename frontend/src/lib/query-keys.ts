@@ -8,6 +8,7 @@
  * - ["threads", threadId] - Specific thread
  * - ["summaries"] - All summaries
  * - ["summaries", summaryId] - Specific summary
+ * - ["summaries", "partial", threadId] - Issue summary streamed while generating
  * - ["task-status", taskId] - Task status
  */
 
@@ -30,6 +31,7 @@ export const queryKeys = {
 		all: ["summaries"] as const,
 		detail: (summaryId: string) => ["summaries", summaryId] as const,
 		byThread: (threadId: string) => ["summaries", "thread", threadId] as const,
+		partial: (threadId: string) => ["summaries", "partial", threadId] as const,
 	},
 
 	// Task Status